@@ -1,10 +1,13 @@
 """Bot Utility commands cog."""
 import os
+from typing import Optional
 
 from discord.ext import commands
 from discord.ext.commands import Context
 
 from DolaBot.constants.bot_constants import COMMAND_PREFIX
+from DolaBot.helpers.channel_logger import coalesce_messages
+from DolaBot.helpers.timer_decorator import set_enabled, get_profile_text
 from slapp_py.helpers.str_helper import truncate
 
 
@@ -46,6 +49,7 @@ class BotUtilCommands(commands.Cog):
 
         try:
             is_owner = await ctx.bot.is_owner(ctx.author)
+            slapp_commands: Optional[SlappCommands] = ctx.bot.get_cog(SlappCommands.__name__)
             console_path = os.getenv('SLAPP_CONSOLE_PATH')
             slapp_sources = os.getenv('SLAPP_DATA_FOLDER')
 
@@ -54,12 +58,41 @@ class BotUtilCommands(commands.Cog):
             else:
                 slapp_sources_count = -1
 
-            await ctx.send(f"Slapp started: {SlappCommands.has_slapp_started()}\n"
-                           f"Slapp caching finished: {SlappCommands.has_slapp_caching_finished()}\n"
-                           f"Slapp queue length: {SlappCommands.get_slapp_queue_length()}\n"
-                           f"Slapp console path: {console_path} (IsFile: {os.path.isfile(console_path)})\n"
-                           f"Slapp sources: {slapp_sources} (IsDir: {os.path.isdir(slapp_sources)}) ({slapp_sources_count} files)\n"
-                           f"Owner check: {is_owner}\n"
-                           )
+            details = (f"Slapp started: {SlappCommands.has_slapp_started()}\n"
+                       f"Slapp caching finished: {SlappCommands.has_slapp_caching_finished()}\n"
+                       f"Slapp queue length: {slapp_commands.get_slapp_queue_length() if slapp_commands else -1} "
+                       f"({slapp_commands.get_slapp_lanes_text() if slapp_commands else '(none)'})\n"
+                       f"Slapp workers: {slapp_commands.get_slapp_workers_text() if slapp_commands else '(none)'}\n"
+                       f"Slapp latency:\n{slapp_commands.get_slapp_latency_text() if slapp_commands else '(none)'}\n"
+                       f"Popular lookups: {SlappCommands.get_slapp_popular_text()}\n"
+                       f"IPL tournaments: {slapp_commands.ipl_index if slapp_commands else '(none)'}\n"
+                       f"Slapp console path: {console_path} (IsFile: {os.path.isfile(console_path)})\n"
+                       f"Slapp sources: {slapp_sources} (IsDir: {os.path.isdir(slapp_sources)}) ({slapp_sources_count} files)\n"
+                       f"Owner check: {is_owner}\n"
+                       )
+            # The workers, lanes and latency grow with the pool, so this can be more than one message
+            for message in coalesce_messages(details.splitlines()):
+                await ctx.send(message)
         except Exception as e:
             await ctx.send(f"Something went wrong compiling debug details! {truncate(e.__str__(), 900)}")
+
+    @commands.command(
+        name='Profile',
+        description="Shows the profiled functions, or switches profiling on or off for the functions matching a name.",
+        brief="Shows or toggles function profiling.",
+        aliases=['profile'],
+        help=f'{COMMAND_PREFIX}profile [name pattern] [on|off]',
+        pass_ctx=True)
+    async def profile(self, ctx: Context, pattern: Optional[str] = "*", toggle: Optional[str] = None):
+        if not await ctx.bot.is_owner(ctx.author):
+            await ctx.send("Only the owner can profile Dola.")
+            return
+
+        if toggle is not None:
+            if toggle.lower() not in ('on', 'off'):
+                await ctx.send(f"Expected on or off, not {truncate(toggle, 20)}.")
+                return
+            switched = set_enabled(pattern, toggle.lower() == 'on')
+            await ctx.send(f"Switched profiling {toggle.lower()} for {len(switched)} functions.")
+        else:
+            await ctx.send(f"```\n{truncate(get_profile_text(pattern), 1900)}\n```")
@@ -1,94 +1,175 @@
 """Slapp commands cog."""
 import asyncio
-import io
+import copy
 import logging
+import os
 import re
 import traceback
-from collections import namedtuple, deque, OrderedDict
+from time import perf_counter
 from operator import itemgetter
-from typing import Optional, List, Tuple, Dict, Deque, Union, Coroutine
+from typing import Optional, List, Tuple, Dict, Union, Hashable, Iterable
 
-from discord import Color, Embed, File, Message, RawReactionActionEvent, errors
+from discord import Color, Embed, File, Message, PartialMessage, RawReactionActionEvent, errors
 from discord.ext import commands
 from discord.ext.commands import Context, Bot
 
 from DolaBot.constants import emojis
 from DolaBot.constants.bot_constants import COMMAND_PREFIX
 from DolaBot.constants.emojis import TOP_500, TROPHY, TICK, TURTLE, RUNNING, LOW_INK, NUMBERS_KEY_CAPS, TYPING, CROSS, \
-    NUMBERS_KEY_CAPS_LEN, PLUS, SKULL
+    PLUS, SKULL
 from DolaBot.constants.footer_phrases import get_random_footer_phrase
+from DolaBot.helpers.battlefy_fetcher import BattlefyFetcher, BattlefyFetchError
 from DolaBot.helpers.discord_helper import safe_backticks, close_backticks_if_unclosed, wrap_in_backticks
-from DolaBot.helpers.embed_helper import to_embed, NUMBER_OF_FIELDS_LIMIT, FIELD_VALUE_LIMIT, FIELD_NAME_LIMIT, \
-    TOTAL_CHARACTER_LIMIT, append_unrolled_list
+from DolaBot.helpers.embed_helper import to_embed, FIELD_VALUE_LIMIT, FIELD_NAME_LIMIT, append_unrolled_list, \
+    paginate_embed
+from DolaBot.helpers.lane_scheduler import INTERACTIVE, REACTION, BULK, LANES
+from DolaBot.helpers.lazy_slapp_response import LazySlappResponse
+from DolaBot.helpers.latency import latency, start_metrics_server, QUEUE_WAIT, IPC, DECODE, BUILD, SEND, TOTAL
+from DolaBot.helpers.lru_ttl_cache import LruTtlCache
+from DolaBot.helpers.org_tournament_index import OrgTournamentIndex
+from DolaBot.helpers.player_eligibility import PlayerEligibilityMemo
 from DolaBot.helpers.processed_slapp_object import ProcessedSlappObject
+from DolaBot.helpers.query_log import QueryLog, QUERY, DESCRIBE
+from DolaBot.helpers.reaction_index import ReactionIndex
+from DolaBot.helpers.reaction_scheduler import ReactionScheduler
+from DolaBot.helpers.render_pool import RenderPool
+from DolaBot.helpers.slapp_pool import SlappWorkerPool, SlappWorker, get_slapp_worker_count
+from DolaBot.helpers.slapp_query import normalise_query, parse_query
+from DolaBot.helpers.slapp_readiness import SlappReadiness, PHASES, CONNECTED, CACHED
+from DolaBot.helpers.slapp_request import SlappRequest, SlappRestartedError
 from DolaBot.helpers.supports_send import SupportsSend
-from battlefy_toolkit.downloaders.org_downloader import get_tournament_ids
-from slapp_py.core_classes.builtins import UNKNOWN_PLAYER, UnknownTeam
+from DolaBot.helpers.timer_decorator import debug_time_async
+from DolaBot.helpers.verification_report import TeamRow, build_verification_file, render_verification_file
+from slapp_py.core_classes.builtins import UNKNOWN_PLAYER
 from slapp_py.core_classes.division import Division
 from slapp_py.core_classes.name import Name
 from slapp_py.core_classes.player import Player
 from slapp_py.core_classes.skill import Skill
 from slapp_py.core_classes.team import Team
 from slapp_py.helpers.str_helper import join, truncate, escape_characters, conditional_str
-from slapp_py.misc.download_from_battlefy_result import download_from_battlefy
 from slapp_py.misc.models.battlefy_team import BattlefyTeam
-from slapp_py.slapp_runner.slapipes import MAX_RESULTS, SlapPipe
+from slapp_py.slapp_runner.slapipes import MAX_RESULTS
 from slapp_py.slapp_runner.slapp_response_object import SlappResponseObject
 
-SlappQueueItem = namedtuple('SlappQueueItem', ('SupportsSend', 'str'))
-slapp_ctx_queue: Deque[SlappQueueItem] = deque()
-slapp_reacts_queue: OrderedDict[str, Dict[str, Union[Player, Team]]] = OrderedDict()
-module_autoseed_list: Optional[Dict[str, List[SlappResponseObject]]] = dict()
-module_html_list: Optional[Dict[str, List[SlappResponseObject]]] = dict()
-module_predict_team_1: Optional[dict] = None
-slapp_started: bool = False
-slapp_caching_finished: bool = False
+slapp_result_cache: LruTtlCache[Hashable, SlappResponseObject] = LruTtlCache(
+    max_size=int(os.getenv("SLAPP_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("SLAPP_CACHE_TTL", "3600")))
+"""Decoded query results keyed by the Slapp snapshot and the normalised query."""
+slapp_describe_memo: LruTtlCache[Hashable, ProcessedSlappObject] = LruTtlCache(
+    max_size=int(os.getenv("SLAPP_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("SLAPP_CACHE_TTL", "3600")))
+"""Built describe results keyed by the Slapp snapshot and the described id."""
+autoseed_rosters: LruTtlCache[Hashable, Dict[str, SlappResponseObject]] = LruTtlCache(
+    max_size=16,
+    ttl=float(os.getenv("SLAPP_CACHE_TTL", "3600")))
+"""The player responses of the last autoseed, keyed by the Slapp snapshot and tourney id, then by player slug."""
+slapp_in_flight: Dict[Hashable, SlappRequest] = dict()
+"""The requests sent to Slapp and not yet answered, keyed like the result cache, for identical requests to follow."""
+slapp_renders: Dict[int, asyncio.Future] = dict()
+"""The responses being built by process_slapp, keyed by the response's id, for identical sends to share."""
+player_eligibility_memo: PlayerEligibilityMemo = PlayerEligibilityMemo(
+    max_size=int(os.getenv("SLAPP_ELIGIBILITY_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("SLAPP_CACHE_TTL", "3600")))
+"""Player eligibility summaries keyed by the Slapp snapshot and player GUID, shared by verify, autoseed and full."""
+reaction_scheduler: ReactionScheduler = ReactionScheduler()
+"""Adds the numbered reactions to sent results in the background."""
+reaction_index: ReactionIndex = ReactionIndex.from_env()
+"""The GUIDs that the reactions on sent results represent."""
+render_pool: RenderPool = RenderPool()
+"""Renders Slapp results off the event loop."""
+query_log: QueryLog = QueryLog.from_env()
+"""The searches and describes people have made, to pre-warm the caches with."""
+prewarm_count: int = int(os.getenv("SLAPP_PREWARM_COUNT", "50"))
+"""How many of the most made lookups to replay into the caches once Slapp has finished caching."""
+prewarm_interval: float = float(os.getenv("SLAPP_PREWARM_INTERVAL", "1"))
+"""Seconds between pre-warming lookups."""
+turtle_wait: float = float(os.getenv("SLAPP_TURTLE_WAIT", "10"))
+"""Seconds of expected wait from which a request is shown as slow."""
+slapp_readiness: SlappReadiness = SlappReadiness()
+"""The latest phase reached by any Slapp worker."""
 max_messages_to_unroll = 10
 
 
-async def add_to_queue(ctx: Union[None, SupportsSend, Context], description: str):
-    if isinstance(ctx, Context):
-        await ctx.message.add_reaction(RUNNING if slapp_caching_finished else TURTLE)
-    slapp_ctx_queue.append(SlappQueueItem(ctx, description))
+async def add_to_queue(request: SlappRequest) -> SlappRequest:
+    """
+    React to the request's context to show that it has been queued with Slapp, with a turtle if it's expected to
+    wait at least SLAPP_TURTLE_WAIT seconds or Slapp is still caching.
+    """
+    if isinstance(request.ctx, Context):
+        is_slow = not slapp_readiness.reached(CACHED) or request.expected_wait >= turtle_wait
+        await request.ctx.message.add_reaction(TURTLE if is_slow else RUNNING)
+    return request
 
 
-async def handle_html(ctx: Optional[SupportsSend], description: str, response: Optional[dict]):
-    global module_html_list
+def _follow_in_flight(key: Hashable, ctx: Union[None, SupportsSend, Context], description: str,
+                      lane: str) -> Optional[SlappRequest]:
+    """
+    A request that follows the identical request in flight under the key, or None if there isn't one to follow.
+    A request waiting in a lower priority lane than this one isn't followed, so as not to wait behind bulk work.
+    """
+    leader = slapp_in_flight.get(key)
+    if leader is None or (leader.request_id == 0 and LANES.index(leader.lane) > LANES.index(lane)):
+        return None
+    logging.debug(f"Following the in-flight {leader!r} for {key=}")
+    return SlappRequest.follow(leader, ctx, description)
 
-    if description.startswith("html_start"):
-        module_html_list.clear()
-        return
-    elif not description.startswith("html_end"):
-        team_name = description.rpartition(':')[2]  # take the right side of the colon
-        if module_html_list.get(team_name):
-            module_html_list[team_name].append(SlappResponseObject(response))
-        else:
-            module_html_list[team_name] = [SlappResponseObject(response)]
-        return
 
-    # End, do the thing
+def _lead_in_flight(key: Hashable, request: SlappRequest):
+    """Let identical requests follow this one under the key until it's answered."""
+    def _done(_):
+        if slapp_in_flight.get(key) is request:
+            del slapp_in_flight[key]
+
+    slapp_in_flight[key] = request
+    request.future.add_done_callback(_done)
+
+
+async def process_slapp_once(r: SlappResponseObject) -> ProcessedSlappObject:
+    """
+    process_slapp, built once for everyone sending the same response at the same time, e.g. a request and its
+    followers. Each gets its own copy as sending trims the embed.
+    """
+    key = id(r)
+    render = slapp_renders.get(key)
+    if render is None:
+        render = slapp_renders[key] = asyncio.ensure_future(process_slapp(r))
+        render.add_done_callback(lambda _: slapp_renders.pop(key, None))
+    return (await asyncio.shield(render)).copy()
+
+
+def _use_snapshot(snapshot: int):
+    """In a render process, drop the memoised eligibility if the bot has since moved to a new Slapp snapshot."""
+    if player_eligibility_memo.snapshot != snapshot:
+        player_eligibility_memo.invalidate(snapshot)
+
+
+def build_verification_rows(responses_by_team: Dict[str, List[SlappResponseObject]]) -> Tuple[str, List[TeamRow]]:
+    """The verification report's rows from each team's player responses, and any message to send before it."""
     message = ''
 
-    # Team name, list of players, clout, confidence, emoji str
-    teams_by_clout: List[Tuple[str, Dict[Player, SlappResponseObject], int, int, str]] = []
+    teams_by_clout: List[TeamRow] = []
 
-    if module_html_list:
-        for team_name in module_html_list:
+    if responses_by_team:
+        for team_name in responses_by_team:
             team_players = {}
             team_awards = []
-            for r in module_html_list[team_name]:
+            for r in responses_by_team[team_name]:
                 if r.matched_players_len == 0:
                     p = Player(names=[Name(value=r.query or UNKNOWN_PLAYER, sources=r.sources)])
                     pass
                 elif r.matched_players_len > 1:
-                    p = Player.soft_merge_from_multiple(r.matched_players)
+                    # The players are merged into the first, and nothing is returned, so merge into a copy of the
+                    # first to leave the cached response as it is
+                    p = copy.deepcopy(r.matched_players[0])
+                    Player.soft_merge_from_multiple(p, *r.matched_players[1:])
                     message += f"Soft merged player with query {r.query} with " \
                                f"({r.matched_players_len} results\n"
                 else:
                     p = r.matched_players[0]
 
-                team_players[p] = r
-                team_awards.append(get_first_placements_text(r, p))
+                eligibility = player_eligibility_memo.get(r, p, memoisable=r.matched_players_len == 1)
+                team_players[p] = eligibility
+                team_awards.append(eligibility.first_placements)
 
             player_skills = [player.skill for player in team_players]
             player_skills.sort(reverse=True)
@@ -104,81 +185,94 @@ async def handle_html(ctx: Optional[SupportsSend], description: str, response: O
             )
     else:
         message = "Err... I didn't get any teams back from Slapp."
+    return message, teams_by_clout
+
+
+def render_verification(responses_by_team: Dict[str, List[SlappResponseObject]], snapshot: int,
+                        compress: bool) -> Tuple[str, str, str]:
+    """The message, and the path and file name of the report written to a temporary file, rendered in the render pool."""
+    _use_snapshot(snapshot)
+    message, teams_by_clout = build_verification_rows(responses_by_team)
+    return (message, *render_verification_file(teams_by_clout, compress))
+
+
+@debug_time_async
+async def handle_html(ctx: SupportsSend, responses_by_team: Dict[str, List[SlappResponseObject]]):
+    """Build and send the verification html from each team's player responses."""
+    compress = os.getenv("SLAPP_HTML_GZIP", "false").lower() in ("1", "true", "yes")
+    report_path: Optional[str] = None
+    if render_pool.processes:
+        message, report_path, filename = await render_pool.run(
+            render_verification, responses_by_team, player_eligibility_memo.snapshot, compress)
+        file = File(fp=report_path, filename=filename)
+    else:
+        message, teams_by_clout = build_verification_rows(responses_by_team)
+        file = build_verification_file(teams_by_clout, compress=compress)
 
-    if message:
-        await ctx.send(message)
+    try:
+        if message:
+            await ctx.send(message)
+        await ctx.send(content="Here ya go! 🎈", file=file)
+    finally:
+        if report_path:
+            file.close()
+            os.remove(report_path)
 
-    # Free free to ignore this LOL
-    row_count = 1
-    html_begin = f"""<html><head><meta http-equiv="Content-Type" content="text/html; charset=utf-8"><link type="text/css" rel="stylesheet" href="resources/sheet.css"><style type="text/css">.ritz .waffle a {{ color: inherit; }}.ritz .waffle .s8{{background-color:#9900ff;text-align:right;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}.ritz .waffle .s0{{background-color:#fce5cd;text-align:center;font-weight:bold;color:#000000;font-family:'Arial';font-size:14pt;vertical-align:middle;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}.ritz .waffle .s7{{background-color:#25c274;text-align:right;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}.ritz .waffle .s12{{background-color:#fbbc04;text-align:left;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}.ritz .waffle .s1{{background-color:#4a86e8;text-align:right;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}.ritz .waffle .s6{{background-color:#34a853;text-align:left;text-decoration:underline;-webkit-text-decoration-skip:none;text-decoration-skip-ink:none;color:#1155cc;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}.ritz .waffle .s2{{background-color:#34a853;text-align:left;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}.ritz .waffle .s3{{background-color:#ffffff;text-align:left;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}.ritz .waffle .s10{{background-color:#9900ff;text-align:right;color:#000000;font-family:'docs-Roboto',Arial;font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}.ritz .waffle .s4{{background-color:#ffffff;text-align:center;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}.ritz .waffle .s5{{background-color:#00ff00;text-align:right;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}.ritz .waffle .s14{{background-color:#4285f4;text-align:left;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}.ritz .waffle .s13{{background-color:#ff6d01;text-align:left;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}.ritz .waffle .s9{{background-color:#ea4335;text-align:left;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}.ritz .waffle .s11{{background-color:#4a86e8;text-align:right;color:#000000;font-family:'docs-Roboto',Arial;font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}} .tooltip {{ position: relative;  display: inline-block;  border-bottom: 1px dotted black;}} .tooltip .tooltiptext {{visibility: hidden; background-color: black;  color: #fff;  text-align: center;  padding: 5px 0;  border-radius: 6px;  position: absolute;  z-index: 1;}} .tooltip:hover .tooltiptext {{visibility: visible;}}</style></head>\n<body><div class="ritz grid-container" dir="ltr"><table class="waffle" cellspacing="0" cellpadding="0"><thead><tr><th class="row-header freezebar-origin-ltr"></th><th id="810171351C0" style="width:30px;" class="column-headers-background">A</th><th id="810171351C1" style="width:170px;" class="column-headers-background">B</th><th id="810171351C2" style="width:150px;" class="column-headers-background">C</th><th id="810171351C3" style="width:150px;" class="column-headers-background">D</th><th id="810171351C4" style="width:150px;" class="column-headers-background">E</th><th id="810171351C5" style="width:150px;" class="column-headers-background">F</th><th id="810171351C6" style="width:150px;" class="column-headers-background">G</th><th id="810171351C7" style="width:150px;" class="column-headers-background">H</th><th id="810171351C8" style="width:150px;" class="column-headers-background">I</th><th id="810171351C9" style="width:150px;" class="column-headers-background">J</th><th id="810171351C10" style="width:150px;" class="column-headers-background">K</th><th id="810171351C11" style="width:150px;" class="column-headers-background">L</th><th id="810171351C12" style="width:150px;" class="column-headers-background">M</th><th id="810171351C13" style="width:150px;" class="column-headers-background">N</th><th id="810171351C14" style="width:150px;" class="column-headers-background">O</th><th id="810171351C15" style="width:150px;" class="column-headers-background">P</th><th id="810171351C16" style="width:150px;" class="column-headers-background">Q</th><th id="810171351C17" style="width:150px;" class="column-headers-background">R</th><th id="810171351C18" style="width:150px;" class="column-headers-background">S</th><th id="810171351C19" style="width:150px;" class="column-headers-background">T</th><th id="810171351C20" style="width:150px;" class="column-headers-background">U</th><th id="810171351C21" style="width:150px;" class="column-headers-background">V</th><th id="810171351C22" style="width:150px;" class="column-headers-background">W</th><th id="810171351C23" style="width:150px;" class="column-headers-background">X</th><th id="810171351C24" style="width:150px;" class="column-headers-background">Y</th><th id="810171351C25" style="width:150px;" class="column-headers-background">Z</th></tr></thead><tbody><tr style="height: 30px"><th id="810171351R0" style="height: 30px;" class="row-headers-background"><div class="row-header-wrapper" style="line-height: 30px">{row_count}</div></th><td class="s0" dir="ltr">#</td><td class="s0" dir="ltr">Team Name<br></td><td class="s0" dir="ltr">Player 1</td><td class="s0" dir="ltr">Player 2</td><td class="s0" dir="ltr">Player 3</td><td class="s0" dir="ltr">Player 4</td><td class="s0" dir="ltr">Player 5</td><td class="s0" dir="ltr">Player 6</td><td class="s0" dir="ltr">Player 7</td><td class="s0" dir="ltr">Player 8</td><td class="s0" dir="ltr">Last Updated</td><td class="s0" dir="ltr">Removed 1<br></td><td class="s0" dir="ltr">Removed 2<br></td><td class="s0" dir="ltr">Removed 3<br></td><td class="s0" dir="ltr">Removed 4<br></td><td class="s0" dir="ltr">Removed 5<br></td><td class="s0" dir="ltr">Removed 6<br></td><td class="s0" dir="ltr">Removed 7<br></td><td class="s0" dir="ltr">Removed 8<br></td><td class="s0" dir="ltr">Removed 9<br></td><td class="s0" dir="ltr">Removed 10<br></td><td class="s0" dir="ltr">Removed 11<br></td><td class="s0" dir="ltr">Removed 12<br></td><td class="s0" dir="ltr">Removed 13<br></td><td class="s0" dir="ltr">Removed 14<br></td><td class="s0" dir="ltr">Removed 15<br></td></tr>\n"""
-    html_end = """</tbody></table></div></body></html>"""
-    style_good = "s2"
-    style_banned = "s9"
-    style_needs_checking = "s12"
-    style_exception = "s14"
-
-    # Order by clout for the team seed
-    ordered = sorted(teams_by_clout, key=itemgetter(2), reverse=True)
-    output = html_begin
-    for tup in teams_by_clout:
-        team_name, team_players, max_clout, max_confidence, awards = tup
-        row_count += 1
-        output += f"""<tr style="height: 20px">\n<th id="810171351R{row_count}" style="height: 20px;" class="row-headers-background"><div class="row-header-wrapper" style="line-height: 20px">{row_count}</div></th>\n"""
-
-        # 1. break down team into the players
-        # 2. calculate the seed from those players
-        # 3. for each player, write a cell and style by that player's eligibility
-        player_output = ''
-        player_styles = []
-        for player in team_players:
-            style = style_needs_checking
-
-            r = team_players[player]
-            best_div = r.get_best_division_for_player(player)
-            low_ink_placements = r.get_low_ink_placements(player)
-            best_li_placement = r.best_low_ink_placement(player)
-            if r.placement_is_winning_low_ink(best_li_placement):
-                style = style_banned
-            elif best_div.normalised_value == 4:
-                style = style_exception
-            elif best_div.normalised_value <= 3:
-                style = style_banned
-            # Considering adding this, but if we're in December and the last result was at the beginning of the year,
-            # or indeed years ago, then this wouldn't be a good indication.
-            # elif best_li_placement is not None:
-            #     style = STYLE_GOOD
-            elif not best_div.is_unknown:
-                style = style_good
-
-            player_styles.append(style)
-            names = list({name.value for name in player.names if name and name.value})
-            names = truncate(join(', ', names[0:], post_func=lambda x: truncate(x, 36)), 1000)
-
-            player_detail = f"Names: {names} \n"
-            player_detail += f"Best Div: {best_div} \n"
-            if best_li_placement:
-                player_detail += f"Best LI: Came {best_li_placement[0]} in {best_li_placement[1]} in {best_li_placement[2]} \n"
-            if len(low_ink_placements) > 1:
-                for placement in low_ink_placements:
-                    if placement != best_li_placement:
-                        player_detail += f"LI placements: Came {placement[0]} in {placement[1]} in {placement[2]} \n"
-            player_detail += f"Teams: {join(', ', r.get_teams_for_player(player))} \n"
-            player_output += f"""<td class="{style}" dir="ltr"><div class="tooltip">{player.name}<pre class="tooltiptext">{player_detail}</pre></div></td>\n"""
-
-        team_seed_colour = style_good if max_confidence > 70 else style_needs_checking
-        team_name_colour = style_good if all(style == style_good for style in player_styles) else style_needs_checking
-
-        team_seed = ordered.index(tup) + 1
-        team_detail = f"Clout: {max_clout} ({max_confidence}% confidence) {awards}"
-        output += f"""<td class="{team_seed_colour}" dir="ltr">{team_seed}</td>\n"""
-        output += f"""<td class="{team_name_colour}" dir="ltr"><div class="tooltip">{team_name}<pre class="tooltiptext">{team_detail}</pre></div></td>\n"""
-        output += player_output
-
-        output += """</tr>\n"""
-
-    output += html_end
-    f = io.StringIO(output)
-    await ctx.send(content="Here ya go! 🎈", file=File(fp=f, filename="Verifications.html"))
+
+def build_autoseed_text(responses_by_team: Dict[str, List[SlappResponseObject]]) -> Tuple[str, List[str]]:
+    """
+    The lines ordering the teams by clout from each team's player responses, and any message to send before them.
+    """
+    message = ''
+
+    # Team name, list of players, clout, confidence, emoji str
+    teams_by_clout: List[Tuple[str, List[str], int, int, str]] = []
+
+    if responses_by_team:
+        for team_name in responses_by_team:
+            team_players = []
+            team_awards = []
+            for r in responses_by_team[team_name]:
+                if r.matched_players_len == 0:
+                    p = Player(names=[Name(value=r.query or UNKNOWN_PLAYER, sources=r.sources)])
+                    pass
+                elif r.matched_players_len > 1:
+                    p = Player(names=[Name(value=r.query or UNKNOWN_PLAYER, sources=r.sources)])
+                    message += f"Too many matches for player {r.query} 😔 " \
+                               f"({r.matched_players_len=})\n"
+                else:
+                    p = r.matched_players[0]
+
+                team_players.append(p)
+                team_awards.append(player_eligibility_memo.get(r, p, memoisable=r.matched_players_len == 1)
+                                   .first_placements)
+
+            player_skills = [player.skill for player in team_players]
+            player_skills.sort(reverse=True)
+            awards = TROPHY * len({award for award_line in team_awards for award in award_line})
+            awards += TOP_500 * len([player for player in team_players if player.top500])
+            (_, _), (max_clout, max_confidence) = Skill.team_clout(player_skills)
+            teams_by_clout.append(
+                (team_name,
+                 [truncate(player.name.value, 25) for player in team_players],
+                 max_clout,
+                 max_confidence,
+                 awards)
+            )
+        teams_by_clout.sort(key=itemgetter(2), reverse=True)
+    else:
+        message = "Err... I didn't get any teams back from Slapp."
+
+    lines: List[str] = ["Here's how I'd order the teams and their players from best-to-worst, and assuming each team puts its best 4 players on:\n```"]
+    for line in [f"{truncate(tup[0], 50)} (Clout: {tup[2]} with {tup[3]}% confidence) [{', '.join(tup[1])}] {tup[4]}" for tup in teams_by_clout]:
+        lines.append(line)
+    return message, lines
+
+
+def render_autoseed(responses_by_team: Dict[str, List[SlappResponseObject]], snapshot: int) -> Tuple[str, List[str]]:
+    """build_autoseed_text, rendered in the render pool."""
+    _use_snapshot(snapshot)
+    return build_autoseed_text(responses_by_team)
 
 
 class SlappCommands(commands.Cog):
@@ -186,49 +280,110 @@ class SlappCommands(commands.Cog):
 
     def __init__(self, bot: Bot):
         self.bot = bot
-        self.slappipe = SlapPipe()
-        self.restart_context = None
+        self.slapp_pool = SlappWorkerPool(get_slapp_worker_count(), readiness=slapp_readiness)
+        self.battlefy = BattlefyFetcher()
+        self.ipl_index = OrgTournamentIndex('inkling-performance-labs')
+        self.metrics_runner = None
+        self.prewarm_task: Optional[asyncio.Task] = None
 
-    def initialise_slapp(self) -> Coroutine:
-        return self.slappipe.initialise_slapp(self.receive_slapp_response)
+    async def initialise_slapp(self):
+        await asyncio.gather(self.slapp_pool.initialise_slapp(self.receive_slapp_response),
+                             SlappCommands._log_startup())
+
+    @staticmethod
+    async def _log_startup():
+        """Log how long Slapp took to reach each phase of starting up."""
+        started = perf_counter()
+        for phase in PHASES:
+            await slapp_readiness.wait(phase)
+            logging.info(f"Slapp {phase} after {perf_counter() - started:.1f}s.")
+
+    async def cog_load(self):
+        self.ipl_index.start()
+        query_log.start()
+        self.metrics_runner = await start_metrics_server()
+
+    async def cog_unload(self):
+        self.ipl_index.stop()
+        reaction_index.close()
+        render_pool.shutdown()
+        query_log.close()
+        if self.prewarm_task:
+            self.prewarm_task.cancel()
+        if self.metrics_runner:
+            await self.metrics_runner.cleanup()
+        await self.battlefy.close()
+
+    async def _get_tournament(self, tourney_id: str) -> List[dict]:
+        """Get the tournament's teams, or an empty list if it couldn't be downloaded."""
+        try:
+            return await self.battlefy.get_teams(tourney_id)
+        except BattlefyFetchError as ex:
+            logging.error(ex)
+            return []
 
     @staticmethod
     def has_slapp_started():
-        return slapp_started
+        return slapp_readiness.reached(CONNECTED)
 
     @staticmethod
     def has_slapp_caching_finished():
-        return slapp_caching_finished
+        return slapp_readiness.reached(CACHED)
+
+    def get_slapp_queue_length(self):
+        return len(self.slapp_pool)
+
+    def get_slapp_lanes_text(self) -> str:
+        return str(self.slapp_pool.lanes)
+
+    @staticmethod
+    def get_slapp_latency_text() -> str:
+        return latency.summary_text()
+
+    def get_slapp_workers_text(self) -> str:
+        return ', '.join(
+            f"#{worker.worker_id} {'✅' if worker.healthy else '❌'} {worker.readiness} ({worker.load} in flight)"
+            for worker in self.slapp_pool.workers)
+
+    @staticmethod
+    def get_slapp_popular_text() -> str:
+        return query_log.summary_text()
 
     @staticmethod
-    def get_slapp_queue_length():
-        return len(slapp_ctx_queue)
+    def is_tracked_message(message_id: int) -> bool:
+        """If the message is a result whose reactions are handled. This is a set lookup with no I/O."""
+        return message_id in reaction_index
 
     async def handle_reaction(self, payload: RawReactionActionEvent):
-        channel = await self.bot.fetch_channel(payload.channel_id)
-        message = slapp_reacts_queue.get(str(payload.message_id), {})
-        response = message.get(str(payload.emoji))
-
-        handled = False
-        if response:
-            logging.info(f"Reaction received matching message {payload.message_id=}, {payload.emoji.__str__()=}")
-            if isinstance(response, Player) or isinstance(response, Team):
-                await add_to_queue(channel, "full")
-                await self.slappipe.slapp_describe(str(response.guid))
-                handled = True
-            else:
-                await channel.send(f"Something went wrong with handling the react: {response=}")
-        elif message:
-            logging.warning(f"Reaction received matching message {payload.message_id=} "
-                            f"but we dropped the payload emoji {payload.emoji=!r}, we're looking for [{message=!r}]")
-
-        if handled:
-            slapp_reacts_queue[str(payload.message_id)].pop(str(payload.emoji))
-            message: Message = await channel.fetch_message(payload.message_id)
-            try:
-                await message.clear_reaction(payload.emoji.__str__())
-            except errors.Forbidden:
-                pass
+        guid = reaction_index.pop(payload.message_id, str(payload.emoji))
+        if guid is None:
+            if payload.message_id in reaction_index:
+                logging.warning(f"Reaction received matching message {payload.message_id=} "
+                                f"but it doesn't match a result, {payload.emoji=!r}")
+            return
+
+        logging.info(f"Reaction received matching message {payload.message_id=}, {payload.emoji.__str__()=}")
+        channel, message = await self._get_reacted_message(payload)
+        try:
+            await message.clear_reaction(payload.emoji.__str__())
+        except errors.Forbidden:
+            pass
+        await self._describe(channel, guid, lane=REACTION)
+
+    async def _get_reacted_message(self, payload: RawReactionActionEvent) \
+            -> Tuple[SupportsSend, Union[Message, PartialMessage]]:
+        """
+        Get the channel and message that the reaction was added to.
+        The channel comes from the gateway cache where possible and the message is a partial message, which is enough
+        to clear a reaction, so REST is only used on a cache miss.
+        """
+        channel = self.bot.get_channel(payload.channel_id)
+        if channel is None:
+            channel = await self.bot.fetch_channel(payload.channel_id)
+
+        if hasattr(channel, 'get_partial_message'):
+            return channel, channel.get_partial_message(payload.message_id)
+        return channel, await channel.fetch_message(payload.message_id)
 
     @staticmethod
     def prepare_bulk_slapp(teams_to_search: List[dict]) -> Tuple[str, List[Tuple[str, str]]]:
@@ -265,16 +420,16 @@ class SlappCommands(commands.Cog):
     @commands.command(
         name='autoseed',
         description="Auto seed the teams that have signed up to the tourney",
-        help=f'{COMMAND_PREFIX}autoseed <tourney_id>',
+        help=f'{COMMAND_PREFIX}autoseed <tourney_id> [full]\n'
+             f'Only players that are new since the last autoseed of the tourney are looked up, '
+             f'unless full is specified.',
         pass_ctx=True)
-    async def autoseed(self, ctx: Context, tourney_id: Optional[str]):
+    async def autoseed(self, ctx: Context, tourney_id: Optional[str], mode: Optional[str]):
         if not tourney_id:
             tourney_id = '6019b6d0ce01411daff6bca6'
+        full = (mode or '').lower().lstrip('-') == 'full'
 
-        tournament = list(download_from_battlefy(tourney_id, force=True))
-        if isinstance(tournament, list) and len(tournament) == 1:
-            tournament = tournament[0]
-
+        tournament = await self._get_tournament(tourney_id)
         if len(tournament) == 0:
             await ctx.send(f"I couldn't download the latest tournament data 😔 (id: {tourney_id})")
             return
@@ -284,18 +439,28 @@ class SlappCommands(commands.Cog):
             return
 
         verification_message, players_to_queue = SlappCommands.prepare_bulk_slapp(tournament)
-
-        # Do the autoseed list
-        await add_to_queue(None, 'autoseed_start')
-        for pair in players_to_queue:
-            await add_to_queue(None, 'autoseed:' + pair[0])
-            await self.slappipe.query_slapp(pair[1])
-        await add_to_queue(ctx, 'autoseed_end')
-
         if verification_message:
             await ctx.send(verification_message)
 
-        # Finished in handle_autoseed
+        # Do the autoseed list, reusing the players from the last run of this tourney
+        roster_key = (self.slapp_pool.snapshot, tourney_id)
+        previous = None if full else autoseed_rosters.get(roster_key)
+        known = dict(previous) if previous else dict()
+        slugs = {slug for _, slug in players_to_queue}
+        reused = len(slugs.intersection(known))
+
+        await ctx.message.add_reaction(RUNNING if slapp_readiness.reached(CACHED) else TURTLE)
+        responses_by_team = await self._query_teams(ctx, players_to_queue, known)
+        if responses_by_team is None:
+            await ctx.message.add_reaction(CROSS)
+            return
+
+        autoseed_rosters.put(roster_key, {slug: known[slug] for slug in slugs if slug in known})
+        if reused:
+            await ctx.send(f"Looked up {len(slugs) - reused} new or changed players and reused {reused} "
+                           f"from the last autoseed (use `{COMMAND_PREFIX}autoseed {tourney_id} full` to redo all).")
+        await SlappCommands.handle_autoseed(ctx, responses_by_team)
+        await ctx.message.add_reaction(TICK)
 
     @commands.command(
         name='verify',
@@ -303,17 +468,16 @@ class SlappCommands(commands.Cog):
         help=f'{COMMAND_PREFIX}verify <team_slug>',
         pass_ctx=True)
     async def verify(self, ctx: Context, team_slug_or_name_or_confirmation: Optional[str], tourney_id: Optional[str]):
-        if not slapp_started:
-            await ctx.send(f"⏳ Slapp is not running yet.")
-            return
+        if not slapp_readiness.reached(CONNECTED):
+            await ctx.send(f"⏳ Slapp is still starting up, this will run as soon as it's ready.")
 
         if not tourney_id:
-            tourney_id = SlappCommands.get_latest_ipl()
-
-        tournament = list(download_from_battlefy(tourney_id, force=True))
-        if isinstance(tournament, list) and len(tournament) == 1:
-            tournament = tournament[0]
+            tourney_id = await self.get_latest_ipl()
+            if not tourney_id:
+                await ctx.send("I couldn't find the latest IPL tournament 😔")
+                return
 
+        tournament = await self._get_tournament(tourney_id)
         if len(tournament) == 0:
             await ctx.send(f"I couldn't download the latest tournament data 😔 (id: {tourney_id})")
             return
@@ -330,6 +494,7 @@ class SlappCommands(commands.Cog):
 
         do_all: bool = team_slug_or_name_or_confirmation.lower() == "all"
         verification_message: str = ""
+        requests: List[SlappRequest] = []
 
         if do_all:
             await self.begin_slapp_html(ctx, tournament)
@@ -352,14 +517,16 @@ class SlappCommands(commands.Cog):
                             verification_message += f'The team {t.name} ({t.persistent_team_id}) has a player with no slug!\n'
                             continue
                         else:
-                            await add_to_queue(ctx, 'verify')
-                            await self.slappipe.query_slapp(player.user_slug)
+                            requests.append(await self._send_query(ctx, 'verify', player.user_slug))
                 else:
                     continue
 
         if verification_message:
             await ctx.send(verification_message)
 
+        for request in requests:
+            await self._run_slapp_request(request)
+
     @commands.command(
         name='restartslapp',
         description="Restarts Slapp",
@@ -398,20 +565,20 @@ class SlappCommands(commands.Cog):
         help=f'{COMMAND_PREFIX}search <mode_to_translate>',
         pass_ctx=True)
     async def slapp(self, ctx: Context, *, query):
-        if not slapp_started:
-            await ctx.send(f"⏳ Slapp is not running yet.")
-            return
+        if not slapp_readiness.reached(CONNECTED):
+            await ctx.send(f"⏳ Slapp is still starting up, this will run as soon as it's ready.")
 
         if len(query) < 3:
             await ctx.send("💡 Your query is small so might take a while. "
                            "You can help by specifying `--exactcase` and/or `--clantag`, `--player`, `--team` as appropriate.")
 
         logging.debug('slapp called with query ' + query)
-        await add_to_queue(ctx, 'slapp')
-        query_sent = await self.slappipe.query_slapp(query, limit=20)
-        if re.search(r"(\s+|^)(--|–|—)\S+", query_sent):
+        request = await self._send_query(ctx, 'slapp', query, limit=20)
+        if re.search(r"(\s+|^)(--|–|—)\S+", request.query):
             await ctx.send("💡 It looks like you have an option but is misspelled or not recognised. "
                            "If so, please retype your query. Otherwise, ignore this message and Slapp will run.")
+        await self._run_slapp_request(request)
+        query_log.record(QUERY, normalise_query(query, 20), query, 20, perf_counter() - request.sent_at)
 
     @commands.command(
         name='Slapp (Full description)',
@@ -422,8 +589,7 @@ class SlappCommands(commands.Cog):
         pass_ctx=True)
     async def full(self, ctx: Context, slapp_id: str):
         logging.info('full called with slapp_id ' + slapp_id)
-        await add_to_queue(ctx, 'full')
-        await self.slappipe.slapp_describe(slapp_id)
+        await self._describe(ctx, slapp_id)
 
     @commands.command(
         name='Fight',
@@ -434,18 +600,147 @@ class SlappCommands(commands.Cog):
         pass_ctx=True)
     async def predict(self, ctx: Context, slapp_id_team_1: str, slapp_id_team_2: str):
         logging.info(f'predict called with teams {slapp_id_team_1=} {slapp_id_team_2=}')
-        await add_to_queue(ctx, 'predict_1')
-        await self.slappipe.slapp_describe(slapp_id_team_1)
-        await add_to_queue(ctx, 'predict_2')
-        await self.slappipe.slapp_describe(slapp_id_team_2)
-        # This comes back in the receive_slapp_response -> handle_predict
+        request_1 = await self._send_describe(ctx, 'predict_1', slapp_id_team_1)
+        request_2 = await self._send_describe(ctx, 'predict_2', slapp_id_team_2)
+        result_1 = await self._await_slapp(request_1)
+        result_2 = await self._await_slapp(request_2)
+        if result_1 is None or result_2 is None:
+            await ctx.message.add_reaction(CROSS)
+            return
+
+        await ctx.message.add_reaction(TYPING)
+        for success_message, response in (result_1, result_2):
+            if success_message != "OK":
+                await SlappCommands.process_send_slapp(
+                    ctx=ctx,
+                    success_message=success_message,
+                    response=response)
+                return
+
+        await SlappCommands.handle_predict(ctx, result_1[1], result_2[1])
+        await ctx.message.add_reaction(TICK)
+
+    async def _send_query(self, ctx: Union[None, SupportsSend, Context], description: str, query: str,
+                          limit: Optional[int] = 20, lane: str = INTERACTIVE) -> SlappRequest:
+        """
+        Send a query to Slapp, or answer it from the result cache. Await the returned request's response with
+        _await_slapp.
+        """
+        cache_key = (self.slapp_pool.snapshot, normalise_query(query, limit))
+        cached = slapp_result_cache.get(cache_key)
+        if cached is not None:
+            logging.debug(f"Slapp result cache hit for {cache_key=}")
+            query_text, _ = parse_query(query, limit)
+            return await add_to_queue(SlappRequest.from_cache(ctx, description, query_text, cached))
+
+        follower = _follow_in_flight(cache_key, ctx, description, lane)
+        if follower is not None:
+            return await add_to_queue(follower)
+
+        request = await self.slapp_pool.query_slapp(ctx, description, query, limit=limit, lane=lane)
+        request.cache_key = cache_key
+        _lead_in_flight(cache_key, request)
+        return await add_to_queue(request)
+
+    async def _send_describe(self, ctx: Union[None, SupportsSend, Context], description: str,
+                             slapp_id: str, lane: str = INTERACTIVE) -> SlappRequest:
+        """Send a describe (slappId) to Slapp. Await the returned request's response with _await_slapp."""
+        key = ('describe', self.slapp_pool.snapshot, slapp_id.strip().lower())
+        follower = _follow_in_flight(key, ctx, description, lane)
+        if follower is not None:
+            return await add_to_queue(follower)
+
+        request = await self.slapp_pool.slapp_describe(ctx, description, slapp_id, lane=lane)
+        _lead_in_flight(key, request)
+        return await add_to_queue(request)
+
+    async def _describe(self, ctx: Union[SupportsSend, Context], slapp_id: str, lane: str = INTERACTIVE):
+        """
+        Fully describe the given id. If it has already been described on this snapshot, the memoised result is sent
+        without going to Slapp or building it again.
+        """
+        started = perf_counter()
+        memo_key = (self.slapp_pool.snapshot, slapp_id.strip().lower())
+        processed = slapp_describe_memo.get(memo_key)
+        if processed is None:
+            request = await self._send_describe(ctx, 'full', slapp_id, lane=lane)
+            await self._run_slapp_request(request, memo_key=memo_key)
+        else:
+            logging.debug(f"Slapp describe memo hit for {memo_key=}")
+            await SlappCommands.send_built_slapp(ctx, processed.copy())
+            if isinstance(ctx, Context):
+                await ctx.message.add_reaction(TICK)
+        query_log.record(DESCRIBE, memo_key[1], slapp_id.strip(), None, perf_counter() - started)
+
+    @staticmethod
+    async def _await_slapp(request: SlappRequest) -> Optional[Tuple[str, SlappResponseObject]]:
+        """
+        Wait for the response to the request and decode it, storing it in the result cache if it's cacheable.
+        Returns None if Slapp restarted before it could answer.
+        """
+        try:
+            success_message, response = await request.future
+        except SlappRestartedError:
+            logging.info(f"Slapp restarted before answering {request!r}")
+            return None
+
+        if request.ipc is not None:
+            latency.record(QUEUE_WAIT, request.queue_wait)
+            latency.record(IPC, request.ipc)
+
+        # A follower shares its leader's decoded response, whichever of them gets here first decodes it
+        source = request.leader or request
+        if source.response_object is None:
+            with latency.span(DECODE):
+                source.response_object = LazySlappResponse(response)
+            if success_message == "OK" and source.cache_key is not None:
+                slapp_result_cache.put(source.cache_key, source.response_object)
+        request.response_object = source.response_object
+        return success_message, request.response_object
+
+    async def _run_slapp_request(self, request: SlappRequest, memo_key: Optional[Hashable] = None):
+        """
+        Wait for the response to a query or describe, then build and send the result to the request's context.
+        If a memo key is given, the built result is also memoised for describes.
+        """
+        ctx = request.ctx
+        try:
+            result = await self._await_slapp(request)
+        except Exception as e:
+            logging.exception(exc_info=e,
+                              msg=f"<@!97288493029416960> " + traceback.format_exc())  # @Slate in logging channel
+            if isinstance(ctx, Context):
+                await ctx.message.add_reaction(SKULL)
+            return
+
+        if result is None:
+            return
+
+        success_message, response_object = result
+        logging.debug(f"Processing Slapp {request!r}")
+
+        if isinstance(ctx, Context):
+            await ctx.message.add_reaction(TYPING)
+            await asyncio.sleep(0.001)  # 1ms yield
+
+        await SlappCommands.process_send_slapp(
+            ctx=ctx,
+            success_message=success_message,
+            response=response_object,
+            memo_key=memo_key)
+        latency.record(TOTAL, perf_counter() - request.sent_at)
+        if isinstance(ctx, Context):
+            await ctx.message.add_reaction(TICK)
+            await asyncio.sleep(0.001)  # 1ms yield
 
     @staticmethod
-    async def process_send_slapp(ctx: SupportsSend, success_message: str, response: SlappResponseObject):
-        """Process and send the Slapp message"""
+    async def process_send_slapp(ctx: SupportsSend, success_message: str, response: SlappResponseObject,
+                                 memo_key: Optional[Hashable] = None):
+        """Process and send the Slapp message, memoising the built message under memo_key if given."""
         if success_message == "OK":
             try:
-                processed = await process_slapp(response)
+                with latency.span(BUILD):
+                    processed = await process_slapp_once(response)
             except Exception as e:
                 if ctx:
                     await ctx.send(content=f'Something went wrong processing the result from Slapp. Blame Slate. 😒🤔 '
@@ -453,7 +748,10 @@ class SlappCommands(commands.Cog):
                 logging.exception(exc_info=e, msg=f"<@!97288493029416960> " + traceback.format_exc())  # @Slate in logging channel
                 return
 
-            await SlappCommands.send_built_slapp(ctx, processed)
+            if memo_key is not None:
+                slapp_describe_memo.put(memo_key, processed.copy())
+            with latency.span(SEND):
+                await SlappCommands.send_built_slapp(ctx, processed)
 
         elif ctx:
             await ctx.send(content=f'Unexpected error from Slapp 🤔: {success_message}')
@@ -472,47 +770,20 @@ class SlappCommands(commands.Cog):
                 if len(field["value"]) > FIELD_VALUE_LIMIT:
                     field["value"] = close_backticks_if_unclosed(truncate(field["value"], FIELD_VALUE_LIMIT - 3))
 
-            removed_fields: List[dict] = []
-            message = 1
             # Only send up to max_messages_to_unroll
-            while message <= max_messages_to_unroll:
-                # While the message is not in limits, or the removed fields has one only (the footer cannot be alone)
-                while (builder.__len__() > TOTAL_CHARACTER_LIMIT
-                       or len(builder.fields) > NUMBER_OF_FIELDS_LIMIT
-                       or len(removed_fields) == 1):
-                    logging.debug(f"Looping builder: {builder.__len__()=}, {len(builder.fields)=}, {len(removed_fields)=}")
-                    # Take from the back
-                    index = len(builder.fields) - 1
-                    removed: dict = builder._fields[index]
-                    builder.remove_field(index)
-                    removed_fields.append(removed)
-
+            for page in paginate_embed(builder, processed.colour, max_messages_to_unroll):
+                builder = page
                 if ctx and builder:
                     last_message_sent = await ctx.send(embed=builder)
                     # Let other async processes do their things
                     await asyncio.sleep(0.001)  # 1ms yield
                     logging.debug(f"Message sent with title {builder.title} of length {len(builder)}")
 
-                if len(removed_fields):
-                    message += 1
-                    removed_fields.reverse()
-                    builder = Embed(title=f'Page {message}', colour=processed.colour, description='')
-                    for field in removed_fields:
-                        try:
-                            builder._fields.append(field)
-                        except AttributeError:
-                            builder._fields = [field]
-                    removed_fields.clear()
-                else:
-                    break
-
             # Now we're at the end, react to the last message (and only do so if we've sent a message)
             if last_message_sent is not None:
-                for react in processed.reacts:
-                    await last_message_sent.add_reaction(react)
-
-                # and record in a buffer
+                # Record in the buffer first so that each reaction works as soon as it appears
                 add_to_reacts_buffer(last_message_sent.id, processed.reacts)
+                reaction_scheduler.schedule(last_message_sent, processed.reacts)
 
         except Exception as e:
             if ctx:
@@ -521,296 +792,291 @@ class SlappCommands(commands.Cog):
             logging.info(f'Attempted to send:\n{builder.to_dict()}')
 
     @staticmethod
-    async def handle_autoseed(ctx: Optional[SupportsSend], description: str, response: Optional[dict]):
-        global module_autoseed_list
-
-        if description.startswith("autoseed_start"):
-            module_autoseed_list.clear()
-        elif not description.startswith("autoseed_end"):
-            team_name = description.rpartition(':')[2]  # take the right side of the colon
-            if module_autoseed_list.get(team_name):
-                module_autoseed_list[team_name].append(SlappResponseObject(response))
-            else:
-                module_autoseed_list[team_name] = [SlappResponseObject(response)]
+    async def handle_autoseed(ctx: Optional[SupportsSend], responses_by_team: Dict[str, List[SlappResponseObject]]):
+        """Order the teams by clout from each team's player responses and send the result."""
+        if render_pool.processes:
+            message, lines = await render_pool.run(
+                render_autoseed, responses_by_team, player_eligibility_memo.snapshot)
         else:
-            # End, do the thing
-            message = ''
-
-            # Team name, list of players, clout, confidence, emoji str
-            teams_by_clout: List[Tuple[str, List[str], int, int, str]] = []
-
-            if module_autoseed_list:
-                for team_name in module_autoseed_list:
-                    team_players = []
-                    team_awards = []
-                    for r in module_autoseed_list[team_name]:
-                        if r.matched_players_len == 0:
-                            p = Player(names=[Name(value=r.query or UNKNOWN_PLAYER, sources=r.sources)])
-                            pass
-                        elif r.matched_players_len > 1:
-                            p = Player(names=[Name(value=r.query or UNKNOWN_PLAYER, sources=r.sources)])
-                            message += f"Too many matches for player {r.query} 😔 " \
-                                       f"({r.matched_players_len=})\n"
-                        else:
-                            p = r.matched_players[0]
-
-                        team_players.append(p)
-                        team_awards.append(get_first_placements_text(r, p))
-
-                    player_skills = [player.skill for player in team_players]
-                    player_skills.sort(reverse=True)
-                    awards = TROPHY * len({award for award_line in team_awards for award in award_line})
-                    awards += TOP_500 * len([player for player in team_players if player.top500])
-                    (_, _), (max_clout, max_confidence) = Skill.team_clout(player_skills)
-                    teams_by_clout.append(
-                        (team_name,
-                         [truncate(player.name.value, 25) for player in team_players],
-                         max_clout,
-                         max_confidence,
-                         awards)
-                    )
-                teams_by_clout.sort(key=itemgetter(2), reverse=True)
+            message, lines = build_autoseed_text(responses_by_team)
+
+        if message:
+            if ctx:
+                await ctx.send(message)
             else:
-                message = "Err... I didn't get any teams back from Slapp."
+                logging.warning("Sending a message without context: ")
+                logging.info(message)
 
-            if message:
-                if ctx:
-                    await ctx.send(message)
-                else:
-                    logging.warning("Sending a message without context: ")
-                    logging.info(message)
-
-            message = ''
-            lines: List[str] = ["Here's how I'd order the teams and their players from best-to-worst, and assuming each team puts its best 4 players on:\n```"]
-            for line in [f"{truncate(tup[0], 50)} (Clout: {tup[2]} with {tup[3]}% confidence) [{', '.join(tup[1])}] {tup[4]}" for tup in teams_by_clout]:
-                lines.append(line)
-
-            for line in lines:
-                if len(message) + len(line) > 1996:
-                    if ctx:
-                        await ctx.send(message + "\n```")
-                    else:
-                        logging.warning("Sending a message without context: ")
-                        logging.info(message + "\n```")
-                    message = '```\n'
-                message += line + '\n'
-
-            if message:
-                message = close_backticks_if_unclosed(message + "\n")
+        message = ''
+        for line in lines:
+            if len(message) + len(line) > 1996:
                 if ctx:
-                    await ctx.send(message)
+                    await ctx.send(message + "\n```")
                 else:
                     logging.warning("Sending a message without context: ")
-                    logging.info(message)
+                    logging.info(message + "\n```")
+                message = '```\n'
+            message += line + '\n'
+
+        if message:
+            message = close_backticks_if_unclosed(message + "\n")
+            if ctx:
+                await ctx.send(message)
+            else:
+                logging.warning("Sending a message without context: ")
+                logging.info(message)
 
     @staticmethod
-    async def handle_predict(ctx: SupportsSend, description: str, response: dict):
-        global module_predict_team_1
-        is_part_2 = description == "predict_2"
-        if not is_part_2:
-            module_predict_team_1 = response
+    async def handle_predict(ctx: SupportsSend, response_1: SlappResponseObject, response_2: SlappResponseObject):
+        if response_1.matched_players_len == 1 and response_2.matched_players_len == 1:
+            matching_mode = 'players'
+        elif response_1.matched_teams_len == 1 and response_2.matched_teams_len == 1:
+            matching_mode = 'teams'
         else:
-            response_1 = SlappResponseObject(module_predict_team_1)
-            response_2 = SlappResponseObject(response)
+            await ctx.send(content=f"I didn't get the right number of players/teams back 😔 "
+                                   f"({response_1.matched_players_len=}/{response_1.matched_teams_len=}, "
+                                   f"{response_2.matched_players_len=}/{response_2.matched_teams_len=})")
+            return
 
-            if response_1.matched_players_len == 1 and response_2.matched_players_len == 1:
-                matching_mode = 'players'
-            elif response_1.matched_teams_len == 1 and response_2.matched_teams_len == 1:
-                matching_mode = 'teams'
+        message = ''
+        if matching_mode == 'teams':
+            team_1 = response_1.matched_teams[0]
+            team_1_skills = response_1.get_team_skills(team_1.guid).values()
+            if team_1_skills:
+                (_, _), (max_clout_1, max_conf_1) = Skill.team_clout(team_1_skills)
+                message += Skill.make_message_clout(max_clout_1, max_conf_1, truncate(team_1.name.value, 25)) + '\n'
             else:
-                await ctx.send(content=f"I didn't get the right number of players/teams back 😔 "
-                                       f"({response_1.matched_players_len=}/{response_1.matched_teams_len=}, "
-                                       f"{response_2.matched_players_len=}/{response_2.matched_teams_len=})")
-                return
+                max_conf_1 = 0
 
-            message = ''
-            if matching_mode == 'teams':
-                team_1 = response_1.matched_teams[0]
-                team_1_skills = response_1.get_team_skills(team_1.guid).values()
-                if team_1_skills:
-                    (_, _), (max_clout_1, max_conf_1) = Skill.team_clout(team_1_skills)
-                    message += Skill.make_message_clout(max_clout_1, max_conf_1, truncate(team_1.name.value, 25)) + '\n'
-                else:
-                    max_conf_1 = 0
-
-                team_2 = response_2.matched_teams[0]
-                team_2_skills = response_2.get_team_skills(team_2.guid).values()
-                if team_2_skills:
-                    (_, _), (max_clout_2, max_conf_2) = Skill.team_clout(team_2_skills)
-                    message += Skill.make_message_clout(max_clout_2, max_conf_2, truncate(team_2.name.value, 25)) + '\n'
-                else:
-                    max_conf_2 = 0
+            team_2 = response_2.matched_teams[0]
+            team_2_skills = response_2.get_team_skills(team_2.guid).values()
+            if team_2_skills:
+                (_, _), (max_clout_2, max_conf_2) = Skill.team_clout(team_2_skills)
+                message += Skill.make_message_clout(max_clout_2, max_conf_2, truncate(team_2.name.value, 25)) + '\n'
+            else:
+                max_conf_2 = 0
 
-                if team_1_skills and team_2_skills:
-                    if max_conf_1 > 2 and max_conf_2 > 2:
-                        favouring_team_1, favouring_team_2 = Skill.calculate_quality_of_game_teams(team_1_skills, team_2_skills)
-                        if favouring_team_1 != favouring_team_2:
-                            message += "Hmm, it'll depend on who's playing, but... "
-                        message += Skill.make_message_fairness(favouring_team_1) + '\n'
-                        favouring_team_1, favouring_team_2 = Skill.calculate_win_probability(team_1_skills, team_2_skills)
-                        message += Skill.make_message_win(favouring_team_1, favouring_team_2, team_1, team_2) + '\n'
+            if team_1_skills and team_2_skills:
+                if max_conf_1 > 2 and max_conf_2 > 2:
+                    favouring_team_1, favouring_team_2 = Skill.calculate_quality_of_game_teams(team_1_skills, team_2_skills)
+                    if favouring_team_1 != favouring_team_2:
+                        message += "Hmm, it'll depend on who's playing, but... "
+                    message += Skill.make_message_fairness(favouring_team_1) + '\n'
+                    favouring_team_1, favouring_team_2 = Skill.calculate_win_probability(team_1_skills, team_2_skills)
+                    message += Skill.make_message_win(favouring_team_1, favouring_team_2, team_1, team_2) + '\n'
 
-                else:
-                    message += "Hmm, I don't have any skill information to make a good guess on the outcome.\n"
-
-            elif matching_mode == 'players':
-                p1 = response_1.matched_players[0]
-                message += Skill.make_message_clout(p1.skill.clout, p1.skill.confidence, truncate(p1.name.value, 25)) + '\n'
-                p2 = response_2.matched_players[0]
-                message += Skill.make_message_clout(p2.skill.clout, p2.skill.confidence, truncate(p2.name.value, 25)) + '\n'
-                quality = Skill.calculate_quality_of_game_players(p1.skill, p2.skill)
-                message += Skill.make_message_fairness(quality) + '\n'
             else:
-                message += f"WTF IS {matching_mode}?!"
+                message += "Hmm, I don't have any skill information to make a good guess on the outcome.\n"
+
+        elif matching_mode == 'players':
+            p1 = response_1.matched_players[0]
+            message += Skill.make_message_clout(p1.skill.clout, p1.skill.confidence, truncate(p1.name.value, 25)) + '\n'
+            p2 = response_2.matched_players[0]
+            message += Skill.make_message_clout(p2.skill.clout, p2.skill.confidence, truncate(p2.name.value, 25)) + '\n'
+            quality = Skill.calculate_quality_of_game_players(p1.skill, p2.skill)
+            message += Skill.make_message_fairness(quality) + '\n'
+        else:
+            message += f"WTF IS {matching_mode}?!"
 
-            await ctx.send(message)
+        await ctx.send(message)
 
-    async def receive_slapp_response(self, success_message: str, response: dict):
-        """slapp response function"""
-        global slapp_started, slapp_caching_finished
+    async def receive_slapp_response(self, success_message: str, response: dict, worker: Optional[SlappWorker] = None):
+        """slapp response function, called with the worker whose Slapp process answered"""
+        worker = worker or self.slapp_pool.workers[0]
 
         if success_message == "Caching task done.":
-            slapp_caching_finished = True
-            logging.info(f"ACK caching done.")
+            was_caching_finished = slapp_readiness.reached(CACHED)
+            worker.caching_finished = True
+            logging.info(f"ACK caching done. {worker=}")
+            if not was_caching_finished:
+                self.start_prewarm()
             return
         elif success_message.startswith('Connection established.'):
-            if self.restart_context:
-                logging.info(f"Slapp connection re-established. {success_message=}, {response=}.")
-                await self.restart_context.add_reaction(TICK)
-                self.restart_context = None
+            if worker.restart_context:
+                logging.info(f"Slapp connection re-established. {worker=}, {success_message=}, {response=}.")
+                await worker.restart_context.add_reaction(TICK)
+                worker.restart_context = None
             else:
-                logging.info(f"Slapp connection established. {success_message=}.")
+                logging.info(f"Slapp connection established. {worker=}, {success_message=}.")
 
-            while len(slapp_ctx_queue):
-                ctx, description = slapp_ctx_queue.popleft()
-                if isinstance(ctx, Context):
-                    await ctx.message.add_reaction(CROSS)
+            for request in worker.requests.fail_all(SlappRestartedError()):
+                for failed in (request, *request.followers):
+                    if isinstance(failed.ctx, Context):
+                        await failed.ctx.message.add_reaction(CROSS)
 
             if "0 players and 0 teams loaded" in success_message:
-                logging.error("Slapp did not load its database correctly.")
-                await self._restart_slapp(None)
+                logging.error(f"Slapp did not load its database correctly. {worker=}")
+                await self._restart_slapp(None, worker)
             else:
-                slapp_started = True
-        elif not slapp_started:
+                worker.started = True
+                await self.slapp_pool.dispatch()
+        elif not worker.started:
             logging.error(f"Slapp is out-of-sync! Received unexpected message without a connection established message."
-                          f" Discarding result. {success_message=}, {response=}")
-            await self._restart_slapp(None)
-        elif len(slapp_ctx_queue) == 0:
-            logging.warning(f"receive_slapp_response but queue is empty. Discarding result: {success_message=}, {response=}")
+                          f" Discarding result. {worker=}, {success_message=}, {response=}")
+            await self._restart_slapp(None, worker)
         else:
-            send_tick = False
-            ctx, description = slapp_ctx_queue.popleft()
-            logging.debug(f"Processing Slapp {response=}")
-
-            if isinstance(ctx, Context):
-                await ctx.message.add_reaction(TYPING)
-                await asyncio.sleep(0.001)  # 1ms yield
-
-            if description.startswith('predict_'):
-                if success_message != "OK":
-                    await SlappCommands.process_send_slapp(
-                        ctx=ctx,
-                        success_message=success_message,
-                        response=SlappResponseObject(response))
-                else:
-                    await SlappCommands.handle_predict(ctx, description, response)
-                send_tick = True
-            elif description.startswith('autoseed'):
-                if success_message != "OK":
-                    await SlappCommands.process_send_slapp(
-                        ctx=ctx,
-                        success_message=success_message,
-                        response=SlappResponseObject(response))
-
-                # If the start, send on and read again.
-                if description.startswith("autoseed_start"):
-                    await SlappCommands.handle_autoseed(None, description, None)
-                    ctx, description = slapp_ctx_queue.popleft()
-
-                await SlappCommands.handle_autoseed(ctx, description, response)
-
-                # Check if last.
-                ctx, description = slapp_ctx_queue[0]
-                if description.startswith("autoseed_end"):
-                    await SlappCommands.handle_autoseed(ctx, description, None)
-                    slapp_ctx_queue.popleft()
-                    send_tick = True
-            elif description.startswith('html'):
-                if success_message != "OK":
-                    await SlappCommands.process_send_slapp(
-                        ctx=ctx,
-                        success_message=success_message,
-                        response=SlappResponseObject(response))
-
-                # If the start, send on and read again.
-                if description.startswith("html_start"):
-                    await handle_html(None, description, None)
-                    ctx, description = slapp_ctx_queue.popleft()
-
-                await handle_html(ctx, description, response)
-
-                # Check if last.
-                ctx, description = slapp_ctx_queue[0]
-                if description.startswith("html_end"):
-                    await handle_html(ctx, description, None)
-                    slapp_ctx_queue.popleft()
-                    send_tick = True
-
+            request = worker.requests.resolve(success_message, response)
+            if request is None:
+                logging.warning(f"receive_slapp_response but no request is waiting. Discarding result: "
+                                f"{worker=}, {success_message=}, {response=}")
             else:
-                try:
-                    response_object = SlappResponseObject(response)
-                except Exception as e:
-                    logging.exception(exc_info=e,
-                                      msg=f"<@!97288493029416960> " + traceback.format_exc())  # @Slate in logging channel
-                    if isinstance(ctx, Context):
-                        await ctx.message.add_reaction(SKULL)
-                else:
-                    await SlappCommands.process_send_slapp(
-                        ctx=ctx,
-                        success_message=success_message,
-                        response=response_object)
-                    send_tick = True
+                logging.debug(f"Slapp response routed to {request!r}")
+            await self.slapp_pool.dispatch()
 
-            if isinstance(ctx, Context) and send_tick:
-                await ctx.message.add_reaction(TICK)
-                await asyncio.sleep(0.001)  # 1ms yield
+    async def get_latest_ipl(self) -> Optional[str]:
+        return await self.ipl_index.get_latest()
 
-    @staticmethod
-    def get_latest_ipl():
-        return get_tournament_ids('inkling-performance-labs')[0]
-
-    async def _restart_slapp(self, ctx: Optional[Context]):
+    async def _restart_slapp(self, ctx: Optional[Context], worker: Optional[SlappWorker] = None):
+        """
+        Restart the given Slapp worker, or every worker if not specified. The other workers keep running.
+        A single worker restarts with the same data, so only restarting every worker invalidates the cached results.
+        """
         logging.warning("Restarting Slapp...")
-        self.slapp_started = False
-        self.restart_context = ctx
-        self.slappipe.kill_slapp()  # We started Slapp with keepOpen so this will restart
+        if worker is None:
+            self._invalidate_slapp_results()
+        for w in ([worker] if worker else self.slapp_pool.workers):
+            w.restart(ctx)  # We started Slapp with keepOpen so this will restart
+        if worker is None and slapp_readiness.reached(CACHED):
+            self.start_prewarm()
         await asyncio.sleep(0.001)  # 1ms yield  # yield/wait for a bit
         logging.info("..._restart_slapp continuing")
 
     async def _patch_slapp(self, ctx: Optional[Context], urls):
         if urls:
             urls = urls.split(' ')
-        await self.slappipe.patch_slapp(urls)
+        await self.slapp_pool.patch_slapp(urls)
+        self._invalidate_slapp_results()
+        if slapp_readiness.reached(CACHED):
+            self.start_prewarm()
         await ctx.message.add_reaction(TICK)
 
-    async def begin_slapp_html(self, ctx, tournament: List[dict]):
-        verification_message, players_to_queue = SlappCommands.prepare_bulk_slapp(tournament)
+    def _invalidate_slapp_results(self):
+        """Forget cached results as the data loaded into Slapp is changing."""
+        self.slapp_pool.snapshot += 1
+        slapp_result_cache.clear()
+        slapp_describe_memo.clear()
+        autoseed_rosters.clear()
+        player_eligibility_memo.invalidate(self.slapp_pool.snapshot)
+        logging.info(f"Slapp results invalidated, now on snapshot {self.slapp_pool.snapshot}")
+
+    def start_prewarm(self):
+        """Pre-warm the caches for the current snapshot in the background, replacing any earlier pre-warming."""
+        if self.prewarm_task:
+            self.prewarm_task.cancel()
+        if prewarm_count > 0:
+            self.prewarm_task = asyncio.create_task(self._prewarm(self.slapp_pool.snapshot))
+
+    async def _prewarm(self, snapshot: int):
+        """
+        Replay the most made lookups from the query log into the result cache and describe memo.
+        Lookups are sent one at a time in the bulk lane, and only while nothing else is waiting for Slapp, so live
+        traffic comes first. Stops if the results are invalidated or Slapp restarts.
+        """
+        warmed = 0
+        for kind, stats in query_log.top(prewarm_count):
+            while len(self.slapp_pool) and snapshot == self.slapp_pool.snapshot:
+                await asyncio.sleep(prewarm_interval)
+            if snapshot != self.slapp_pool.snapshot:
+                return
 
-        # Do the autoseed list
-        await add_to_queue(None, 'html_start')
-        for pair in players_to_queue:
-            await add_to_queue(None, 'html:' + pair[0])
-            await self.slappipe.query_slapp(pair[1])
-        await add_to_queue(ctx, 'html_end')
+            if kind == QUERY:
+                request = await self._send_query(None, 'prewarm', stats.query, limit=stats.limit, lane=BULK)
+                if request.response_object is not None:
+                    continue  # Already cached
+                if await SlappCommands._await_slapp(request) is None:
+                    return
+            else:
+                memo_key = (snapshot, stats.query.lower())
+                if slapp_describe_memo.get(memo_key) is not None:
+                    continue
+                request = await self._send_describe(None, 'prewarm', stats.query, lane=BULK)
+                result = await SlappCommands._await_slapp(request)
+                if result is None:
+                    return
+                success_message, response = result
+                if success_message == "OK" and snapshot == self.slapp_pool.snapshot:
+                    slapp_describe_memo.put(memo_key, await process_slapp_once(response))
+            warmed += 1
+            await asyncio.sleep(prewarm_interval)
+        logging.info(f"Pre-warmed {warmed} popular Slapp lookups on snapshot {snapshot}.")
 
+    async def begin_slapp_html(self, ctx, tournament: List[dict]):
+        verification_message, players_to_queue = SlappCommands.prepare_bulk_slapp(tournament)
         if verification_message:
             await ctx.send(verification_message)
 
-        # Finished in handle_html
+        # Do the html list
+        await ctx.message.add_reaction(RUNNING if slapp_readiness.reached(CACHED) else TURTLE)
+        responses_by_team = await self._query_teams(ctx, players_to_queue)
+        if responses_by_team is None:
+            await ctx.message.add_reaction(CROSS)
+            return
+
+        await handle_html(ctx, responses_by_team)
+        await ctx.message.add_reaction(TICK)
+
+    async def _query_bulk(self, queries: Iterable[str]) -> Optional[Dict[str, Tuple[str, SlappResponseObject]]]:
+        """
+        Look up many queries at once, e.g. every player slug in a tournament.
+        Slapp has no bulk command, so each distinct query is still its own request to Slapp. They are all queued in
+        the bulk lane up-front and awaited together, so they are sent as fast as the workers take them rather than
+        one after the other. Returns each (success_message, response) keyed by its query, or None if Slapp
+        restarted.
+        """
+        queries = list(dict.fromkeys(queries))  # De-duplicate, keeping order
+        requests = [await self._send_query(None, 'bulk', query, lane=BULK) for query in queries]
+        results = await asyncio.gather(*(SlappCommands._await_slapp(request) for request in requests))
+        if any(result is None for result in results):
+            return None
+        return dict(zip(queries, results))
+
+    async def _query_teams(self, ctx: SupportsSend, players_to_queue: List[Tuple[str, str]],
+                           known: Optional[Dict[str, SlappResponseObject]] = None) \
+            -> Optional[Dict[str, List[SlappResponseObject]]]:
+        """
+        Bulk look up the (team name, player slug) pairs from prepare_bulk_slapp.
+        Players already in known are not looked up again, and known is updated with the new successful responses.
+        Returns the player responses keyed by team name, or None if Slapp restarted.
+        """
+        known = dict() if known is None else known
+        results = await self._query_bulk(slug for _, slug in players_to_queue if slug not in known)
+        if results is None:
+            return None
+
+        responses_by_team: Dict[str, List[SlappResponseObject]] = dict()
+        for team_name, slug in players_to_queue:
+            if slug in known:
+                response = known[slug]
+            else:
+                success_message, response = results[slug]
+                if success_message != "OK":
+                    await SlappCommands.process_send_slapp(
+                        ctx=ctx,
+                        success_message=success_message,
+                        response=response)
+                else:
+                    known[slug] = response
+            responses_by_team.setdefault(team_name, []).append(response)
+        return responses_by_team
 
 
+@debug_time_async
 async def process_slapp(r: SlappResponseObject) -> ProcessedSlappObject:
     """slapp response function after building the SlappResponseObject"""
+    if render_pool.processes:
+        return ProcessedSlappObject.from_dict(
+            await render_pool.run(render_slapp, r, player_eligibility_memo.snapshot))
+    return build_slapp(r)
+
+
+def render_slapp(r: SlappResponseObject, snapshot: int) -> dict:
+    """build_slapp, rendered in the render pool and returned as a dict."""
+    _use_snapshot(snapshot)
+    return build_slapp(r).to_dict()
+
+
+def build_slapp(r: SlappResponseObject) -> ProcessedSlappObject:
+    """Build the embed and reactions for the response."""
     has_players = r.has_matched_players
     has_players_pl = r.matched_players_len > 1
     has_teams = r.has_matched_teams
@@ -850,7 +1116,7 @@ async def process_slapp(r: SlappResponseObject) -> ProcessedSlappObject:
 
             p = r.matched_players[i]
             try:
-                await add_matched_player(builder, reacts, r, p)
+                add_matched_player(builder, reacts, r, p)
             except Exception as e:
                 builder.add_field(name='(Error Player)', value=e.__str__(), inline=False)
                 logging.exception(exc_info=e, msg=f"<@!97288493029416960> " + traceback.format_exc())  # @Slate in logging channel
@@ -862,7 +1128,7 @@ async def process_slapp(r: SlappResponseObject) -> ProcessedSlappObject:
 
             t = r.matched_teams[i]
             try:
-                await add_matched_team(builder, reacts, r, t)
+                add_matched_team(builder, reacts, r, t)
             except Exception as e:
                 builder.add_field(name='(Error Team)', value=e.__str__(), inline=False)
                 logging.exception(exc_info=e, msg=f"<@!97288493029416960> " + traceback.format_exc())  # @Slate in logging channel
@@ -872,11 +1138,11 @@ async def process_slapp(r: SlappResponseObject) -> ProcessedSlappObject:
             f'Only the first {MAX_RESULTS} results are shown for players and teams.' if r.show_limited else ''
         ),
         icon_url="https://media.discordapp.net/attachments/471361750986522647/758104388824072253/icon.png")
-    await asyncio.sleep(0.001)  # 1ms yield
-    return ProcessedSlappObject(builder, embed_colour, reacts)
+    return ProcessedSlappObject(builder, embed_colour,
+                                {emoji: str(player_or_team.guid) for emoji, player_or_team in reacts.items()})
 
 
-async def add_matched_team(builder: Embed, reacts: Dict[str, Union[Player, Team]], r: SlappResponseObject, t: Team):
+def add_matched_team(builder: Embed, reacts: Dict[str, Union[Player, Team]], r: SlappResponseObject, t: Team):
     # Transform names by adding a backslash to any backslashes.
     grouped_team_sources = SlappResponseObject.get_grouped_sources_text(t)
     players = r.matched_players_for_teams.get(t.guid.__str__(), [])
@@ -986,14 +1252,14 @@ async def add_matched_team(builder: Embed, reacts: Dict[str, Union[Player, Team]
         builder.add_field(name=truncate(t.__str__(), FIELD_NAME_LIMIT, "") or "Unnamed Team",
                           value=truncate(field_body, FIELD_VALUE_LIMIT),
                           inline=False)
-        await asyncio.sleep(0.001)  # 1ms yield
 
 
-async def add_matched_player(builder: Embed, reacts: Dict[str, Union[Player, Team]], r: SlappResponseObject, p: Player):
+def add_matched_player(builder: Embed, reacts: Dict[str, Union[Player, Team]], r: SlappResponseObject, p: Player):
     # Transform names by adding a backslash to any backslashes.
     names = list({escape_characters(name.value) for name in p.names if name and name.value})
     current_name = f"{names[0]}" if len(names) else "(Unnamed Player)"
-    resolved_teams = r.get_teams_for_player(p)
+    eligibility = player_eligibility_memo.get(r, p)
+    resolved_teams = eligibility.teams
     current_team = None
     if r.is_single_player and resolved_teams:
         emoji_num = add_to_reacts_dict(reacts, resolved_teams[0])
@@ -1043,8 +1309,8 @@ async def add_matched_player(builder: Embed, reacts: Dict[str, Union[Player, Tea
     top500 = (TOP_500 + " ") if p.top500 else ''
     current_name = safe_backticks(current_name)
     field_head = truncate(country_flag + top500 + current_name, FIELD_NAME_LIMIT) or '(Unnamed Player)'
-    notable_results = get_first_placements_text(r, p)
-    best_low_ink = r.best_low_ink_placement(p)
+    notable_results = eligibility.first_placements
+    best_low_ink = eligibility.best_low_ink_placement
     winning_low_ink_pos = best_low_ink[0] if best_low_ink and (("Top Cut" in best_low_ink[1]) or ("Alpha" in best_low_ink[1])) else None
 
     grouped_player_sources = SlappResponseObject.get_grouped_sources_text(p)
@@ -1162,7 +1428,6 @@ async def add_matched_player(builder: Embed, reacts: Dict[str, Union[Player, Tea
         field_body += additional_info
 
         builder.add_field(name=field_head, value=field_body, inline=False)
-        await asyncio.sleep(0.001)  # 1ms yield
 
 
 def add_to_reacts_dict(reacts, player_or_team: Union[Player, Team]) -> Optional[str]:
@@ -1217,19 +1482,5 @@ def best_team_player_div_string(
         return f"Highest div player is ``{name}`` when playing for {highest_team.name} ({highest_div})."
 
 
-def add_to_reacts_buffer(message_id: str, reacts: Dict[str, Union[Player, Team]]):
-    slapp_reacts_queue[message_id] = reacts
-    if len(slapp_reacts_queue) > NUMBERS_KEY_CAPS_LEN:  # always ensure we have room for the last message.
-        slapp_reacts_queue.popitem(last=False)
-
-
-def get_first_placements_text(r: SlappResponseObject, p: Player) -> List[str]:
-    """
-    Gets a list of displayed text in form where the specified player has come first.
-    """
-    return [
-        f"{tup[1].name} in {tup[0].get_linked_name_display()}"
-        f"{conditional_str(prefix=' as ', result=(join(' or ', p.filter_to_source(tup[0]).names[0:], post_func=lambda x: safe_backticks(truncate(x, 16)))))}"
-        f"{conditional_str(prefix=' in team ', result=(join(' or ', [team.name for team in r.get_teams_from_ids(tup[2]) if team.guid != UnknownTeam.guid], post_func=lambda x: safe_backticks(truncate(x, 64)))))}"
-        for tup in r.get_placements_by_place(p)
-    ]
+def add_to_reacts_buffer(message_id: Union[int, str], reacts: Dict[str, str]):
+    reaction_index.add(message_id, reacts)
@@ -2,6 +2,7 @@ import asyncio
 import logging
 import os
 import sys
+from typing import Optional
 
 import discord
 from discord import RawReactionActionEvent
@@ -34,6 +35,14 @@ class DolaBot(Bot):
         )
         self.mit_commands = None
         self.slapp_commands = None
+        self._cogs_added: Optional[asyncio.Event] = None
+
+    @property
+    def cogs_added(self) -> asyncio.Event:
+        """Set once setup_hook has added the cogs. Created on first use so that it belongs to the running loop."""
+        if self._cogs_added is None:
+            self._cogs_added = asyncio.Event()
+        return self._cogs_added
 
     async def setup_hook(self):
         # Load Cogs
@@ -44,6 +53,7 @@ class DolaBot(Bot):
         await self.try_add_cog(ServerCommands)
         self.slapp_commands: SlappCommands = await self.try_add_cog(SlappCommands)
         await self.try_add_cog(SplatoonCommands)
+        self.cogs_added.set()
 
     async def try_add_cog(self, cog: commands.cog):
         try:
@@ -100,7 +110,10 @@ class DolaBot(Bot):
         await self.change_presence(activity=discord.Game(name=presence))
 
     async def on_raw_reaction_add(self, payload: RawReactionActionEvent):
-        if payload.user_id != self.user.id:
+        # Most reactions are on messages that aren't Slapp results, so reject those before doing any work
+        if payload.user_id != self.user.id \
+                and self.slapp_commands \
+                and SlappCommands.is_tracked_message(payload.message_id):
             await self.slapp_commands.handle_reaction(payload)
 
     def do_the_thing(self):
@@ -113,8 +126,10 @@ class DolaBot(Bot):
         )
 
     async def initialise_slapp(self):
-        while self.slapp_commands is None:
-            await asyncio.sleep(3)
-        assert isinstance(self.slapp_commands, SlappCommands)
+        """Start Slapp as soon as its cog has been added. Queries made before it's ready wait for it."""
+        await self.cogs_added.wait()
+        if self.slapp_commands is None:
+            logging.error("The Slapp cog was not added, so Slapp will not be started.")
+            return
         logging.info("Beginning slapp init.")
         await self.slapp_commands.initialise_slapp()
@@ -0,0 +1,116 @@
+"""
+Fetches Battlefy tournament teams without blocking the event loop.
+Each tournament is cached for a short time and then revalidated with the server's ETag / Last-Modified,
+and concurrent fetches of the same tournament share one download.
+"""
+import asyncio
+import logging
+import os
+from time import monotonic
+from typing import Optional, List, Dict, Callable
+
+import aiohttp
+from battlefy_toolkit.endpoints.addresses import TEAMS_FETCH_ADDRESS_FORMAT
+
+
+class BattlefyFetchError(Exception):
+    """Raised when a tournament could not be fetched and there is no cached copy to fall back on."""
+    pass
+
+
+class _CachedTournament:
+    def __init__(self, teams: List[dict], etag: Optional[str], last_modified: Optional[str], fetched_at: float):
+        self.teams: List[dict] = teams
+        self.etag: Optional[str] = etag
+        self.last_modified: Optional[str] = last_modified
+        self.fetched_at: float = fetched_at
+
+
+class BattlefyFetcher:
+    """
+    Fetches tournament teams from the Battlefy teams endpoint.
+    The address format takes the tourney_id, and a ttl of 0 revalidates on every fetch.
+    """
+
+    def __init__(self,
+                 address_format: str = TEAMS_FETCH_ADDRESS_FORMAT,
+                 ttl: Optional[float] = None,
+                 timeout: float = 30,
+                 clock: Callable[[], float] = monotonic):
+        self.address_format: str = address_format
+        self.ttl: float = ttl if ttl is not None else float(os.getenv("BATTLEFY_CACHE_TTL", "60"))
+        self.timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=timeout)
+        self.clock: Callable[[], float] = clock
+        self.downloads: int = 0
+        """The number of full downloads made, i.e. not counting revalidations that came back unchanged."""
+        self._cache: Dict[str, _CachedTournament] = dict()
+        self._in_flight: Dict[str, asyncio.Task] = dict()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def get_teams(self, tourney_id: str, force: bool = False) -> List[dict]:
+        """
+        Get the teams signed up to the tournament.
+        A cached copy younger than the ttl is returned as-is unless force is set; otherwise the copy is revalidated.
+        Raises BattlefyFetchError if the fetch fails and nothing is cached.
+        """
+        cached = self._cache.get(tourney_id)
+        if cached and not force and self.clock() - cached.fetched_at < self.ttl:
+            return cached.teams
+
+        task = self._in_flight.get(tourney_id)
+        if task is None:
+            task = asyncio.create_task(self._fetch(tourney_id))
+            self._in_flight[tourney_id] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(tourney_id, None))
+        # Shield so that one caller being cancelled doesn't cancel the download for everyone else
+        return await asyncio.shield(task)
+
+    def invalidate(self, tourney_id: Optional[str] = None):
+        """Forget the cached copy of the tournament, or of every tournament if None."""
+        if tourney_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(tourney_id, None)
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _fetch(self, tourney_id: str) -> List[dict]:
+        cached = self._cache.get(tourney_id)
+        headers = {}
+        if cached and cached.etag:
+            headers['If-None-Match'] = cached.etag
+        if cached and cached.last_modified:
+            headers['If-Modified-Since'] = cached.last_modified
+
+        address = self.address_format.format(tourney_id=tourney_id)
+        try:
+            async with self._get_session().get(address, headers=headers) as response:
+                if response.status == 304 and cached:
+                    logging.debug(f"Battlefy tournament {tourney_id} is unchanged.")
+                    cached.fetched_at = self.clock()
+                    return cached.teams
+
+                response.raise_for_status()
+                teams = await response.json(content_type=None)
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as ex:
+            if cached:
+                logging.warning(f"Failed to refresh Battlefy tournament {tourney_id}, using the cached copy. {ex=}")
+                return cached.teams
+            raise BattlefyFetchError(f"Failed to fetch Battlefy tournament {tourney_id}: {ex!r}") from ex
+
+        if isinstance(teams, dict):
+            teams = [teams]
+        self.downloads += 1
+        self._cache[tourney_id] = _CachedTournament(teams or [], etag, last_modified, self.clock())
+        logging.info(f"Downloaded Battlefy tournament {tourney_id} ({len(teams or [])} teams).")
+        return teams or []
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        return self._session
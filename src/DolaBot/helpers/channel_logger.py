@@ -1,38 +1,165 @@
 import asyncio
+import contextvars
 import logging
 import os
 import platform
+import threading
+from collections import deque
 from logging import StreamHandler
+from typing import Optional, List, Deque, Tuple
 
+from discord.abc import Messageable
 from discord.ext.commands import Bot
 
 from DolaBot.helpers.embed_helper import MESSAGE_TEXT_LIMIT
 
+_shipping: contextvars.ContextVar[bool] = contextvars.ContextVar('_shipping', default=False)
+"""Set while the handler sends to the channel, so that anything logged by the send isn't shipped in turn."""
+
+
+def coalesce_messages(lines: List[str], limit: int = MESSAGE_TEXT_LIMIT) -> List[str]:
+    """Join the lines into as few messages of at most limit characters as possible, splitting overlong lines."""
+    messages: List[str] = []
+    current = ''
+    for line in lines:
+        while len(line) > limit:
+            if current:
+                messages.append(current)
+                current = ''
+            messages.append(line[:limit])
+            line = line[limit:]
+
+        if not current:
+            current = line
+        elif len(current) + 1 + len(line) <= limit:
+            current += '\n' + line
+        else:
+            messages.append(current)
+            current = line
+    if current:
+        messages.append(current)
+    return messages
+
 
 class ChannelLogHandler(StreamHandler):
-    def __init__(self, bot: Bot):
+    """
+    Ships log records to the LOGS_CHANNEL.
+    emit only queues the record, so it never blocks and is safe from any thread. The queue is sent every interval
+    seconds, or sooner once it holds a message's worth, as few messages as possible one after another.
+    When the queue is full, records below WARNING are dropped first and the number dropped is reported.
+    """
+
+    def __init__(self, bot: Optional[Bot], log_channel: Optional[Messageable] = None,
+                 max_records: Optional[int] = None, interval: Optional[float] = None):
         StreamHandler.__init__(self)
         self.bot = bot
-        self.log_channel = os.getenv("LOGS_CHANNEL", None)
-        if self.log_channel:
+        self.log_channel = log_channel or os.getenv("LOGS_CHANNEL", None)
+        self.max_records: int = max_records or int(os.getenv("LOGS_CHANNEL_QUEUE_SIZE", "200"))
+        self.interval: float = interval or float(os.getenv("LOGS_CHANNEL_INTERVAL", "2"))
+        self.dropped: int = 0
+        """The number of records dropped since the last report."""
+        self._records: Deque[Tuple[int, str]] = deque()
+        self._pending_length: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        if isinstance(self.log_channel, str):
             self.log_channel = self.bot.get_channel(int(self.log_channel))
+        if self.log_channel:
             logger = logging.getLogger()
+            if any(isinstance(handler, ChannelLogHandler) for handler in logger.handlers):
+                return  # e.g. on_ready again after a reconnect
+
             logger.setLevel(logging.INFO)
             self.setLevel(logging.INFO)
             computer_name = os.getenv("COMPUTERNAME", platform.node())
             formatter = logging.Formatter('[' + computer_name + '] [%(levelname)s]: %(message)s')
             self.setFormatter(formatter)
+            self.start()
             logger.addHandler(self)
 
+    def start(self):
+        """Start sending from the running loop."""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._ship_loop())
+
     def emit(self, record):
-        msg = self.format(record)
-        
+        if _shipping.get():
+            return
+
+        try:
+            msg = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+
         # Don't emit rate limiting messages otherwise we'll be stuck!!
         if "We are being rate limited" in msg:
             return
 
-        while len(msg) > MESSAGE_TEXT_LIMIT:
-            truncated_send = msg[:MESSAGE_TEXT_LIMIT]
-            asyncio.create_task(self.log_channel.send(truncated_send))
-            msg = msg[MESSAGE_TEXT_LIMIT:]
-        asyncio.create_task(self.log_channel.send(msg))
+        with self._lock:
+            if len(self._records) >= self.max_records and not self._make_room(record.levelno):
+                self.dropped += 1
+                return
+            self._records.append((record.levelno, msg))
+            self._pending_length += len(msg) + 1
+            should_wake = self._pending_length >= MESSAGE_TEXT_LIMIT
+
+        if should_wake and self._loop and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        StreamHandler.close(self)
+
+    async def flush_to_channel(self):
+        """Send everything queued so far."""
+        with self._lock:
+            lines = [msg for _, msg in self._records]
+            if self.dropped:
+                lines.insert(0, f"(Dropped {self.dropped} log records as the log channel couldn't keep up.)")
+                self.dropped = 0
+            self._records.clear()
+            self._pending_length = 0
+
+        token = _shipping.set(True)
+        try:
+            for message in coalesce_messages(lines):
+                try:
+                    await self.log_channel.send(message)
+                except Exception:
+                    pass  # Logging this would only be shipped back here
+        finally:
+            _shipping.reset(token)
+
+    def _make_room(self, levelno: int) -> bool:
+        """
+        Make room for a record of this level by dropping the oldest record below WARNING, or else the oldest record
+        below this level. Records below WARNING never make room. Returns if room was made.
+        """
+        if levelno < logging.WARNING:
+            return False
+
+        for threshold in (logging.WARNING, levelno):
+            for i, (queued_levelno, msg) in enumerate(self._records):
+                if queued_levelno < threshold:
+                    del self._records[i]
+                    self._pending_length -= len(msg) + 1
+                    self.dropped += 1
+                    return True
+        return False
+
+    async def _ship_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if self._records or self.dropped:
+                await self.flush_to_channel()
@@ -4,6 +4,8 @@ import discord
 from discord import Embed, Color, Colour
 from slapp_py.helpers.str_helper import truncate
 
+from DolaBot.helpers.timer_decorator import debug_time
+
 # LIMITS: See https://discord.com/developers/docs/resources/channel#embed-limits-limits
 TITLE_LIMIT = 256
 DESCRIPTION_LIMIT = 4096
@@ -53,6 +55,52 @@ def to_embed(
     )
 
 
+@debug_time
+def paginate_embed(
+        builder: Embed,
+        colour: Union[None, Colour] = None,
+        max_pages: int = 10) -> List[Embed]:
+    """
+    Split the embed's fields into pages that are each within the embed limits.
+    Each field is measured once and packed in order, so this is linear in the number of fields.
+    The builder keeps as many leading fields as fit and is the first page; the rest go onto 'Page n' embeds.
+    A single field is never left on its own for the last page.
+    Fields that don't fit in max_pages are dropped.
+
+    :param builder: The embed to paginate. Its fields are replaced by the first page's.
+    :param colour: The colour of the extra pages.
+    :param max_pages: The maximum number of pages to return.
+    :return: The pages, starting with the builder.
+    """
+    fields: List[dict] = list(getattr(builder, '_fields', []))
+    sizes: List[int] = [len(field['name']) + len(field['value']) for field in fields]
+    page = builder
+    page_size = len(builder) - sum(sizes)
+    pages: List[Embed] = []
+    start = 0
+    while True:
+        end = start
+        while (end < len(fields)
+               and end - start < NUMBER_OF_FIELDS_LIMIT
+               and page_size + sizes[end] <= TOTAL_CHARACTER_LIMIT):
+            page_size += sizes[end]
+            end += 1
+
+        # The last field cannot be alone
+        if len(fields) - end == 1 and end > start:
+            end -= 1
+
+        page._fields = fields[start:end]
+        pages.append(page)
+        start = end
+        if start >= len(fields) or len(pages) >= max_pages:
+            break
+
+        page = Embed(title=f'Page {len(pages) + 1}', colour=colour, description='')
+        page_size = len(page)
+    return pages
+
+
 def append_unrolled_list(
         builder: Embed,
         field_header: str,
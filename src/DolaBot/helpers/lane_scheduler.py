@@ -0,0 +1,87 @@
+"""
+Orders the requests waiting for Slapp by lane, so that interactive queries aren't stuck behind bulk jobs.
+"""
+import math
+import os
+from collections import deque
+from time import perf_counter
+from typing import Callable, Deque, Dict, Generic, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+INTERACTIVE = "interactive"
+"""Commands that someone is waiting on, e.g. ~slapp, ~full, ~predict or verifying a single team."""
+REACTION = "reaction"
+"""Describing a result that someone reacted to."""
+BULK = "bulk"
+"""The many lookups of autoseed and verify all."""
+LANES = (INTERACTIVE, REACTION, BULK)
+
+DEFAULT_WEIGHTS: Dict[str, int] = {INTERACTIVE: 8, REACTION: 4, BULK: 1}
+"""How many requests each lane gets dispatched for every one of BULK when all lanes are waiting."""
+
+
+class LaneScheduler(Generic[T]):
+    """
+    Weighted fair dispatch across lanes, first in first out within a lane.
+    Lanes are picked by smooth weighted round robin, so a lane with weight 8 gets 8 of every 13 picks against weights
+    of 4 and 1 but its picks are interleaved with the others rather than taken in a burst. Only lanes with something
+    waiting take part. A lane that hasn't been picked for max_wait seconds is picked next regardless of weight, so
+    bulk work always progresses.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, int]] = None, max_wait: Optional[float] = None,
+                 clock: Callable[[], float] = perf_counter):
+        self.weights: Dict[str, int] = dict(weights or DEFAULT_WEIGHTS)
+        self.max_wait: float = max_wait if max_wait is not None \
+            else float(os.getenv("SLAPP_LANE_MAX_WAIT", "30"))
+        self.clock: Callable[[], float] = clock
+        self._queues: Dict[str, Deque[T]] = {lane: deque() for lane in self.weights}
+        self._current: Dict[str, int] = {lane: 0 for lane in self.weights}
+        self._last_picked_at: Dict[str, float] = {lane: clock() for lane in self.weights}
+
+    def __len__(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+    def __str__(self):
+        return ', '.join(f"{lane}={len(queue)}" for lane, queue in self._queues.items())
+
+    def push(self, lane: str, item: T):
+        queue = self._queues[lane]
+        if not queue:
+            # Time waiting starts from when the lane has something to wait with
+            self._last_picked_at[lane] = self.clock()
+        queue.append(item)
+
+    def pop(self) -> Optional[Tuple[str, T]]:
+        """The next lane and item to dispatch, or None if nothing is waiting."""
+        waiting = [lane for lane, queue in self._queues.items() if queue]
+        if not waiting:
+            return None
+
+        now = self.clock()
+        starved = min(waiting, key=lambda lane: self._last_picked_at[lane])
+        if now - self._last_picked_at[starved] >= self.max_wait:
+            lane = starved
+        else:
+            for waiting_lane in waiting:
+                self._current[waiting_lane] += self.weights[waiting_lane]
+            lane = max(waiting, key=lambda waiting_lane: self._current[waiting_lane])
+            self._current[lane] -= sum(self.weights[waiting_lane] for waiting_lane in waiting)
+
+        self._last_picked_at[lane] = now
+        queue = self._queues[lane]
+        item = queue.popleft()
+        if not queue:
+            self._current[lane] = 0
+        return lane, item
+
+    def ahead_of(self, lane: str) -> int:
+        """An estimate of how many waiting items would be dispatched before an item pushed to the lane now."""
+        own = len(self._queues[lane])
+        rounds = own + 1
+        ahead = own
+        for other, queue in self._queues.items():
+            if other != lane:
+                ahead += min(len(queue), math.ceil(rounds * self.weights[other] / self.weights[lane]))
+        return ahead
@@ -0,0 +1,122 @@
+"""
+Per-stage latency of Slapp requests, kept as rolling percentiles for ~debug and a Prometheus text export.
+"""
+import logging
+import os
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Deque, List, Optional
+
+QUEUE_WAIT = "queue_wait"
+"""Waiting in its lane, and for Slapp to answer the requests sent to the same worker before this one."""
+IPC = "ipc"
+"""Slapp working on the request, from when it's free (or the request was sent) until it answers."""
+DECODE = "decode"
+"""Decoding the response into a SlappResponseObject."""
+BUILD = "build"
+"""Building the embed."""
+SEND = "send"
+"""Sending the result to Discord."""
+TOTAL = "total"
+"""From sending the request to Slapp until the result is sent to Discord."""
+STAGES = (QUEUE_WAIT, IPC, DECODE, BUILD, SEND, TOTAL)
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class RollingHistogram:
+    """The most recent window of samples, from which percentiles are read, plus the all-time count and sum."""
+
+    def __init__(self, window: int = 1024):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+        self.sum += seconds
+
+    def percentiles(self, quantiles=QUANTILES) -> List[float]:
+        """The nearest-rank percentiles of the window, or zeros if there are no samples."""
+        if not self.samples:
+            return [0.0 for _ in quantiles]
+        ordered = sorted(self.samples)
+        return [ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in quantiles]
+
+
+class LatencyRecorder:
+    """A RollingHistogram for each stage of a Slapp request."""
+
+    def __init__(self, window: int = 1024):
+        self.window: int = window
+        self.histograms: Dict[str, RollingHistogram] = dict()
+
+    def record(self, stage: str, seconds: float):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = RollingHistogram(self.window)
+        histogram.add(seconds)
+
+    @contextmanager
+    def span(self, stage: str):
+        """Record the time taken by the body of the with statement against the stage."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, perf_counter() - start)
+
+    def median(self, stage: str, default: float) -> float:
+        """The stage's median over the window, or the default if it has no samples."""
+        histogram = self.histograms.get(stage)
+        return histogram.percentiles((0.5,))[0] if histogram and histogram.samples else default
+
+    def summary_text(self) -> str:
+        """A line per stage of its p50/p90/p99 in milliseconds, for ~debug."""
+        lines = []
+        for stage in sorted(self.histograms, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES)):
+            histogram = self.histograms[stage]
+            p50, p90, p99 = (round(p * 1000, 1) for p in histogram.percentiles())
+            lines.append(f"{stage}: p50 {p50}ms, p90 {p90}ms, p99 {p99}ms (n={histogram.count})")
+        return '\n'.join(lines) or "(no requests yet)"
+
+    def prometheus_text(self) -> str:
+        """The histograms in the Prometheus text exposition format, as a summary metric."""
+        name = "dola_slapp_stage_seconds"
+        lines = [f"# HELP {name} Time spent in each stage of a Slapp request.", f"# TYPE {name} summary"]
+        for stage, histogram in self.histograms.items():
+            for q, value in zip(QUANTILES, histogram.percentiles()):
+                lines.append(f'{name}{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+latency: LatencyRecorder = LatencyRecorder(window=int(os.getenv("SLAPP_LATENCY_WINDOW", "1024")))
+"""The latency of every Slapp request."""
+
+
+async def start_metrics_server(port: Optional[int] = None):
+    """
+    Serve latency.prometheus_text at /metrics on the METRICS_PORT, if set. Returns the runner to clean up, or None.
+    """
+    if port is None:
+        port = os.getenv("METRICS_PORT")
+        if not port:
+            return None
+        port = int(port)
+
+    from aiohttp import web
+
+    async def metrics(_: web.Request) -> web.Response:
+        return web.Response(text=latency.prometheus_text(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, port=port).start()
+    logging.info(f"Serving metrics on port {port}.")
+    return runner
@@ -0,0 +1,162 @@
+"""
+Slapp responses that only build the players, teams and brackets that are looked at.
+"""
+import binascii
+import json
+from functools import cached_property
+from typing import Callable, Dict, Generic, Iterator, List, Mapping, Optional, Sequence, TypeVar, Tuple
+from uuid import UUID
+
+from slapp_py.core_classes.bracket import Bracket
+from slapp_py.core_classes.player import Player
+from slapp_py.core_classes.simple_source import SimpleSource
+from slapp_py.core_classes.team import Team
+from slapp_py.slapp_runner.slapp_response_object import SlappResponseObject
+
+try:
+    import orjson
+    _loads: Callable[[bytes], dict] = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+T = TypeVar('T')
+
+
+def decode_slapp_payload(line: bytes) -> dict:
+    """
+    Decode a base64-encoded JSON line from Slapp.
+    The decoded bytes are parsed as they are, without a copy to str, with orjson if it's installed.
+    """
+    return _loads(binascii.a2b_base64(line))
+
+
+class _LazyList(Sequence[T], Generic[T]):
+    """The raw items, each built the first time it's accessed."""
+
+    def __init__(self, raw: list, build: Callable[[dict], T]):
+        self._raw = raw
+        self._build = build
+        self._built: List[Optional[T]] = [None] * len(raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        item = self._built[index]
+        if item is None:
+            item = self._built[index] = self._build(self._raw[index])
+        return item
+
+    def __iter__(self) -> Iterator[T]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+class _LazyMapping(Mapping[str, T], Generic[T]):
+    """The raw values, each built the first time its key is looked up."""
+
+    def __init__(self, raw: dict, build: Callable[[object], T]):
+        self._raw = raw
+        self._build = build
+        self._built: Dict[str, T] = dict()
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __contains__(self, key):
+        return key in self._raw
+
+    def __getitem__(self, key: str) -> T:
+        item = self._built.get(key)
+        if item is None:
+            item = self._built[key] = self._build(self._raw[key])
+        return item
+
+
+class _KnownTeams(Mapping[str, Team]):
+    """The additional teams and the matched teams by id, with the matched teams as the same objects as matched_teams."""
+
+    def __init__(self, additional_teams: dict, matched_teams: _LazyList[Team], matched_raw: list):
+        self._additional = _LazyMapping(additional_teams, Team.from_dict)
+        self._matched = matched_teams
+        self._matched_index: Dict[str, int] = {str(UUID(team.get("Id"))): i for i, team in enumerate(matched_raw)}
+
+    def __len__(self):
+        return len(set(self._additional) | set(self._matched_index))
+
+    def __iter__(self):
+        yield from (team_id for team_id in self._additional if team_id not in self._matched_index)
+        yield from self._matched_index
+
+    def __contains__(self, key):
+        return key in self._matched_index or key in self._additional
+
+    def __getitem__(self, key: str) -> Team:
+        index = self._matched_index.get(key)
+        if index is not None:
+            return self._matched[index]
+        return self._additional[key]
+
+
+def _build_players_for_team(player_tuples: list) -> List[Tuple[Player, bool]]:
+    # The tuple is sent as a dict keyed by Item1 (the Player) and Item2 (if the player is currently in the team).
+    return [(Player.from_dict(tup.get("Item1")), bool(tup.get("Item2", False)))
+            for tup in player_tuples if isinstance(tup.get("Item1", None), dict)]
+
+
+def _build_placements_for_player(source_dicts: dict) -> Dict[SimpleSource, List[Bracket]]:
+    placements: Dict[SimpleSource, List[Bracket]] = {}
+    for source_name, brackets in source_dicts.items():
+        for bracket in brackets:
+            placements.setdefault(SimpleSource(source_name), []).append(Bracket.from_dict(bracket))
+    return placements
+
+
+class LazySlappResponse(SlappResponseObject):
+    """
+    A SlappResponseObject over the decoded response dict.
+    Broad queries return far more players and teams than are shown, so each player, team, team roster and player's
+    placements is only built when it is first used, and then kept.
+    """
+
+    def __init__(self, response: dict):
+        # SlappResponseObject.__init__ builds everything up front, so isn't called.
+        self._response = response
+        self.query = response.get("Query", "<UNKNOWN_QUERY_PLEASE_DEBUG>")
+
+    def __reduce__(self):
+        """Pickled as the response dict alone, e.g. to be rendered in another process."""
+        return LazySlappResponse, (self._response,)
+
+    @cached_property
+    def matched_players(self) -> Sequence[Player]:
+        return _LazyList(self._response.get("Players", []), Player.from_dict)
+
+    @cached_property
+    def matched_teams(self) -> Sequence[Team]:
+        return _LazyList(self._response.get("Teams", []), Team.from_dict)
+
+    @cached_property
+    def known_teams(self) -> Mapping[str, Team]:
+        return _KnownTeams(self._response.get("AdditionalTeams", {}), self.matched_teams,
+                           self._response.get("Teams", []))
+
+    @cached_property
+    def matched_players_for_teams(self) -> Mapping[str, List[Tuple[Player, bool]]]:
+        """Keyed by Team id, of value (Player, bool)[], where the bool is if the Player is currently in the team."""
+        return _LazyMapping(self._response.get("PlayersForTeams", {}), _build_players_for_team)
+
+    @cached_property
+    def placements_for_players(self) -> Mapping[str, Dict[SimpleSource, List[Bracket]]]:
+        """Keyed by Player id, of value Dictionary keyed by Source of value Placements list"""
+        return _LazyMapping(self._response.get("PlacementsForPlayers", {}), _build_placements_for_player)
+
+    @cached_property
+    def sources(self) -> List[SimpleSource]:
+        return SimpleSource.from_serialized(self._response.get("Sources")) or []
@@ -0,0 +1,64 @@
+"""
+A bounded least-recently-used cache whose entries also expire after a time-to-live.
+"""
+from collections import OrderedDict
+from time import monotonic
+from typing import Generic, TypeVar, Optional, Callable, Tuple, Hashable
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class LruTtlCache(Generic[K, V]):
+    """
+    Evicts the least recently used entry once max_size is reached, and treats entries older than ttl seconds as
+    missing. A ttl of None means entries do not expire.
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None, clock: Callable[[], float] = monotonic):
+        self.max_size: int = max(1, max_size)
+        self.ttl: Optional[float] = ttl
+        self.clock: Callable[[], float] = clock
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[K, Tuple[float, V]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._expired(entry)
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if self._expired(entry):
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: K, value: V):
+        self._entries[key] = (self.clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> Optional[V]:
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self):
+        self._entries.clear()
+
+    def _expired(self, entry: Tuple[float, V]) -> bool:
+        return self.ttl is not None and self.clock() - entry[0] > self.ttl
+
+    def __repr__(self):
+        return f"LruTtlCache({len(self)}/{self.max_size}, {self.ttl=}, {self.hits=}, {self.misses=})"
@@ -0,0 +1,82 @@
+"""
+An in-memory index of a Battlefy organisation's tournaments that refreshes in the background.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Optional, List, Callable
+
+from battlefy_toolkit.downloaders.org_downloader import get_tournament_ids
+
+
+class OrgTournamentIndex:
+    """
+    The tournament ids of a Battlefy organisation, newest first.
+    The blocking organisation lookup runs in an executor every refresh_interval seconds, so reads are served from
+    memory without a network call.
+    """
+
+    def __init__(self,
+                 org_slug: str,
+                 refresh_interval: Optional[float] = None,
+                 fetch: Callable[[str], Optional[List[str]]] = get_tournament_ids):
+        self.org_slug: str = org_slug
+        self.refresh_interval: float = refresh_interval if refresh_interval is not None \
+            else float(os.getenv("BATTLEFY_ORG_REFRESH", "900"))
+        self.fetch: Callable[[str], Optional[List[str]]] = fetch
+        self.tournament_ids: List[str] = []
+        self.refreshed_at: Optional[datetime] = None
+        """When the ids were last successfully refreshed (UTC)."""
+        self._refresh_lock: asyncio.Lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def latest(self) -> Optional[str]:
+        """The newest tournament id, or None if the index hasn't loaded yet."""
+        return self.tournament_ids[0] if self.tournament_ids else None
+
+    async def get_latest(self) -> Optional[str]:
+        """The newest tournament id, waiting for the first refresh if the index hasn't loaded yet."""
+        if not self.tournament_ids:
+            await self.refresh()
+        return self.latest
+
+    async def refresh(self) -> bool:
+        """Reload the tournament ids. On failure the previous ids are kept. Returns if the refresh succeeded."""
+        async with self._refresh_lock:
+            try:
+                loop = asyncio.get_running_loop()
+                tournament_ids = await loop.run_in_executor(None, self.fetch, self.org_slug)
+            except Exception as ex:
+                logging.error(f"Failed to refresh the tournaments of {self.org_slug}: {ex=}")
+                return False
+
+            if not tournament_ids:
+                logging.warning(f"No tournaments returned for {self.org_slug}, keeping the previous index.")
+                return False
+
+            self.tournament_ids = list(tournament_ids)
+            self.refreshed_at = datetime.utcnow()
+            logging.info(f"Refreshed the tournaments of {self.org_slug}: {len(self.tournament_ids)} tournaments, "
+                         f"latest {self.latest}.")
+            return True
+
+    def start(self):
+        """Start refreshing in the background, if not already."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _refresh_loop(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_interval)
+
+    def __str__(self):
+        refreshed = self.refreshed_at.strftime('%Y-%m-%d %H:%M:%S UTC') if self.refreshed_at else 'never'
+        return f"{self.org_slug}: latest {self.latest} ({len(self.tournament_ids)} tournaments, refreshed {refreshed})"
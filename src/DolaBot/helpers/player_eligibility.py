@@ -0,0 +1,77 @@
+"""
+A summary of a player's results that decides their eligibility, memoised per player and Slapp snapshot.
+"""
+from typing import List, Optional, Tuple, Hashable
+
+from DolaBot.helpers.discord_helper import safe_backticks
+from DolaBot.helpers.lru_ttl_cache import LruTtlCache
+from slapp_py.core_classes.builtins import UnknownTeam
+from slapp_py.core_classes.division import Division
+from slapp_py.core_classes.player import Player
+from slapp_py.core_classes.team import Team
+from slapp_py.helpers.str_helper import join, truncate, conditional_str
+from slapp_py.slapp_runner.slapp_response_object import SlappResponseObject
+
+
+def get_first_placements_text(r: SlappResponseObject, p: Player) -> List[str]:
+    """
+    Gets a list of displayed text in form where the specified player has come first.
+    """
+    return [
+        f"{tup[1].name} in {tup[0].get_linked_name_display()}"
+        f"{conditional_str(prefix=' as ', result=(join(' or ', p.filter_to_source(tup[0]).names[0:], post_func=lambda x: safe_backticks(truncate(x, 16)))))}"
+        f"{conditional_str(prefix=' in team ', result=(join(' or ', [team.name for team in r.get_teams_from_ids(tup[2]) if team.guid != UnknownTeam.guid], post_func=lambda x: safe_backticks(truncate(x, 64)))))}"
+        for tup in r.get_placements_by_place(p)
+    ]
+
+
+class PlayerEligibility:
+    """The bracket scans of a player's response that verification and autoseeding need, done once."""
+
+    def __init__(self, r: SlappResponseObject, p: Player):
+        self.best_division: Division = r.get_best_division_for_player(p)
+        self.low_ink_placements: List[Tuple[int, str, str]] = r.get_low_ink_placements(p)
+        """Ranking (number), bracket name, tournament name"""
+        self.best_low_ink_placement: Optional[Tuple[int, str, str]] = r.best_low_ink_placement(p)
+        self.is_winning_low_ink: bool = bool(r.placement_is_winning_low_ink(self.best_low_ink_placement))
+        self.teams: List[Team] = r.get_teams_for_player(p)
+        self.first_placements: List[str] = get_first_placements_text(r, p)
+
+
+def _response_scope(r: SlappResponseObject) -> Hashable:
+    """
+    What the response was asked for and how much it returned.
+    A player's teams and placements come from the response, and a broad or limited query returns fewer of them than a
+    describe, so eligibility scanned from one response can't be used for another.
+    """
+    return r.query, r.matched_players_len, len(r.matched_teams)
+
+
+class PlayerEligibilityMemo:
+    """
+    PlayerEligibility keyed by the Slapp snapshot, the response's scope and the player GUID.
+    Only players that Slapp matched are memoised. Callers pass memoisable=False for placeholder and soft-merged
+    players, which are computed each time.
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None):
+        self.snapshot: int = 0
+        self.cache: LruTtlCache[Hashable, PlayerEligibility] = LruTtlCache(max_size=max_size, ttl=ttl)
+
+    def get(self, r: SlappResponseObject, p: Player, memoisable: bool = True) -> PlayerEligibility:
+        """The player's eligibility, memoised if memoisable, i.e. if p is one of the players Slapp matched."""
+        if not memoisable:
+            return PlayerEligibility(r, p)
+
+        key = (self.snapshot, _response_scope(r), p.guid.__str__())
+        eligibility = self.cache.get(key)
+        if eligibility is None:
+            eligibility = PlayerEligibility(r, p)
+            self.cache.put(key, eligibility)
+        return eligibility
+
+    def invalidate(self, snapshot: int):
+        """Move to the new Slapp snapshot, dropping every summary from the old one."""
+        self.snapshot = snapshot
+        self.cache.clear()
+
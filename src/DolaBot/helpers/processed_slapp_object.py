@@ -1,15 +1,31 @@
-from typing import Dict, Optional, Union
+from copy import deepcopy
+from typing import Dict, Optional
 
 from discord import Embed, Colour
 
-from slapp_py.core_classes.player import Player
-from slapp_py.core_classes.team import Team
-
 
 class ProcessedSlappObject:
 
     def __init__(self, embed: Optional[Embed], colour: Colour, reacts):
         self.embed: Optional[Embed] = embed
         self.colour: Colour = colour or Colour.dark_magenta()
-        self.reacts: Dict[str, Union[Player, Team]] = reacts or {}
-        """Keyed by the reaction emoji"""
+        self.reacts: Dict[str, str] = reacts or {}
+        """The GUID of the player or team that each reaction represents, keyed by the reaction emoji"""
+
+    def copy(self) -> 'ProcessedSlappObject':
+        """Copy this object so that sending the copy (which trims the embed's fields) leaves this one intact."""
+        embed = Embed.from_dict(deepcopy(self.embed.to_dict())) if self.embed else None
+        return ProcessedSlappObject(embed, self.colour, dict(self.reacts))
+
+    @staticmethod
+    def from_dict(obj: dict) -> 'ProcessedSlappObject':
+        embed = obj.get("Embed")
+        return ProcessedSlappObject(Embed.from_dict(embed) if embed else None, Colour(obj.get("Colour")),
+                                    obj.get("Reacts"))
+
+    def to_dict(self) -> dict:
+        return {
+            "Embed": self.embed.to_dict() if self.embed else None,
+            "Colour": self.colour.value,
+            "Reacts": self.reacts,
+        }
@@ -0,0 +1,211 @@
+"""
+An append-only log of the lookups people make, with their counts and latencies, for analytics and pre-warming.
+"""
+import asyncio
+import heapq
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from slapp_py.helpers.str_helper import truncate
+
+QUERY = "query"
+"""A search, keyed by its normalised query."""
+DESCRIBE = "describe"
+"""A describe, keyed by the lower-cased id."""
+
+_Key = Tuple[str, str]
+"""The kind of lookup and its key."""
+
+
+class QueryStats:
+    """How often a lookup was made and how long it took, with its latest form to replay it with."""
+    __slots__ = ('query', 'limit', 'count', 'total_seconds')
+
+    def __init__(self, query: str, limit: Optional[int]):
+        self.query: str = query
+        self.limit: Optional[int] = limit
+        self.count: int = 0
+        self.total_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+def _to_line(kind: str, key: str, query: str, limit: Optional[int], count: int, seconds: float) -> str:
+    return json.dumps({"kind": kind, "key": key, "query": query, "limit": limit,
+                       "count": count, "seconds": round(seconds, 4)}) + '\n'
+
+
+class QueryLog:
+    """
+    Lookups are counted in memory as they're made, and appended to a JSON lines file in the background every
+    flush_interval seconds, off the event loop. Each line holds a count and total seconds, so once the file has more
+    than compact_after lines it's rewritten as a line per lookup.
+    At most max_entries lookups are kept. Beyond that, the least recently made are dropped, apart from the most made
+    quarter. The file is read when the background flushing starts. Without a path, it's kept in memory only.
+    """
+
+    def __init__(self, path: Optional[str] = None, compact_after: int = 10000, max_entries: int = 10000,
+                 flush_interval: float = 30.0):
+        self.path: Optional[str] = path
+        self.compact_after: int = compact_after
+        self.max_entries: int = max(4, max_entries)
+        self.flush_interval: float = flush_interval
+        self.stats: OrderedDict[_Key, QueryStats] = OrderedDict()
+        """Keyed by the kind of lookup and its key, least recently made first."""
+        self._pending: List[str] = []
+        """Lines not yet written to the file."""
+        self._lines: int = 0
+        self._loaded: bool = False
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls) -> 'QueryLog':
+        """Kept in memory only unless SLAPP_QUERY_LOG names the file, as it holds what people searched for."""
+        return cls(path=os.getenv("SLAPP_QUERY_LOG") or None,
+                   max_entries=int(os.getenv("SLAPP_QUERY_LOG_SIZE", "10000")))
+
+    def __len__(self):
+        """The number of different lookups logged."""
+        return len(self.stats)
+
+    def record(self, kind: str, key: str, query: str, limit: Optional[int], seconds: float):
+        """Log a lookup of the kind and key, made as the query with the limit, that took the seconds to answer."""
+        self._add(kind, key, query, limit, 1, seconds)
+        self.stats.move_to_end((kind, key))
+        if self.path:
+            self._pending.append(_to_line(kind, key, query, limit, 1, seconds))
+        self._trim()
+
+    def top(self, n: int) -> List[Tuple[str, QueryStats]]:
+        """The kind and stats of the n most made lookups, most made first."""
+        ordered = heapq.nlargest(n, self.stats.items(), key=lambda item: item[1].count)
+        return [(kind, stats) for (kind, _), stats in ordered]
+
+    def summary_text(self, n: int = 5) -> str:
+        return ', '.join(f"{truncate(stats.query, 40)} ({stats.count}, {stats.mean_seconds:.1f}s)"
+                         for _, stats in self.top(n)) or "(none yet)"
+
+    def start(self):
+        """Read the file and start flushing to it in the background, if not already."""
+        if self.path and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._flush_loop())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def flush(self):
+        """Write the pending lookups, compacting the file if it's due, off the event loop."""
+        lines, compacted = self._take_pending()
+        if lines:
+            await asyncio.get_running_loop().run_in_executor(None, self._write, lines, compacted)
+
+    def close(self):
+        """Stop flushing in the background and write the pending lookups."""
+        self.stop()
+        lines, compacted = self._take_pending()
+        if lines:
+            self._write(lines, compacted)
+
+    def load(self):
+        """Read the file, adding its counts to those made since."""
+        self._merge(*self._read())
+
+    async def _flush_loop(self):
+        try:
+            self._merge(*await asyncio.get_running_loop().run_in_executor(None, self._read))
+        except OSError as ex:
+            logging.error(f"Failed to read the query log {self.path}: {ex=}")
+            self._loaded = True
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except OSError as ex:
+                logging.error(f"Failed to write the query log {self.path}: {ex=}")
+
+    def _take_pending(self) -> Tuple[List[str], bool]:
+        """The lines to write, and if they are the whole compacted log rather than lines to append."""
+        if not self.path or not self._pending:
+            return [], False
+        pending, self._pending = self._pending, []
+        if self._loaded and self._lines + len(pending) > self.compact_after:
+            self._lines = len(self.stats)
+            return [_to_line(kind, key, stats.query, stats.limit, stats.count, stats.total_seconds)
+                    for (kind, key), stats in self.stats.items()], True
+        self._lines += len(pending)
+        return pending, False
+
+    def _write(self, lines: List[str], compacted: bool):
+        if compacted:
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as outfile:
+                outfile.writelines(lines)
+            os.replace(temp_path, self.path)
+        else:
+            with open(self.path, 'a', encoding='utf-8') as outfile:
+                outfile.writelines(lines)
+
+    def _read(self) -> Tuple[Dict[_Key, Tuple[str, Optional[int], int, float]], int]:
+        """The file's totals by lookup, as (query, limit, count, seconds), and its number of lines."""
+        totals: Dict[_Key, Tuple[str, Optional[int], int, float]] = dict()
+        if not self.path or not os.path.isfile(self.path):
+            return totals, 0
+
+        lines = 0
+        with open(self.path, 'r', encoding='utf-8') as infile:
+            for line in infile:
+                try:
+                    entry = json.loads(line)
+                    key = (entry["kind"], entry["key"])
+                    _, _, count, seconds = totals.get(key, (None, None, 0, 0.0))
+                    totals[key] = (entry["query"], entry.get("limit"),
+                                   count + int(entry.get("count", 1)), seconds + float(entry.get("seconds", 0)))
+                    lines += 1
+                except (ValueError, KeyError, TypeError):
+                    logging.warning(f"Skipping a bad line in the query log {self.path}: {line!r}")
+        logging.info(f"Read the query log at {self.path} ({len(totals)} lookups over {lines} lines).")
+        return totals, lines
+
+    def _merge(self, totals: Dict[_Key, Tuple[str, Optional[int], int, float]], lines: int):
+        self._lines += lines
+        # Most recently written last, so each is moved to the front in reverse
+        for (kind, key), (query, limit, count, seconds) in reversed(list(totals.items())):
+            stats = self.stats.get((kind, key))
+            if stats is not None:
+                # Made since the file was written, so keep its latest form and recency
+                stats.count += count
+                stats.total_seconds += seconds
+            else:
+                self._add(kind, key, query, limit, count, seconds)
+                self.stats.move_to_end((kind, key), last=False)
+        self._loaded = True
+        self._trim()
+
+    def _add(self, kind: str, key: str, query: str, limit: Optional[int], count: int, seconds: float):
+        stats = self.stats.get((kind, key))
+        if stats is None:
+            stats = self.stats[(kind, key)] = QueryStats(query, limit)
+        stats.query = query
+        stats.limit = limit
+        stats.count += count
+        stats.total_seconds += seconds
+
+    def _trim(self):
+        """Once over max_entries, drop the least recently made lookups, apart from the most made, to 3/4 full."""
+        if len(self.stats) <= self.max_entries:
+            return
+        popular = {key for key, _ in heapq.nlargest(self.max_entries // 4, self.stats.items(),
+                                                    key=lambda item: item[1].count)}
+        target = self.max_entries * 3 // 4
+        for key in list(self.stats):
+            if len(self.stats) <= target:
+                break
+            if key not in popular:
+                del self.stats[key]
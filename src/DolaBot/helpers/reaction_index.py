@@ -0,0 +1,134 @@
+"""
+A persistent index of the reactions on sent Slapp results, mapping message id to emoji to the GUID to describe.
+"""
+import heapq
+import logging
+import os
+import sqlite3
+from typing import Optional, Dict, Union, Set
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    message_id INTEGER PRIMARY KEY,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_by_last_used ON messages (last_used);
+CREATE TABLE IF NOT EXISTS reactions (
+    message_id INTEGER NOT NULL,
+    emoji TEXT NOT NULL,
+    guid TEXT NOT NULL,
+    PRIMARY KEY (message_id, emoji)
+) WITHOUT ROWID;
+"""
+
+
+class ReactionIndex:
+    """
+    Stored in SQLite so that reactions keep working on old results and across restarts.
+    Only the GUIDs are kept. Once more than max_messages messages are indexed, the least recently used are evicted.
+    The database is opened on first use.
+    Reads don't write: when each message was last used is kept in memory, and is written along with the next add
+    or on close, as is removing a popped reaction.
+    """
+
+    def __init__(self, path: str = ':memory:', max_messages: int = 1000):
+        self.path: str = path
+        self.max_messages: int = max(1, max_messages)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._last_used: Dict[int, int] = dict()
+        """The indexed message ids and when each was last used, held in memory so that untracked messages are
+        rejected without a query."""
+        self._unsaved: Set[int] = set()
+        """The message ids whose last_used has changed since it was last written."""
+        self._clock: int = 0
+        """Orders messages by use. Persisted as last_used so that the order survives restarts."""
+
+    @classmethod
+    def from_env(cls) -> 'ReactionIndex':
+        return cls(path=os.getenv("SLAPP_REACTIONS_DB", "dola_reactions.sqlite3"),
+                   max_messages=int(os.getenv("SLAPP_REACTIONS_SIZE", "1000")))
+
+    def __len__(self):
+        """The number of messages indexed."""
+        self._open()
+        return len(self._last_used)
+
+    def __contains__(self, message_id: Union[int, str]) -> bool:
+        self._open()
+        return int(message_id) in self._last_used
+
+    def add(self, message_id: Union[int, str], reacts: Dict[str, str]):
+        """Index the message's reactions, given as emoji to GUID."""
+        message_id = int(message_id)
+        with self._db:
+            self._db.execute("DELETE FROM reactions WHERE message_id = ?", (message_id,))
+            self._db.executemany("INSERT INTO reactions (message_id, emoji, guid) VALUES (?, ?, ?)",
+                                 [(message_id, emoji, guid) for emoji, guid in reacts.items()])
+            self._touch(message_id)
+            self._evict()
+            self._save_last_used()
+
+    def get(self, message_id: Union[int, str], emoji: str) -> Optional[str]:
+        """The GUID that the emoji on the message represents, or None."""
+        message_id = int(message_id)
+        if message_id not in self:
+            return None
+        row = self._db.execute("SELECT guid FROM reactions WHERE message_id = ? AND emoji = ?",
+                               (message_id, emoji)).fetchone()
+        if row is None:
+            return None
+
+        self._touch(message_id)
+        return row[0]
+
+    def pop(self, message_id: Union[int, str], emoji: str) -> Optional[str]:
+        """Remove and return the GUID that the emoji on the message represents, or None."""
+        guid = self.get(message_id, emoji)
+        if guid is not None:
+            # Committed with the next add or on close
+            self._db.execute("DELETE FROM reactions WHERE message_id = ? AND emoji = ?", (int(message_id), emoji))
+        return guid
+
+    def close(self):
+        if self._connection:
+            with self._connection:
+                self._save_last_used()
+            self._connection.close()
+            self._connection = None
+            self._last_used.clear()
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        return self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            if self.path != ':memory:':
+                self._connection.execute("PRAGMA journal_mode=WAL")
+                # In WAL mode this only syncs at checkpoints, and can only lose the latest commits on power loss
+                self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+            self._last_used = dict(self._connection.execute("SELECT message_id, last_used FROM messages"))
+            self._clock = max(self._last_used.values(), default=0)
+            logging.info(f"Opened the reaction index at {self.path} ({self._clock=}).")
+        return self._connection
+
+    def _touch(self, message_id: int):
+        self._clock += 1
+        self._last_used[message_id] = self._clock
+        self._unsaved.add(message_id)
+
+    def _save_last_used(self):
+        self._db.executemany("INSERT OR REPLACE INTO messages (message_id, last_used) VALUES (?, ?)",
+                             [(m, self._last_used[m]) for m in self._unsaved if m in self._last_used])
+        self._unsaved.clear()
+
+    def _evict(self):
+        excess = len(self._last_used) - self.max_messages
+        if excess > 0:
+            evicted = heapq.nsmallest(excess, self._last_used, key=self._last_used.__getitem__)
+            self._db.executemany("DELETE FROM reactions WHERE message_id = ?", [(m,) for m in evicted])
+            self._db.executemany("DELETE FROM messages WHERE message_id = ?", [(m,) for m in evicted])
+            for message_id in evicted:
+                del self._last_used[message_id]
@@ -0,0 +1,63 @@
+"""
+Applies reactions to sent messages in the background with bounded concurrency.
+"""
+import asyncio
+import logging
+import os
+from typing import Iterable, List, Optional, Set
+
+from discord import Message, NotFound, Forbidden, HTTPException
+
+
+class ReactionScheduler:
+    """
+    Reacts to messages without holding up the command that sent them.
+    Discord rate limits reactions per channel, which discord.py queues on, so the reactions for one message are added
+    in order one after another and only separate messages are reacted to concurrently, up to max_concurrency at once.
+    A message that is deleted (or that the bot can no longer react to) is given up on.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self.max_concurrency: int = max(1, max_concurrency if max_concurrency is not None
+                                        else int(os.getenv("SLAPP_REACTION_CONCURRENCY", "4")))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        """Created on first use so that it belongs to the running loop."""
+        self._tasks: Set[asyncio.Task] = set()
+
+    def __len__(self):
+        """The number of messages still being reacted to."""
+        return len(self._tasks)
+
+    def schedule(self, message: Message, reactions: Iterable[str]) -> asyncio.Task:
+        """Start reacting to the message with the reactions, in order."""
+        task = asyncio.create_task(self._react(message, list(reactions)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def drain(self):
+        """Wait for every scheduled reaction to be applied or given up on."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _react(self, message: Message, reactions: List[str]) -> int:
+        """Returns the number of reactions added."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        added = 0
+        async with self._semaphore:
+            for reaction in reactions:
+                try:
+                    await message.add_reaction(reaction)
+                    added += 1
+                except NotFound:
+                    logging.debug(f"Message {message.id} was deleted before it could be reacted to, giving up.")
+                    break
+                except Forbidden:
+                    logging.warning(f"Not allowed to react to message {message.id}, giving up.")
+                    break
+                except HTTPException as ex:
+                    logging.warning(f"Failed to react to message {message.id} with {reaction}, giving up. {ex=}")
+                    break
+        return added
@@ -0,0 +1,97 @@
+"""
+Runs CPU-heavy rendering in a pool of processes so that it doesn't stall the event loop.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Optional, TypeVar, Tuple, List
+
+from DolaBot.helpers.timer_decorator import take_counts, add_counts
+
+T = TypeVar('T')
+
+
+def get_render_process_count() -> int:
+    """
+    The number of rendering processes, from the SLAPP_RENDER_PROCESSES env value.
+    'auto' uses one per core, and 0 renders on the event loop.
+    Each render pickles the whole response to the process, which decodes it again, so this defaults to 0 until
+    that beats rendering on the event loop in slapp_benchmark_tests.
+    """
+    value = os.getenv("SLAPP_RENDER_PROCESSES", "0").strip().lower()
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(0, int(value))
+    except ValueError:
+        logging.error(f"SLAPP_RENDER_PROCESSES is not a number or 'auto', defaulting to 0. {value=}")
+        return 0
+
+
+def _init_process(log_queue: multiprocessing.Queue, level: int):
+    """Run as each render process starts, sending its log records to the bot's process."""
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(level)
+
+
+def _run_and_take_counts(fn: Callable[..., T], *args) -> Tuple[T, List[tuple]]:
+    """Run fn(*args) in a render process, returning its result with the profile counts it recorded."""
+    return fn(*args), take_counts()
+
+
+class _LogForwarder(QueueListener):
+    """Hands the log records from the render processes to the bot's loggers, so errors still reach the log channel."""
+
+    def handle(self, record: logging.LogRecord):
+        logging.getLogger(record.name).handle(record)
+
+
+class RenderPool:
+    """
+    A process pool that's started on first use.
+    The processes are spawned rather than forked, so they don't inherit the bot's connections, threads or databases.
+    The functions run must be importable, and their arguments and results picklable.
+    Their log records are forwarded to the bot's loggers, and their debug_time profiles are added to the bot's.
+    If the pool breaks (e.g. a process was killed), the call is rendered on the event loop and the pool is restarted.
+    """
+
+    def __init__(self, processes: Optional[int] = None):
+        self.processes: int = processes if processes is not None else get_render_process_count()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._log_forwarder: Optional[_LogForwarder] = None
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Run fn(*args) in the pool, or directly if the pool has no processes."""
+        if not self.processes:
+            return fn(*args)
+
+        if self._executor is None:
+            mp_context = multiprocessing.get_context("spawn")
+            log_queue = mp_context.Queue()
+            self._log_forwarder = _LogForwarder(log_queue)
+            self._log_forwarder.start()
+            self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=mp_context,
+                                                 initializer=_init_process,
+                                                 initargs=(log_queue, logging.getLogger().getEffectiveLevel()))
+        try:
+            result, counts = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _run_and_take_counts, fn, *args)
+            add_counts(counts)
+            return result
+        except BrokenProcessPool as ex:
+            logging.error(f"The render pool broke, rendering {fn.__name__} on the event loop instead. {ex=}")
+            self.shutdown()
+            return fn(*args)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._log_forwarder is not None:
+            self._log_forwarder.stop()
+            self._log_forwarder = None
@@ -0,0 +1,240 @@
+"""
+A pool of Slapp processes that queries are load-balanced across.
+"""
+import asyncio
+import inspect
+import logging
+import os
+import traceback
+from functools import partial
+from typing import List, Optional, Union, Callable, Awaitable, Tuple
+
+from discord.ext.commands import Context
+
+from DolaBot.helpers.lane_scheduler import LaneScheduler, INTERACTIVE
+from DolaBot.helpers.latency import latency, IPC
+from DolaBot.helpers.lazy_slapp_response import decode_slapp_payload
+from DolaBot.helpers.slapp_readiness import SlappReadiness, PHASES, SPAWNED, CONNECTED, CACHED
+from DolaBot.helpers.slapp_request import SlappRequestTracker, SlappRequest
+from DolaBot.helpers.supports_send import SupportsSend
+from slapp_py.slapp_runner.slapipes import SlapPipe
+
+
+def get_slapp_worker_count() -> int:
+    """
+    The number of Slapp processes to run, from the SLAPP_WORKERS env value.
+    'auto' uses one per core. Each worker loads its own copy of the database, so this defaults to 1.
+    """
+    value = os.getenv("SLAPP_WORKERS", "1").strip().lower()
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logging.error(f"SLAPP_WORKERS is not a number or 'auto', defaulting to 1. {value=}")
+        return 1
+
+
+class DolaSlapPipe(SlapPipe):
+    """
+    A SlapPipe that decodes Slapp's responses with decode_slapp_payload, moves its readiness to SPAWNED when
+    the process starts, and writes each query as soon as it's queued.
+    """
+
+    def __init__(self, readiness: Optional[SlappReadiness] = None):
+        super().__init__()
+        self.readiness: SlappReadiness = readiness or SlappReadiness()
+
+    async def _read_stdout(self, stdout):
+        logging.debug('_read_stdout')
+        # Reading starts as soon as the process has been created, including each time it's restarted
+        self.readiness.set_phase(SPAWNED)
+        while self.slapp_loop:
+            try:
+                response = (await stdout.readline())
+                if not response:
+                    logging.info('stdout: (none response)')
+                    await asyncio.sleep(1)
+                elif response.startswith(b"eyJNZXNzYWdlIjo"):  # This is the b64 start of a Slapp message.
+                    response = decode_slapp_payload(response)
+                    await self.response_function(response.get("Message", "Response does not contain Message."), response)
+                elif b"Caching task done." in response:
+                    logging.debug('stdout: ' + response.decode('utf-8'))
+                    await self.response_function("Caching task done.", {})
+                else:
+                    logging.info('stdout: ' + response.decode('utf-8'))
+            except Exception as e:
+                logging.error(msg=f'_read_stdout EXCEPTION {traceback.format_exc()}', exc_info=e)
+
+    async def _write_stdin(self, stdin):
+        logging.debug('_write_stdin')
+        # The pool only queues a query once the worker has room for it, so it's written straight away instead of on
+        # SlapPipe's poll. The timeout is only there to notice the process exiting on its own.
+        while self.slapp_loop:
+            try:
+                query = await asyncio.wait_for(self.slapp_write_queue.get(), timeout=1)
+            except asyncio.TimeoutError:
+                continue
+            if not self.slapp_loop:
+                logging.info(f'_write_stdin: exiting')
+                return
+            if not query:
+                continue
+            try:
+                logging.debug(f'_write_stdin: writing {query}')
+                stdin.write(f'{query}\n'.encode('utf-8'))
+                await stdin.drain()
+            except Exception as e:
+                logging.error(f'_write_stdin EXCEPTION: {traceback.format_exc()}', exc_info=e)
+
+
+class SlappWorker:
+    """One Slapp process and the requests in flight to it."""
+
+    def __init__(self, worker_id: int, on_readiness_change: Optional[Callable[[], None]] = None):
+        self.worker_id: int = worker_id
+        self.readiness: SlappReadiness = SlappReadiness(on_readiness_change)
+        self.slappipe: SlapPipe = DolaSlapPipe(self.readiness)
+        self.requests: SlappRequestTracker = SlappRequestTracker()
+        self.restart_context: Optional[Context] = None
+
+    @property
+    def started(self) -> bool:
+        """If Slapp has established its connection."""
+        return self.readiness.reached(CONNECTED)
+
+    @started.setter
+    def started(self, value: bool):
+        if value:
+            self.readiness.advance(CONNECTED)
+        else:
+            self.readiness.fall_back(SPAWNED)
+
+    @property
+    def caching_finished(self) -> bool:
+        return self.readiness.reached(CACHED)
+
+    @caching_finished.setter
+    def caching_finished(self, value: bool):
+        if value:
+            self.readiness.advance(CACHED)
+        else:
+            self.readiness.fall_back(CONNECTED)
+
+    @property
+    def load(self) -> int:
+        return len(self.requests)
+
+    @property
+    def healthy(self) -> bool:
+        return self.started and self.slappipe.slapp_process is not None and self.slappipe.slapp_loop
+
+    def restart(self, ctx: Optional[Context] = None):
+        """Kill this worker's Slapp process. It was started with keepOpen so it will start again."""
+        logging.warning(f"Restarting Slapp worker {self.worker_id}...")
+        self.readiness.set_phase(None)
+        self.restart_context = ctx
+        self.slappipe.kill_slapp()
+
+    def __repr__(self):
+        return f"SlappWorker({self.worker_id=}, {self.readiness.phase=}, {self.load=})"
+
+
+_Send = Callable[[SlapPipe], Awaitable[str]]
+"""Writes a queued request to a Slapp process, returning the query as sent."""
+
+
+class SlappWorkerPool:
+    """
+    A fixed number of Slapp workers.
+    Requests wait in their lane of the LaneScheduler and are only written to a worker once it has fewer than
+    max_in_flight requests, so that Slapp's own first in first out queue can't hold an interactive query behind a bulk
+    job. Each request goes to the least-loaded healthy worker. Requests queued before any worker is ready wait in
+    their lanes and are dispatched as soon as one is.
+    """
+
+    def __init__(self, size: int, max_in_flight: Optional[int] = None, readiness: Optional[SlappReadiness] = None):
+        self.readiness: SlappReadiness = readiness or SlappReadiness()
+        """The latest phase reached by any worker."""
+        self.workers: List[SlappWorker] = [SlappWorker(i, self._update_readiness) for i in range(max(1, size))]
+        self.snapshot: int = 0
+        """Incremented whenever the data loaded into Slapp may have changed."""
+        self.max_in_flight: int = max(1, max_in_flight if max_in_flight is not None
+                                      else int(os.getenv("SLAPP_MAX_IN_FLIGHT", "2")))
+        self.lanes: LaneScheduler[Tuple[SlappRequest, _Send]] = LaneScheduler()
+
+    def __len__(self):
+        """The number of requests waiting in the lanes or in flight across all workers."""
+        return len(self.lanes) + sum(worker.load for worker in self.workers)
+
+    @property
+    def started(self) -> bool:
+        return self.readiness.reached(CONNECTED)
+
+    @property
+    def caching_finished(self) -> bool:
+        return self.readiness.reached(CACHED)
+
+    def _update_readiness(self):
+        """Move the pool to the latest phase reached by any worker."""
+        phases = [worker.readiness.phase for worker in self.workers if worker.readiness.phase]
+        self.readiness.set_phase(max(phases, key=PHASES.index, default=None))
+
+    async def initialise_slapp(self, response_function: Callable[..., Awaitable[None]]):
+        """
+        Start every worker. The response function is called with the worker that answered as the `worker` keyword.
+        """
+        await asyncio.gather(*(
+            worker.slappipe.initialise_slapp(partial(response_function, worker=worker))
+            for worker in self.workers
+        ))
+
+    def expected_wait(self, lane: str) -> float:
+        """Seconds that a request queued in the lane now is expected to wait for its answer."""
+        ahead = self.lanes.ahead_of(lane) + sum(worker.load for worker in self.workers)
+        healthy = sum(1 for worker in self.workers if worker.healthy) or 1
+        return (ahead + 1) * latency.median(IPC, default=1.0) / healthy
+
+    async def query_slapp(self, ctx: Union[None, SupportsSend, Context], description: str, query: str,
+                          limit: Optional[int] = 20, lane: str = INTERACTIVE) -> SlappRequest:
+        async def send(slappipe: SlapPipe) -> str:
+            return await slappipe.query_slapp(query, limit=limit)
+        return await self._enqueue(SlappRequest(0, ctx, description, query, lane), send)
+
+    async def slapp_describe(self, ctx: Union[None, SupportsSend, Context], description: str,
+                             slapp_id: str, lane: str = INTERACTIVE) -> SlappRequest:
+        async def send(slappipe: SlapPipe) -> str:
+            await slappipe.slapp_describe(slapp_id)
+            return slapp_id
+        return await self._enqueue(SlappRequest(0, ctx, description, slapp_id, lane), send)
+
+    async def dispatch(self):
+        """
+        Write waiting requests to the workers with room, in lane order.
+        Called whenever a request is queued, and whenever a worker answers or (re)starts.
+        """
+        while self.lanes:
+            worker = self._worker_with_room()
+            if worker is None:
+                return
+            _, (request, send) = self.lanes.pop()
+            request.query = await send(worker.slappipe)
+            worker.requests.add(request)
+
+    async def _enqueue(self, request: SlappRequest, send: _Send) -> SlappRequest:
+        request.expected_wait = self.expected_wait(request.lane)
+        self.lanes.push(request.lane, (request, send))
+        await self.dispatch()
+        return request
+
+    def _worker_with_room(self) -> Optional[SlappWorker]:
+        """The least-loaded healthy worker with fewer than max_in_flight requests, or None."""
+        candidates = [worker for worker in self.workers if worker.healthy and worker.load < self.max_in_flight]
+        return min(candidates, key=lambda worker: (not worker.caching_finished, worker.load), default=None)
+
+    async def patch_slapp(self, urls: Optional[List[str]]):
+        for worker in self.workers:
+            # SlapPipe.patch_slapp is synchronous, but await it in case the installed slapp_py's isn't
+            result = worker.slappipe.patch_slapp(urls)
+            if inspect.isawaitable(result):
+                await result
@@ -0,0 +1,43 @@
+"""
+Normalises Slapp queries so that queries Slapp would answer identically share a key.
+"""
+from typing import Optional, Set, Tuple
+
+from slapp_py.slapp_runner.slapipes import SlapPipe
+
+QUERY_OPTIONS = (
+    ('exactcase', 'exactCase'),
+    ('matchcase', 'exactCase'),
+    ('queryisregex', 'queryIsRegex'),
+    ('regex', 'queryIsRegex'),
+    ('queryisclantag', 'queryIsClanTag'),
+    ('clantag', 'queryIsClanTag'),
+    ('queryisteamtag', 'queryIsClanTag'),
+    ('teamtag', 'queryIsClanTag'),
+    ('team', 'queryIsTeam'),
+    ('player', 'queryIsPlayer'),
+)
+"""The typed options that SlapPipe.query_slapp recognises, and the Slapp option each one becomes."""
+
+
+def parse_query(query: str, limit: Optional[int] = 20) -> Tuple[str, Set[str]]:
+    """Separate the query into the text Slapp searches for and the options it is sent with, as SlapPipe does."""
+    options: Set[str] = set()
+    for typed_option, query_option in QUERY_OPTIONS:
+        query = SlapPipe.conditionally_add_option(options, query, typed_option, query_option)
+    query, has_limit_option = SlapPipe.conditionally_add_limit(options, query)
+    if not has_limit_option and limit is not None:
+        options.add(f"--limit {limit}")
+    return query, options
+
+
+def normalise_query(query: str, limit: Optional[int] = 20) -> str:
+    """
+    Normalise the query to the text and sorted options that Slapp would be sent.
+    Whitespace is collapsed, and the text is case-folded unless the query is case-sensitive or a regex.
+    """
+    query, options = parse_query(query, limit)
+    query = ' '.join(query.split())
+    if '--exactCase' not in options and '--queryIsRegex' not in options:
+        query = query.casefold()
+    return ' '.join([query] + sorted(options))
@@ -0,0 +1,74 @@
+"""
+The phases of a Slapp process starting up, as events that can be awaited instead of polled.
+"""
+import asyncio
+from typing import Callable, Dict, Optional
+
+SPAWNED = "spawned"
+"""The Slapp process has been started and its output is being read."""
+CONNECTED = "connected"
+"""Slapp has loaded its database and established its connection, so it can answer queries."""
+CACHED = "cached"
+"""Slapp has finished its caching task, so it answers at full speed."""
+PHASES = (SPAWNED, CONNECTED, CACHED)
+
+
+class SlappReadiness:
+    """
+    The phase that Slapp has reached, with an asyncio.Event for each phase that is set while the phase is reached.
+    Reaching a phase also reaches the phases before it, and falling back to a phase clears the phases after it.
+    The events are created on first use so that they belong to the running event loop.
+    """
+
+    def __init__(self, on_change: Optional[Callable[[], None]] = None):
+        self._index: int = -1
+        """The index of the phase reached in PHASES, or -1 if the process isn't running."""
+        self._events: Dict[str, asyncio.Event] = dict()
+        self.on_change: Optional[Callable[[], None]] = on_change
+        """Called whenever the phase changes."""
+
+    def __str__(self):
+        return self.phase or "not running"
+
+    @property
+    def phase(self) -> Optional[str]:
+        """The latest phase reached, or None if the process isn't running."""
+        return PHASES[self._index] if self._index >= 0 else None
+
+    def reached(self, phase: str) -> bool:
+        return self._index >= PHASES.index(phase)
+
+    def set_phase(self, phase: Optional[str]):
+        """Move to the phase, or to not running if None."""
+        index = PHASES.index(phase) if phase else -1
+        if index == self._index:
+            return
+        self._index = index
+        for i, each in enumerate(PHASES):
+            event = self._events.get(each)
+            if event is not None:
+                if i <= index:
+                    event.set()
+                else:
+                    event.clear()
+        if self.on_change:
+            self.on_change()
+
+    def advance(self, phase: str):
+        """Move to the phase if it's later than the current one."""
+        if not self.reached(phase):
+            self.set_phase(phase)
+
+    def fall_back(self, phase: Optional[str]):
+        """Move to the phase, or to not running if None, if it's earlier than the current one."""
+        if phase is None or self._index > PHASES.index(phase):
+            self.set_phase(phase)
+
+    async def wait(self, phase: str):
+        """Wait until the phase is reached."""
+        if self.reached(phase):
+            return
+        event = self._events.get(phase)
+        if event is None:
+            event = self._events[phase] = asyncio.Event()
+        await event.wait()
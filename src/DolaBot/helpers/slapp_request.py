@@ -0,0 +1,143 @@
+"""
+Tracks the commands sent to Slapp so that each response is routed back to the caller that asked for it.
+"""
+import asyncio
+import itertools
+import logging
+from collections import OrderedDict
+from time import perf_counter
+from typing import Optional, Union, Tuple, List, Hashable
+
+from discord.ext.commands import Context
+
+from DolaBot.helpers.lane_scheduler import INTERACTIVE
+from DolaBot.helpers.supports_send import SupportsSend
+from slapp_py.slapp_runner.slapp_response_object import SlappResponseObject
+
+SlappResult = Tuple[str, dict]
+"""The (success_message, response) pair that Slapp answers with."""
+
+
+class SlappRestartedError(Exception):
+    """Raised into a pending request when Slapp restarts before it answered."""
+    pass
+
+
+class SlappRequest:
+    """A single command sent to Slapp that is awaiting its response."""
+
+    def __init__(self, request_id: int, ctx: Union[None, SupportsSend, Context], description: str, query: str,
+                 lane: str = INTERACTIVE):
+        self.request_id: int = request_id
+        self.ctx: Union[None, SupportsSend, Context] = ctx
+        self.description: str = description
+        self.query: str = query
+        """The query as sent to Slapp, matched against the Query that Slapp echoes back."""
+        self.lane: str = lane
+        """The dispatch lane the request waits in before it's sent to Slapp."""
+        self.expected_wait: float = 0.0
+        """Seconds the request was expected to wait for its answer when it was queued."""
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.cache_key: Optional[Hashable] = None
+        """The key to store the decoded response under in the result cache, if it should be cached."""
+        self.response_object: Optional[SlappResponseObject] = None
+        """The decoded response, once built or if the request was answered from the result cache."""
+        self.sent_at: float = perf_counter()
+        """When the request was queued."""
+        self.queue_wait: Optional[float] = None
+        """Seconds spent waiting in its lane and for Slapp to answer the earlier requests, once answered."""
+        self.ipc: Optional[float] = None
+        """Seconds from when Slapp could work on the request until it answered, once answered."""
+        self.leader: Optional['SlappRequest'] = None
+        """The identical request already in flight that this one shares the answer of, if any."""
+        self.followers: List['SlappRequest'] = []
+        """The identical requests that share this one's answer, to also be told if it fails."""
+
+    @classmethod
+    def from_cache(cls, ctx: Union[None, SupportsSend, Context], description: str, query: str,
+                   response_object: SlappResponseObject) -> 'SlappRequest':
+        """A request answered from the result cache without going to Slapp."""
+        request = cls(0, ctx, description, query)
+        request.response_object = response_object
+        request.future.set_result(("OK", {}))
+        return request
+
+    @classmethod
+    def follow(cls, leader: 'SlappRequest', ctx: Union[None, SupportsSend, Context],
+               description: str) -> 'SlappRequest':
+        """A request that isn't sent to Slapp, and is answered with the answer to the identical leader request."""
+        request = cls(0, ctx, description, leader.query, leader.lane)
+        request.future = leader.future
+        request.leader = leader
+        request.expected_wait = leader.expected_wait
+        leader.followers.append(request)
+        return request
+
+    def __repr__(self):
+        return f"SlappRequest({self.request_id=}, {self.description=}, {self.query=})"
+
+
+class SlappRequestTracker:
+    """
+    The requests in flight to a Slapp process, keyed by request id.
+    The Slapp console protocol has no field for a request id, so the response is matched on the Query it echoes
+    back. Only a response without a Query falls back to the oldest request that was sent. One that echoes a Query
+    that no request is waiting for, e.g. a late answer from before a restart, is dropped.
+    """
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.pending: OrderedDict[int, SlappRequest] = OrderedDict()
+        self.last_answered_at: float = 0.0
+
+    def __len__(self):
+        return len(self.pending)
+
+    def begin(self, ctx: Union[None, SupportsSend, Context], description: str, query: str) -> SlappRequest:
+        """Record a request that has just been written to Slapp."""
+        return self.add(SlappRequest(0, ctx, description, query))
+
+    def add(self, request: SlappRequest) -> SlappRequest:
+        """Record a request that was queued earlier and has just been written to Slapp, giving it its id."""
+        request.request_id = next(self._ids)
+        self.pending[request.request_id] = request
+        logging.debug(f"Slapp request begun: {request!r}")
+        return request
+
+    def resolve(self, success_message: str, response: dict) -> Optional[SlappRequest]:
+        """Complete the request that this response answers. Returns None if there is no request waiting."""
+        request = self._match(response)
+        if request is None:
+            return None
+
+        del self.pending[request.request_id]
+
+        # Slapp answers one request at a time, so until it answered the previous request this one was waiting
+        answered_at = perf_counter()
+        started_at = max(request.sent_at, self.last_answered_at)
+        request.queue_wait = started_at - request.sent_at
+        request.ipc = answered_at - started_at
+        self.last_answered_at = answered_at
+
+        if not request.future.done():
+            request.future.set_result((success_message, response))
+        return request
+
+    def fail_all(self, exception: Exception) -> List[SlappRequest]:
+        """Fail every pending request with the exception, e.g. when Slapp restarts. Returns the failed requests."""
+        failed = list(self.pending.values())
+        self.pending.clear()
+        for request in failed:
+            if not request.future.done():
+                request.future.set_exception(exception)
+        return failed
+
+    def _match(self, response: dict) -> Optional[SlappRequest]:
+        echoed = response.get("Query") if response else None
+        if echoed is None:
+            return next(iter(self.pending.values()), None)
+
+        match = next((request for request in self.pending.values() if request.query == echoed), None)
+        if match is None:
+            logging.warning(f"Slapp answered a Query that no request is waiting for, dropping it. {echoed=}")
+        return match
@@ -1,26 +1,149 @@
+"""
+Profiling of decorated functions, switched on and off at runtime by name.
+Cheap enough to leave on: a call costs two perf_counter_ns reads and a few additions, and the arguments are only
+repr'd for slow calls. A disabled function costs one attribute check.
+"""
+import os
+import reprlib
+from collections import deque
+from fnmatch import fnmatchcase
 from functools import wraps
-from time import time
+from time import perf_counter_ns
+from typing import Dict, Deque, List, Tuple
 
 from slapp_py.helpers.str_helper import truncate
 
+slow_call_ns: int = int(float(os.getenv("DOLA_PROFILE_SLOW_MS", "250")) * 1_000_000)
+"""Calls taking at least this long have their arguments sampled."""
+
+_args_repr: reprlib.Repr = reprlib.Repr()
+"""Samples the arguments of slow calls. Only the first few items of containers, to a shallow depth, are repr'd."""
+_args_repr.maxlevel = 3
+_args_repr.maxdict = _args_repr.maxlist = _args_repr.maxtuple = _args_repr.maxset = 4
+_args_repr.maxstring = _args_repr.maxother = 40
+
+_enabled_patterns: List[str] = [p.strip() for p in os.getenv("DOLA_PROFILE", "*").split(",") if p.strip()]
+"""Name patterns that newly decorated functions are enabled by."""
+
+
+class FunctionProfile:
+    """
+    The call count, total and max time of a function, plus the arguments of its most recent slow calls.
+    The counters are updated without a lock. The GIL keeps each update intact and the profiled functions are
+    called from the event loop, so at worst a concurrent call from another thread goes uncounted.
+    """
+    __slots__ = ('name', 'enabled', 'count', 'total_ns', 'max_ns', 'slow_calls')
+
+    def __init__(self, name: str, enabled: bool):
+        self.name: str = name
+        self.enabled: bool = enabled
+        self.count: int = 0
+        self.total_ns: int = 0
+        self.max_ns: int = 0
+        self.slow_calls: Deque[Tuple[int, str]] = deque(maxlen=5)
+        """The time taken and arguments of the most recent slow calls."""
+
+    def add(self, elapsed_ns: int, args: tuple, kw: dict):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        if elapsed_ns >= slow_call_ns:
+            self.slow_calls.append(
+                (elapsed_ns, f"[{truncate(_args_repr.repr(args), 100)}, {truncate(_args_repr.repr(kw), 100)}]"))
+
+    def reset(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.slow_calls.clear()
+
+    def __str__(self):
+        mean_ms = (self.total_ns / self.count / 1_000_000) if self.count else 0
+        return (f"{self.name}: {'on' if self.enabled else 'off'}, {self.count} calls, "
+                f"mean {mean_ms:.2f}ms, max {self.max_ns / 1_000_000:.2f}ms, total {self.total_ns / 1_000_000:.0f}ms")
+
+
+profiles: Dict[str, FunctionProfile] = dict()
+"""Every decorated function's profile, by qualified name."""
+
+
+def _register(f) -> FunctionProfile:
+    name = f.__qualname__
+    profile = profiles.get(name)
+    if profile is None:
+        profile = profiles[name] = FunctionProfile(
+            name, enabled=any(fnmatchcase(name, pattern) for pattern in _enabled_patterns))
+    return profile
+
+
+def set_enabled(pattern: str, enabled: bool) -> List[str]:
+    """Switch profiling on or off for the functions whose names match the pattern. Returns the names switched."""
+    switched = [name for name in profiles if fnmatchcase(name, pattern)]
+    for name in switched:
+        profiles[name].enabled = enabled
+    return switched
+
+
+def get_profile_text(pattern: str = "*") -> str:
+    """A line per profile matching the pattern, slowest total first, followed by its sampled slow calls."""
+    lines = []
+    for profile in sorted(profiles.values(), key=lambda p: p.total_ns, reverse=True):
+        if fnmatchcase(profile.name, pattern):
+            lines.append(str(profile))
+            lines.extend(f"  {elapsed_ns / 1_000_000:.0f}ms {args}" for elapsed_ns, args in profile.slow_calls)
+    return '\n'.join(lines) or "(nothing profiled)"
+
+
+def take_counts() -> List[Tuple[str, int, int, int, List[Tuple[int, str]]]]:
+    """
+    The name, count, total and max time, and slow calls of each profile called since the last take, resetting them.
+    Used to send the profiles of a render process back to the bot's process.
+    """
+    counts = [(p.name, p.count, p.total_ns, p.max_ns, list(p.slow_calls)) for p in profiles.values() if p.count]
+    for profile in profiles.values():
+        profile.reset()
+    return counts
+
+
+def add_counts(counts: List[Tuple[str, int, int, int, List[Tuple[int, str]]]]):
+    """Add counts taken from another process to the profiles of the same name."""
+    for name, count, total_ns, max_ns, slow_calls in counts:
+        profile = profiles.get(name)
+        if profile is not None:
+            profile.count += count
+            profile.total_ns += total_ns
+            profile.max_ns = max(profile.max_ns, max_ns)
+            profile.slow_calls.extend(slow_calls)
+
 
 def debug_time(f):
+    profile = _register(f)
+
     @wraps(f)
     def wrap(*args, **kw):
-        ts = time()
-        result = f(*args, **kw)
-        te = time()
-        print('func:%r args:[%s, %s] took: %2.4f sec' % (f.__name__, truncate(str(repr(args)), 100), truncate(str(repr(kw)), 100), te-ts))
-        return result
+        if not profile.enabled:
+            return f(*args, **kw)
+        ts = perf_counter_ns()
+        try:
+            return f(*args, **kw)
+        finally:
+            profile.add(perf_counter_ns() - ts, args, kw)
+    wrap.profile = profile
     return wrap
 
 
 def debug_time_async(f):
+    profile = _register(f)
+
+    @wraps(f)
     async def wrapper(*args, **kw):
-        ts = time()
-        result = await f(*args, **kw)
-        te = time()
-        print('func:%r args:[%s, %s] took: %2.4f sec' %
-              (f.__name__, truncate(str(repr(args)), 100), truncate(str(repr(kw)), 100), te - ts))
-        return result
+        if not profile.enabled:
+            return await f(*args, **kw)
+        ts = perf_counter_ns()
+        try:
+            return await f(*args, **kw)
+        finally:
+            profile.add(perf_counter_ns() - ts, args, kw)
+    wrapper.profile = profile
     return wrapper
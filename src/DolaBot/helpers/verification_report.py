@@ -0,0 +1,134 @@
+"""
+Builds the Verifications.html report that colours each signed-up player by their eligibility.
+"""
+import codecs
+import gzip
+import io
+from tempfile import SpooledTemporaryFile, NamedTemporaryFile
+from typing import List, Tuple, Dict, TextIO, IO
+
+from discord import File
+
+from DolaBot.helpers.player_eligibility import PlayerEligibility
+from DolaBot.helpers.timer_decorator import debug_time
+from slapp_py.core_classes.player import Player
+from slapp_py.helpers.str_helper import join, truncate
+
+TeamRow = Tuple[str, Dict[Player, PlayerEligibility], int, int, str]
+"""Team name, the team's players and their eligibility, clout, confidence, emoji str."""
+
+STYLE_GOOD = "s2"
+STYLE_BANNED = "s9"
+STYLE_NEEDS_CHECKING = "s12"
+STYLE_EXCEPTION = "s14"
+
+MAX_IN_MEMORY_REPORT_SIZE = 1024 * 1024
+"""Reports larger than this many bytes are spooled to a temporary file rather than held in memory."""
+
+# Free free to ignore this LOL
+_HTML_BEGIN = """<html><head><meta http-equiv="Content-Type" content="text/html; charset=utf-8"><link type="text/css" rel="stylesheet" href="resources/sheet.css"><style type="text/css">.ritz .waffle a { color: inherit; }.ritz .waffle .s8{background-color:#9900ff;text-align:right;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}.ritz .waffle .s0{background-color:#fce5cd;text-align:center;font-weight:bold;color:#000000;font-family:'Arial';font-size:14pt;vertical-align:middle;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}.ritz .waffle .s7{background-color:#25c274;text-align:right;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}.ritz .waffle .s12{background-color:#fbbc04;text-align:left;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}.ritz .waffle .s1{background-color:#4a86e8;text-align:right;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}.ritz .waffle .s6{background-color:#34a853;text-align:left;text-decoration:underline;-webkit-text-decoration-skip:none;text-decoration-skip-ink:none;color:#1155cc;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}.ritz .waffle .s2{background-color:#34a853;text-align:left;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}.ritz .waffle .s3{background-color:#ffffff;text-align:left;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}.ritz .waffle .s10{background-color:#9900ff;text-align:right;color:#000000;font-family:'docs-Roboto',Arial;font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}.ritz .waffle .s4{background-color:#ffffff;text-align:center;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}.ritz .waffle .s5{background-color:#00ff00;text-align:right;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}.ritz .waffle .s14{background-color:#4285f4;text-align:left;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}.ritz .waffle .s13{background-color:#ff6d01;text-align:left;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}.ritz .waffle .s9{background-color:#ea4335;text-align:left;color:#000000;font-family:'Arial';font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}.ritz .waffle .s11{background-color:#4a86e8;text-align:right;color:#000000;font-family:'docs-Roboto',Arial;font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;} .tooltip { position: relative;  display: inline-block;  border-bottom: 1px dotted black;} .tooltip .tooltiptext {visibility: hidden; background-color: black;  color: #fff;  text-align: center;  padding: 5px 0;  border-radius: 6px;  position: absolute;  z-index: 1;} .tooltip:hover .tooltiptext {visibility: visible;}</style></head>\n<body><div class="ritz grid-container" dir="ltr"><table class="waffle" cellspacing="0" cellpadding="0"><thead><tr><th class="row-header freezebar-origin-ltr"></th><th id="810171351C0" style="width:30px;" class="column-headers-background">A</th><th id="810171351C1" style="width:170px;" class="column-headers-background">B</th><th id="810171351C2" style="width:150px;" class="column-headers-background">C</th><th id="810171351C3" style="width:150px;" class="column-headers-background">D</th><th id="810171351C4" style="width:150px;" class="column-headers-background">E</th><th id="810171351C5" style="width:150px;" class="column-headers-background">F</th><th id="810171351C6" style="width:150px;" class="column-headers-background">G</th><th id="810171351C7" style="width:150px;" class="column-headers-background">H</th><th id="810171351C8" style="width:150px;" class="column-headers-background">I</th><th id="810171351C9" style="width:150px;" class="column-headers-background">J</th><th id="810171351C10" style="width:150px;" class="column-headers-background">K</th><th id="810171351C11" style="width:150px;" class="column-headers-background">L</th><th id="810171351C12" style="width:150px;" class="column-headers-background">M</th><th id="810171351C13" style="width:150px;" class="column-headers-background">N</th><th id="810171351C14" style="width:150px;" class="column-headers-background">O</th><th id="810171351C15" style="width:150px;" class="column-headers-background">P</th><th id="810171351C16" style="width:150px;" class="column-headers-background">Q</th><th id="810171351C17" style="width:150px;" class="column-headers-background">R</th><th id="810171351C18" style="width:150px;" class="column-headers-background">S</th><th id="810171351C19" style="width:150px;" class="column-headers-background">T</th><th id="810171351C20" style="width:150px;" class="column-headers-background">U</th><th id="810171351C21" style="width:150px;" class="column-headers-background">V</th><th id="810171351C22" style="width:150px;" class="column-headers-background">W</th><th id="810171351C23" style="width:150px;" class="column-headers-background">X</th><th id="810171351C24" style="width:150px;" class="column-headers-background">Y</th><th id="810171351C25" style="width:150px;" class="column-headers-background">Z</th></tr></thead><tbody><tr style="height: 30px"><th id="810171351R0" style="height: 30px;" class="row-headers-background"><div class="row-header-wrapper" style="line-height: 30px">1</div></th><td class="s0" dir="ltr">#</td><td class="s0" dir="ltr">Team Name<br></td><td class="s0" dir="ltr">Player 1</td><td class="s0" dir="ltr">Player 2</td><td class="s0" dir="ltr">Player 3</td><td class="s0" dir="ltr">Player 4</td><td class="s0" dir="ltr">Player 5</td><td class="s0" dir="ltr">Player 6</td><td class="s0" dir="ltr">Player 7</td><td class="s0" dir="ltr">Player 8</td><td class="s0" dir="ltr">Last Updated</td><td class="s0" dir="ltr">Removed 1<br></td><td class="s0" dir="ltr">Removed 2<br></td><td class="s0" dir="ltr">Removed 3<br></td><td class="s0" dir="ltr">Removed 4<br></td><td class="s0" dir="ltr">Removed 5<br></td><td class="s0" dir="ltr">Removed 6<br></td><td class="s0" dir="ltr">Removed 7<br></td><td class="s0" dir="ltr">Removed 8<br></td><td class="s0" dir="ltr">Removed 9<br></td><td class="s0" dir="ltr">Removed 10<br></td><td class="s0" dir="ltr">Removed 11<br></td><td class="s0" dir="ltr">Removed 12<br></td><td class="s0" dir="ltr">Removed 13<br></td><td class="s0" dir="ltr">Removed 14<br></td><td class="s0" dir="ltr">Removed 15<br></td></tr>\n"""
+_HTML_END = """</tbody></table></div></body></html>"""
+_ROW_BEGIN = """<tr style="height: 20px">\n<th id="810171351R{row}" style="height: 20px;" class="row-headers-background"><div class="row-header-wrapper" style="line-height: 20px">{row}</div></th>\n"""
+_SEED_CELL = """<td class="{style}" dir="ltr">{seed}</td>\n"""
+_TOOLTIP_CELL = """<td class="{style}" dir="ltr"><div class="tooltip">{text}<pre class="tooltiptext">{detail}</pre></div></td>\n"""
+_ROW_END = """</tr>\n"""
+
+
+def get_player_style_and_detail(player: Player, eligibility: PlayerEligibility) -> Tuple[str, str]:
+    """The cell style for the player's eligibility, and the detail text that explains it."""
+    style = STYLE_NEEDS_CHECKING
+    best_div = eligibility.best_division
+    low_ink_placements = eligibility.low_ink_placements
+    best_li_placement = eligibility.best_low_ink_placement
+    if eligibility.is_winning_low_ink:
+        style = STYLE_BANNED
+    elif best_div.normalised_value == 4:
+        style = STYLE_EXCEPTION
+    elif best_div.normalised_value <= 3:
+        style = STYLE_BANNED
+    # Considering adding this, but if we're in December and the last result was at the beginning of the year,
+    # or indeed years ago, then this wouldn't be a good indication.
+    # elif best_li_placement is not None:
+    #     style = STYLE_GOOD
+    elif not best_div.is_unknown:
+        style = STYLE_GOOD
+
+    names = list({name.value for name in player.names if name and name.value})
+    names = truncate(join(', ', names[0:], post_func=lambda x: truncate(x, 36)), 1000)
+
+    player_detail = f"Names: {names} \n"
+    player_detail += f"Best Div: {best_div} \n"
+    if best_li_placement:
+        player_detail += f"Best LI: Came {best_li_placement[0]} in {best_li_placement[1]} in {best_li_placement[2]} \n"
+    if len(low_ink_placements) > 1:
+        for placement in low_ink_placements:
+            if placement != best_li_placement:
+                player_detail += f"LI placements: Came {placement[0]} in {placement[1]} in {placement[2]} \n"
+    player_detail += f"Teams: {join(', ', eligibility.teams)} \n"
+    return style, player_detail
+
+
+def get_seeds(teams_by_clout: List[TeamRow]) -> List[int]:
+    """The seed of each team, in the given order, where the team with the most clout is seed 1."""
+    seeds = [0] * len(teams_by_clout)
+    order = sorted(range(len(teams_by_clout)), key=lambda i: teams_by_clout[i][2], reverse=True)
+    for seed, i in enumerate(order, start=1):
+        seeds[i] = seed
+    return seeds
+
+
+def write_verification_report(out: TextIO, teams_by_clout: List[TeamRow]):
+    """Write the report to the stream a row at a time."""
+    out.write(_HTML_BEGIN)
+    for row_count, (tup, team_seed) in enumerate(zip(teams_by_clout, get_seeds(teams_by_clout)), start=2):
+        team_name, team_players, max_clout, max_confidence, awards = tup
+        player_cells = []
+        player_styles = []
+        for player, eligibility in team_players.items():
+            style, player_detail = get_player_style_and_detail(player, eligibility)
+            player_styles.append(style)
+            player_cells.append(_TOOLTIP_CELL.format(style=style, text=player.name, detail=player_detail))
+
+        team_seed_colour = STYLE_GOOD if max_confidence > 70 else STYLE_NEEDS_CHECKING
+        team_name_colour = STYLE_GOOD if all(style == STYLE_GOOD for style in player_styles) else STYLE_NEEDS_CHECKING
+        team_detail = f"Clout: {max_clout} ({max_confidence}% confidence) {awards}"
+
+        out.write(_ROW_BEGIN.format(row=row_count))
+        out.write(_SEED_CELL.format(style=team_seed_colour, seed=team_seed))
+        out.write(_TOOLTIP_CELL.format(style=team_name_colour, text=team_name, detail=team_detail))
+        out.writelines(player_cells)
+        out.write(_ROW_END)
+    out.write(_HTML_END)
+
+
+def _write_verification_bytes(buffer: IO[bytes], teams_by_clout: List[TeamRow], compress: bool) -> str:
+    """Write the report to the buffer as utf-8, gzipped if compress is set. Returns the file name to send it as."""
+    raw = gzip.GzipFile(fileobj=buffer, mode='wb') if compress else buffer
+    write_verification_report(codecs.getwriter('utf-8')(raw), teams_by_clout)
+    if compress:
+        raw.close()  # Writes the gzip trailer, but doesn't close the buffer
+    return "Verifications.html.gz" if compress else "Verifications.html"
+
+
+@debug_time
+def build_verification_file(teams_by_clout: List[TeamRow], compress: bool = False) -> File:
+    """
+    Render the report into a Discord attachment, gzipped as Verifications.html.gz if compress is set.
+    The report is spooled to a temporary file once it outgrows MAX_IN_MEMORY_REPORT_SIZE.
+    """
+    buffer: IO[bytes] = SpooledTemporaryFile(max_size=MAX_IN_MEMORY_REPORT_SIZE)
+    filename = _write_verification_bytes(buffer, teams_by_clout, compress)
+    buffer.seek(0)
+    # File needs an io.IOBase, which SpooledTemporaryFile is only from Python 3.11, so before then pass what it wraps
+    return File(fp=buffer if isinstance(buffer, io.IOBase) else buffer._file, filename=filename)
+
+
+def render_verification_file(teams_by_clout: List[TeamRow], compress: bool = False) -> Tuple[str, str]:
+    """
+    Write the report to a temporary file, for rendering in another process where a File can't be returned, without
+    holding the report in memory or sending it back. Returns the file's path and the file name to send it as.
+    The caller deletes the file once it's sent.
+    """
+    with NamedTemporaryFile(mode='wb', prefix="Verifications", delete=False) as buffer:
+        filename = _write_verification_bytes(buffer, teams_by_clout, compress)
+    return buffer.name, filename
@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from discord import Intents
+from discord.ext.commands import Bot
+
+from DolaBot.cogs import slapp_commands
+from DolaBot.cogs.slapp_commands import SlappCommands, slapp_in_flight
+from DolaBot.helpers.slapp_request import SlappRestartedError
+
+
+class IncrementalAutoseedTests(unittest.IsolatedAsyncioTestCase):
+
+    async def test_known_players_are_not_queried_again(self):
+        commands = SlappCommands(Bot(None, intents=Intents.none()))
+        known = {"a1": "response a1", "b1": "response b1"}
+        queried = []
+
+        async def query_bulk(queries):
+            queries = list(queries)
+            queried.extend(queries)
+            return {query: ("OK", f"response {query}") for query in queries}
+
+        players_to_queue = [("Team A", "a1"), ("Team A", "a2"), ("Team B", "b1"), ("Team C", "c1")]
+        with mock.patch.object(commands, '_query_bulk', side_effect=query_bulk):
+            responses_by_team = await commands._query_teams(None, players_to_queue, known)
+
+        self.assertEqual(["a2", "c1"], queried)
+        self.assertEqual({
+            "Team A": ["response a1", "response a2"],
+            "Team B": ["response b1"],
+            "Team C": ["response c1"],
+        }, responses_by_team)
+        self.assertEqual({"a1", "a2", "b1", "c1"}, set(known))
+
+
+class BulkQueryTests(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.commands = SlappCommands(Bot(None, intents=Intents.none()))
+        self.commands.slapp_pool.max_in_flight = 10
+        self.worker = self.commands.slapp_pool.workers[0]
+        self.worker.started = True
+        self.worker.caching_finished = True
+        self.worker.slappipe.slapp_process = object()  # Stand-in for a running process
+        slapp_commands.slapp_result_cache.clear()
+        slapp_in_flight.clear()
+
+    async def _answer_when_sent(self, count: int, answer):
+        while self.worker.load < count:
+            await asyncio.sleep(0)
+        answer()
+
+    async def test_duplicate_queries_are_sent_once(self):
+        def answer():
+            for query in ("a1", "a2"):
+                self.worker.requests.resolve("OK", {"Message": "OK", "Query": query})
+
+        results, _ = await asyncio.gather(self.commands._query_bulk(["a1", "a2", "a1"]),
+                                          self._answer_when_sent(2, answer))
+        self.assertEqual(["a1", "a2"], list(results))
+        self.assertEqual("a2", results["a2"][1].query)
+        self.assertEqual(0, self.worker.load)
+
+    async def test_restart_returns_none(self):
+        def answer():
+            self.worker.requests.fail_all(SlappRestartedError())
+
+        results, _ = await asyncio.gather(self.commands._query_bulk(["a1", "a2"]),
+                                          self._answer_when_sent(2, answer))
+        self.assertIsNone(results)
+
+
+if __name__ == '__main__':
+    unittest.main()
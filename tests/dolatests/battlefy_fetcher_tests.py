@@ -0,0 +1,97 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from DolaBot.helpers.battlefy_fetcher import BattlefyFetcher, BattlefyFetchError
+
+TEAMS = [{"name": "Team A", "players": [{"persistentPlayerID": "a1"}]}]
+
+
+class _BattlefyStandIn(BaseHTTPRequestHandler):
+    """Serves TEAMS for any tournament with an ETag, answering 304 when the ETag matches."""
+    etag = '"v1"'
+    delay = 0.0
+    full_responses = 0
+    not_modified_responses = 0
+
+    def do_GET(self):
+        time.sleep(type(self).delay)
+        if self.path.startswith("/tournaments/missing"):
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        if self.headers.get('If-None-Match') == type(self).etag:
+            type(self).not_modified_responses += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        type(self).full_responses += 1
+        body = json.dumps(TEAMS).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', type(self).etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class BattlefyFetcherTests(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _BattlefyStandIn)
+        cls.address_format = f'http://127.0.0.1:{cls.server.server_port}/tournaments/{{tourney_id}}/teams'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _BattlefyStandIn.delay = 0.0
+        _BattlefyStandIn.full_responses = 0
+        _BattlefyStandIn.not_modified_responses = 0
+        self.now = 0.0
+        self.fetcher = BattlefyFetcher(self.address_format, ttl=60, clock=lambda: self.now)
+
+    async def asyncTearDown(self):
+        await self.fetcher.close()
+
+    async def test_cached_within_ttl(self):
+        self.assertEqual(TEAMS, await self.fetcher.get_teams("t1"))
+        self.now = 59
+        self.assertEqual(TEAMS, await self.fetcher.get_teams("t1"))
+        self.assertEqual(1, _BattlefyStandIn.full_responses)
+        self.assertEqual(0, _BattlefyStandIn.not_modified_responses)
+
+    async def test_revalidated_with_etag_after_ttl(self):
+        await self.fetcher.get_teams("t1")
+        self.now = 61
+        self.assertEqual(TEAMS, await self.fetcher.get_teams("t1"))
+        self.assertEqual(TEAMS, await self.fetcher.get_teams("t1", force=True))
+        self.assertEqual(1, _BattlefyStandIn.full_responses)
+        self.assertEqual(2, _BattlefyStandIn.not_modified_responses)
+        self.assertEqual(1, self.fetcher.downloads)
+
+    async def test_concurrent_fetches_share_one_download(self):
+        _BattlefyStandIn.delay = 0.2
+        results = await asyncio.gather(*(self.fetcher.get_teams("t1") for _ in range(5)))
+        self.assertTrue(all(result == TEAMS for result in results))
+        self.assertEqual(1, _BattlefyStandIn.full_responses)
+
+    async def test_failure_without_cache_raises(self):
+        with self.assertRaises(BattlefyFetchError):
+            await self.fetcher.get_teams("missing")
+
+
+if __name__ == '__main__':
+    unittest.main()
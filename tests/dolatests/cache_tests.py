@@ -0,0 +1,189 @@
+import unittest
+from unittest import mock
+
+from discord import Embed, Colour, Intents
+from discord.ext.commands import Bot
+
+from DolaBot.cogs import slapp_commands
+from DolaBot.cogs.slapp_commands import build_verification_rows, SlappCommands
+from DolaBot.helpers.lazy_slapp_response import LazySlappResponse
+from DolaBot.helpers.lru_ttl_cache import LruTtlCache
+from DolaBot.helpers.player_eligibility import PlayerEligibilityMemo
+from DolaBot.helpers.processed_slapp_object import ProcessedSlappObject
+from DolaBot.helpers.slapp_query import normalise_query
+from slapp_py.core_classes.division import Division
+from slapp_py.core_classes.name import Name
+from slapp_py.core_classes.player import Player
+
+
+class LruTtlCacheTests(unittest.TestCase):
+
+    def test_least_recently_used_is_evicted(self):
+        cache = LruTtlCache(max_size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(1, cache.get('a'))
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(3, cache.get('c'))
+        self.assertEqual(3, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_entries_expire_after_ttl(self):
+        now = [0.0]
+        cache = LruTtlCache(max_size=10, ttl=5, clock=lambda: now[0])
+        cache.put('a', 1)
+        now[0] = 5.0
+        self.assertEqual(1, cache.get('a'))
+        now[0] = 5.1
+        self.assertNotIn('a', cache)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(0, len(cache))
+
+
+class NormaliseQueryTests(unittest.TestCase):
+
+    def test_equivalent_queries_share_a_key(self):
+        self.assertEqual(normalise_query("Slate  --team"), normalise_query("--team slate"))
+        self.assertEqual(normalise_query("slate --limit 20"), normalise_query("SLATE"))
+
+    def test_options_and_case_sensitivity_change_the_key(self):
+        self.assertNotEqual(normalise_query("slate --team"), normalise_query("slate --player"))
+        self.assertNotEqual(normalise_query("Slate --exactcase"), normalise_query("slate --exactcase"))
+        self.assertNotEqual(normalise_query("slate", limit=20), normalise_query("slate", limit=None))
+
+
+class ProcessedSlappObjectCopyTests(unittest.TestCase):
+
+    def test_copy_is_not_affected_by_sending(self):
+        embed = Embed(title="Found 1 player!")
+        embed.add_field(name="Slate", value="x" * 2000)
+        embed.add_field(name="Sources:", value="LUTI")
+        original = ProcessedSlappObject(embed, Colour.blue(), {"1️⃣": "player"})
+
+        sent = original.copy()
+        sent.embed.remove_field(1)
+        sent.embed._fields[0]["value"] = "truncated"
+        sent.reacts.pop("1️⃣")
+
+        self.assertEqual(2, len(original.embed.fields))
+        self.assertEqual("x" * 2000, original.embed.fields[0].value)
+        self.assertIn("1️⃣", original.reacts)
+        self.assertEqual(Colour.blue(), original.copy().colour)
+
+
+class _CountingResponse:
+    """Stands in for a SlappResponseObject, counting the bracket scans made on it."""
+
+    def __init__(self, matched_players, query: str = "slate"):
+        self.query = query
+        self.matched_players = matched_players
+        self.matched_teams = []
+        self.scans = 0
+
+    @property
+    def matched_players_len(self):
+        return len(self.matched_players)
+
+    def get_best_division_for_player(self, _):
+        self.scans += 1
+        return Division()
+
+    def get_low_ink_placements(self, _):
+        return []
+
+    def best_low_ink_placement(self, _):
+        return None
+
+    @staticmethod
+    def placement_is_winning_low_ink(_):
+        return False
+
+    def get_teams_for_player(self, _):
+        return []
+
+    def get_placements_by_place(self, _):
+        return []
+
+
+class PlayerEligibilityMemoTests(unittest.TestCase):
+
+    def test_matched_players_are_scanned_once_per_snapshot(self):
+        player = Player(names=[Name(value="Slate", sources=[])])
+        response = _CountingResponse([player])
+        memo = PlayerEligibilityMemo(max_size=16)
+
+        self.assertIs(memo.get(response, player), memo.get(response, player))
+        self.assertEqual(1, response.scans)
+
+        memo.invalidate(1)
+        memo.get(response, player)
+        self.assertEqual(2, response.scans)
+
+    def test_players_are_scanned_again_from_a_fuller_response(self):
+        player = Player(names=[Name(value="Slate", sources=[])])
+        narrow = _CountingResponse([player], query="sla")
+        full = _CountingResponse([player], query=player.guid.__str__())
+        memo = PlayerEligibilityMemo(max_size=16)
+
+        memo.get(narrow, player)
+        memo.get(full, player)
+        memo.get(full, player)
+        self.assertEqual(1, narrow.scans)
+        self.assertEqual(1, full.scans)
+
+    def test_unmatched_players_are_not_memoised(self):
+        placeholder = Player(names=[Name(value="Unknown", sources=[])])
+        response = _CountingResponse([])
+        memo = PlayerEligibilityMemo(max_size=16)
+
+        memo.get(response, placeholder, memoisable=False)
+        memo.get(response, placeholder, memoisable=False)
+        self.assertEqual(2, response.scans)
+        self.assertEqual(0, len(memo.cache))
+
+    def test_soft_merged_players_are_not_memoised_or_merged_into_the_response(self):
+        response = LazySlappResponse({"Players": [Player(names=[Name(value=name, sources=[])]).to_dict()
+                                                  for name in ("Slate", "Slate2")]})
+        with mock.patch.object(slapp_commands, 'player_eligibility_memo', PlayerEligibilityMemo(max_size=16)) as memo:
+            _, rows = build_verification_rows({"Team": [response]})
+        (_, team_players, _, _, _), = rows
+        merged, = team_players
+        self.assertEqual({"Slate", "Slate2"}, {name.value for name in merged.names})
+        self.assertEqual(["Slate"], [name.value for name in response.matched_players[0].names])
+        self.assertEqual(0, len(memo.cache))
+
+
+class SlappInvalidationTests(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.commands = SlappCommands(Bot(None, intents=Intents.none()))
+        self.ctx = mock.MagicMock()
+        self.ctx.message.add_reaction = mock.AsyncMock()
+        slapp_commands.slapp_result_cache.put("key", object())
+        slapp_commands.slapp_describe_memo.put("key", object())
+
+    def tearDown(self):
+        slapp_commands.slapp_result_cache.clear()
+        slapp_commands.slapp_describe_memo.clear()
+
+    async def test_patch_clears_the_caches(self):
+        await self.commands._patch_slapp(self.ctx, "https://example.com/a https://example.com/b")
+        self.assertEqual(1, self.commands.slapp_pool.snapshot)
+        self.assertIsNone(slapp_commands.slapp_result_cache.get("key"))
+        self.assertIsNone(slapp_commands.slapp_describe_memo.get("key"))
+        self.ctx.message.add_reaction.assert_awaited_once()
+
+    async def test_restarting_one_worker_keeps_the_caches(self):
+        await self.commands._restart_slapp(None, self.commands.slapp_pool.workers[0])
+        self.assertEqual(0, self.commands.slapp_pool.snapshot)
+        self.assertIsNotNone(slapp_commands.slapp_result_cache.get("key"))
+
+        await self.commands._restart_slapp(self.ctx)
+        self.assertEqual(1, self.commands.slapp_pool.snapshot)
+        self.assertIsNone(slapp_commands.slapp_result_cache.get("key"))
+
+
+if __name__ == '__main__':
+    unittest.main()
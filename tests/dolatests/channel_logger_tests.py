@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import unittest
+
+from DolaBot.helpers.channel_logger import ChannelLogHandler, coalesce_messages
+
+
+class _FakeChannel:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message: str):
+        logging.getLogger().warning("Logged while sending")  # Must not be shipped back
+        self.sent.append(message)
+
+
+def _record(level: int, msg: str) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 1, msg, None, None)
+
+
+class CoalesceMessagesTests(unittest.TestCase):
+
+    def test_lines_are_packed_up_to_the_limit(self):
+        self.assertEqual(["aaa\nbbb", "cccc"], coalesce_messages(["aaa", "bbb", "cccc"], limit=8))
+
+    def test_long_lines_are_split(self):
+        self.assertEqual(["a", "bbbbb", "bbb\nc"], coalesce_messages(["a", "b" * 8, "c"], limit=5))
+
+
+class ChannelLogHandlerTests(unittest.IsolatedAsyncioTestCase):
+
+    def _make_handler(self, max_records: int = 100) -> ChannelLogHandler:
+        # Not added to the root logger, so only the records given to it are queued
+        handler = ChannelLogHandler(None, max_records=max_records, interval=60)
+        handler.log_channel = _FakeChannel()
+        handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+        handler.start()
+        self.addAsyncCleanup(self._close, handler)
+        return handler
+
+    @staticmethod
+    async def _close(handler: ChannelLogHandler):
+        handler.close()
+        await asyncio.sleep(0)
+
+    async def test_records_are_coalesced(self):
+        handler = self._make_handler()
+        for i in range(50):
+            handler.emit(_record(logging.INFO, f"record {i}"))
+        self.assertEqual(0, len(handler.log_channel.sent))
+
+        await handler.flush_to_channel()
+        self.assertEqual(1, len(handler.log_channel.sent))
+        self.assertIn("INFO: record 49", handler.log_channel.sent[0])
+
+    async def test_low_severity_records_are_dropped_when_full(self):
+        handler = self._make_handler(max_records=3)
+        handler.emit(_record(logging.INFO, "info 1"))
+        handler.emit(_record(logging.ERROR, "error 1"))
+        handler.emit(_record(logging.INFO, "info 2"))
+        handler.emit(_record(logging.INFO, "info 3"))  # Dropped as the queue is full
+        handler.emit(_record(logging.ERROR, "error 2"))  # Makes room by dropping info 1
+
+        await handler.flush_to_channel()
+        sent = handler.log_channel.sent[0]
+        self.assertTrue(sent.startswith("(Dropped 2 log records"))
+        self.assertNotIn("info 1", sent)
+        self.assertNotIn("info 3", sent)
+        self.assertIn("error 1\nINFO: info 2\nERROR: error 2", sent)
+
+    async def test_sends_once_a_message_is_full(self):
+        handler = self._make_handler()
+        handler.emit(_record(logging.ERROR, "x" * 2500))
+        for _ in range(10):
+            await asyncio.sleep(0)
+        self.assertEqual(2, len(handler.log_channel.sent))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -53,7 +53,7 @@ class DolaSlappTests(unittest.IsolatedAsyncioTestCase):
 
         try:
             try:
-                from DolaBot.cogs.slapp_commands import SlappCommands, slapp_ctx_queue
+                from DolaBot.cogs.slapp_commands import SlappCommands
                 commands = SlappCommands(Bot(None))
 
                 # Test data in the testdata folder, which is generated directly from Slapp and copied with
@@ -67,11 +67,13 @@ class DolaSlappTests(unittest.IsolatedAsyncioTestCase):
                 await commands.receive_slapp_response("Connection established.", {})
 
                 # Push this request into queue
-                slapp_ctx_queue.append((None, "slapp"))
+                request = commands.slapp_pool.workers[0].requests.begin(None, "slapp", "e")
 
                 # And get a response from Slapp
                 start_time = time()
-                await asyncio.wait_for(commands.receive_slapp_response("OK", response), timeout=600.0)
+                await commands.receive_slapp_response("OK", response)
+                self.assertTrue(request.future.done(), "The response was not routed to the waiting request")
+                await asyncio.wait_for(commands._run_slapp_request(request), timeout=600.0)
                 print(f'Time taken to process response: {time() - start_time:0.3f}s')
             except asyncio.TimeoutError:
                 self.fail(f"Timed out waiting for Dola to build the message from the Slapp response.")
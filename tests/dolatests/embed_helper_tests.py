@@ -0,0 +1,70 @@
+import random
+import unittest
+from typing import List
+
+from discord import Embed, Colour
+
+from DolaBot.helpers.embed_helper import paginate_embed, TOTAL_CHARACTER_LIMIT, NUMBER_OF_FIELDS_LIMIT
+
+
+def _reference_pages(builder: Embed, max_pages: int) -> List[List[str]]:
+    """The field names on each page as the previous send_built_slapp loop split them, by removing from the back."""
+    pages = []
+    removed_fields: List[dict] = []
+    while len(pages) < max_pages:
+        while (len(builder) > TOTAL_CHARACTER_LIMIT
+               or len(builder.fields) > NUMBER_OF_FIELDS_LIMIT
+               or len(removed_fields) == 1):
+            index = len(builder.fields) - 1
+            removed_fields.append(builder._fields[index])
+            builder.remove_field(index)
+        pages.append([field.name for field in builder.fields])
+        if not removed_fields:
+            break
+        removed_fields.reverse()
+        builder = Embed(title=f'Page {len(pages) + 1}', description='')
+        builder._fields = removed_fields
+        removed_fields = []
+    return pages
+
+
+def _make_embed(field_sizes: List[int]) -> Embed:
+    embed = Embed(title="Found lots of teams!", description="Some results")
+    for i, size in enumerate(field_sizes):
+        embed.add_field(name=f"Field {i}", value="x" * size, inline=False)
+    return embed
+
+
+class PaginateEmbedTests(unittest.TestCase):
+
+    def test_small_embed_is_one_page(self):
+        embed = _make_embed([10, 20])
+        pages = paginate_embed(embed)
+        self.assertEqual(1, len(pages))
+        self.assertIs(embed, pages[0])
+        self.assertEqual(2, len(pages[0].fields))
+
+    def test_pages_are_within_limits(self):
+        pages = paginate_embed(_make_embed([1000] * 30), Colour.blue(), max_pages=10)
+        self.assertEqual(30, sum(len(page.fields) for page in pages))
+        self.assertEqual('Page 2', pages[1].title)
+        self.assertEqual(Colour.blue(), pages[1].colour)
+        for page in pages:
+            self.assertLessEqual(len(page), TOTAL_CHARACTER_LIMIT)
+            self.assertLessEqual(len(page.fields), NUMBER_OF_FIELDS_LIMIT)
+
+    def test_matches_previous_pagination(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            sizes = [rng.randint(1, 1000) for _ in range(rng.randint(0, 80))]
+            expected = _reference_pages(_make_embed(sizes), max_pages=10)
+            actual = [[field.name for field in page.fields] for page in paginate_embed(_make_embed(sizes))]
+            self.assertEqual(expected, actual)
+
+    def test_last_field_is_not_alone(self):
+        pages = paginate_embed(_make_embed([1000] * 6))
+        self.assertEqual(2, len(pages[-1].fields))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from DolaBot.helpers.lane_scheduler import LaneScheduler, INTERACTIVE, REACTION, BULK
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LaneSchedulerTests(unittest.TestCase):
+
+    def test_lanes_are_dispatched_by_weight(self):
+        scheduler = LaneScheduler(max_wait=60, clock=_FakeClock())
+        for i in range(20):
+            scheduler.push(BULK, f"b{i}")
+            scheduler.push(REACTION, f"r{i}")
+            scheduler.push(INTERACTIVE, f"i{i}")
+
+        lanes = [scheduler.pop()[0] for _ in range(13)]
+        self.assertEqual(8, lanes.count(INTERACTIVE))
+        self.assertEqual(4, lanes.count(REACTION))
+        self.assertEqual(1, lanes.count(BULK))
+        self.assertNotEqual([INTERACTIVE] * 8, lanes[:8], "Picks should be interleaved rather than taken in a burst")
+
+    def test_lane_is_first_in_first_out(self):
+        scheduler = LaneScheduler(max_wait=60, clock=_FakeClock())
+        for i in range(3):
+            scheduler.push(BULK, i)
+        self.assertEqual([(BULK, 0), (BULK, 1), (BULK, 2)], [scheduler.pop() for _ in range(3)])
+        self.assertIsNone(scheduler.pop())
+        self.assertEqual(0, len(scheduler))
+
+    def test_interactive_goes_ahead_of_queued_bulk(self):
+        scheduler = LaneScheduler(max_wait=60, clock=_FakeClock())
+        for i in range(100):
+            scheduler.push(BULK, i)
+        scheduler.pop()
+        scheduler.push(INTERACTIVE, "query")
+        self.assertEqual((INTERACTIVE, "query"), scheduler.pop())
+        self.assertLessEqual(scheduler.ahead_of(INTERACTIVE), 1)
+        self.assertEqual(99, scheduler.ahead_of(BULK))
+
+    def test_starved_lane_is_dispatched(self):
+        clock = _FakeClock()
+        scheduler = LaneScheduler(weights={INTERACTIVE: 1000, BULK: 1}, max_wait=30, clock=clock)
+        scheduler.push(BULK, "bulk")
+        for i in range(10):
+            scheduler.push(INTERACTIVE, i)
+
+        clock.now = 10
+        self.assertEqual(INTERACTIVE, scheduler.pop()[0])
+        clock.now = 20
+        self.assertEqual(INTERACTIVE, scheduler.pop()[0])
+        clock.now = 31
+        self.assertEqual((BULK, "bulk"), scheduler.pop())
+
+
+if __name__ == '__main__':
+    unittest.main()
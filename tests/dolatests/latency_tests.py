@@ -0,0 +1,54 @@
+import socket
+import unittest
+
+import aiohttp
+
+from DolaBot.helpers.latency import LatencyRecorder, RollingHistogram, start_metrics_server, latency, IPC
+
+
+class RollingHistogramTests(unittest.TestCase):
+
+    def test_percentiles_over_the_window(self):
+        histogram = RollingHistogram(window=100)
+        for i in range(200):
+            histogram.add(i / 1000)
+        self.assertEqual([0.15, 0.19, 0.199], histogram.percentiles())
+        self.assertEqual(200, histogram.count)
+
+    def test_empty_histogram(self):
+        self.assertEqual([0.0, 0.0, 0.0], RollingHistogram().percentiles())
+
+
+class LatencyRecorderTests(unittest.TestCase):
+
+    def test_prometheus_text(self):
+        recorder = LatencyRecorder()
+        recorder.record("ipc", 0.25)
+        with recorder.span("build"):
+            pass
+        text = recorder.prometheus_text()
+        self.assertIn('dola_slapp_stage_seconds{stage="ipc",quantile="0.99"} 0.250000', text)
+        self.assertIn('dola_slapp_stage_seconds_count{stage="build"} 1', text)
+        self.assertIn("ipc: p50 250.0ms", recorder.summary_text())
+
+
+class MetricsServerTests(unittest.IsolatedAsyncioTestCase):
+
+    async def test_metrics_are_served(self):
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            port = s.getsockname()[1]
+
+        latency.record(IPC, 0.1)
+        runner = await start_metrics_server(port)
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                    self.assertEqual(200, response.status)
+                    self.assertIn('stage="ipc"', await response.text())
+        finally:
+            await runner.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import base64
+import json
+import unittest
+
+from slapp_py.core_classes.name import Name
+from slapp_py.core_classes.player import Player
+from slapp_py.core_classes.team import Team
+from slapp_py.slapp_runner.slapp_response_object import SlappResponseObject
+
+from DolaBot.helpers.lazy_slapp_response import LazySlappResponse, decode_slapp_payload
+
+
+def _make_response() -> dict:
+    players = [Player(names=[Name(value=f"player {i}")]).to_dict() for i in range(30)]
+    teams = [Team(names=[Name(value=f"team {i}")]).to_dict() for i in range(5)]
+    additional = Team(names=[Name(value="additional")]).to_dict()
+    return {
+        "Message": "OK",
+        "Query": "e",
+        "Players": players,
+        "Teams": teams,
+        "AdditionalTeams": {additional["Id"]: additional},
+        "PlayersForTeams": {teams[0]["Id"]: [{"Item1": players[0], "Item2": True}, {"Item1": players[1]}]},
+        "PlacementsForPlayers": {players[0]["Id"]: {"2021-01-01-low-ink-jan": [{"Name": "Alpha"}, {"Name": "Beta"}]}},
+        "Sources": ["2021-01-01-low-ink-jan"],
+    }
+
+
+class LazySlappResponseTests(unittest.TestCase):
+
+    def test_decodes_base64_json(self):
+        response = _make_response()
+        line = base64.b64encode(json.dumps(response).encode("utf-8")) + b"\n"
+        self.assertEqual(response, decode_slapp_payload(line))
+
+    def test_matches_the_eager_response(self):
+        response = _make_response()
+        lazy = LazySlappResponse(response)
+        eager = SlappResponseObject(response)
+
+        self.assertEqual(eager.query, lazy.query)
+        self.assertEqual(eager.matched_players_len, lazy.matched_players_len)
+        self.assertEqual(eager.matched_teams_len, lazy.matched_teams_len)
+        self.assertEqual([p.guid for p in eager.matched_players], [p.guid for p in lazy.matched_players])
+        self.assertEqual([t.guid for t in eager.matched_teams[1:3]], [t.guid for t in lazy.matched_teams[1:3]])
+        self.assertEqual(set(eager.known_teams), set(lazy.known_teams))
+        self.assertEqual(len(eager.known_teams), len(lazy.known_teams))
+        self.assertEqual(eager.sources, lazy.sources)
+
+        team_id = str(eager.matched_teams[0].guid)
+        self.assertEqual([(p.guid, in_team) for p, in_team in eager.matched_players_for_teams[team_id]],
+                         [(p.guid, in_team) for p, in_team in lazy.matched_players_for_teams[team_id]])
+        self.assertEqual([], lazy.get_players_in_team("not a team"))
+
+        player = lazy.matched_players[0]
+        self.assertEqual([b.name for b in eager.get_brackets_for_player_by_source(eager.matched_players[0], "2021-01-01-low-ink-jan")],
+                         [b.name for b in lazy.get_brackets_for_player_by_source(player, "2021-01-01-low-ink-jan")])
+        self.assertEqual(eager.get_low_ink_placements(eager.matched_players[0]), lazy.get_low_ink_placements(player))
+
+    def test_only_accessed_results_are_built(self):
+        lazy = LazySlappResponse(_make_response())
+        self.assertTrue(lazy.has_matched_players)
+        self.assertEqual(30, lazy.matched_players_len)
+        first = lazy.matched_players[0]
+        self.assertIs(first, lazy.matched_players[0], "Built results should be kept")
+        self.assertEqual(1, sum(p is not None for p in lazy.matched_players._built))
+
+    def test_known_matched_teams_are_the_matched_team_objects(self):
+        lazy = LazySlappResponse(_make_response())
+        team = lazy.matched_teams[2]
+        self.assertIs(team, lazy.get_team(team.guid))
+        self.assertIn("additional", [t.name.value for t in lazy.known_teams.values()])
+
+
+if __name__ == '__main__':
+    unittest.main()
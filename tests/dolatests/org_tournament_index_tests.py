@@ -0,0 +1,33 @@
+import unittest
+
+from DolaBot.helpers.org_tournament_index import OrgTournamentIndex
+
+
+class OrgTournamentIndexTests(unittest.IsolatedAsyncioTestCase):
+
+    async def test_latest_is_served_from_memory_after_refresh(self):
+        calls = []
+
+        def fetch(org_slug: str):
+            calls.append(org_slug)
+            return ['newest', 'older']
+
+        index = OrgTournamentIndex('org', refresh_interval=900, fetch=fetch)
+        self.assertIsNone(index.latest)
+        self.assertEqual('newest', await index.get_latest())
+        self.assertEqual('newest', await index.get_latest())
+        self.assertEqual(['org'], calls)
+        self.assertIsNotNone(index.refreshed_at)
+
+    async def test_failed_refresh_keeps_previous_ids(self):
+        results = [['newest'], None]
+        index = OrgTournamentIndex('org', refresh_interval=900, fetch=lambda _: results.pop(0))
+        self.assertTrue(await index.refresh())
+        refreshed_at = index.refreshed_at
+        self.assertFalse(await index.refresh())
+        self.assertEqual('newest', index.latest)
+        self.assertEqual(refreshed_at, index.refreshed_at)
+
+
+if __name__ == '__main__':
+    unittest.main()
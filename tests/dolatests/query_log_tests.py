@@ -0,0 +1,148 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from discord import Intents
+from discord.ext.commands import Bot
+
+from DolaBot.cogs import slapp_commands
+from DolaBot.cogs.slapp_commands import SlappCommands, slapp_in_flight
+from DolaBot.helpers.lane_scheduler import BULK
+from DolaBot.helpers.query_log import QueryLog, QUERY, DESCRIBE
+
+
+class QueryLogTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "queries.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_lookups_are_counted_and_ranked(self):
+        log = QueryLog()
+        log.record(QUERY, "splat --limit 20", "splat", 20, 1.0)
+        log.record(DESCRIBE, "abc", "ABC", None, 0.5)
+        log.record(QUERY, "splat --limit 20", "Splat", 20, 3.0)
+
+        (kind, stats), (other_kind, _) = log.top(2)
+        self.assertEqual(QUERY, kind)
+        self.assertEqual(2, stats.count)
+        self.assertEqual(2.0, stats.mean_seconds)
+        self.assertEqual("Splat", stats.query)
+        self.assertEqual(DESCRIBE, other_kind)
+
+    def test_log_is_read_back(self):
+        log = QueryLog(self.path)
+        log.record(QUERY, "splat --limit 20", "splat", 20, 1.0)
+        log.record(QUERY, "splat --limit 20", "splat", 20, 1.0)
+        log.close()
+
+        with open(self.path, 'a', encoding='utf-8') as outfile:
+            outfile.write("not json\n")
+
+        reopened = QueryLog(self.path)
+        reopened.record(QUERY, "splat --limit 20", "SPLAT", 20, 1.0)
+        reopened.load()
+        (_, stats), = reopened.top(5)
+        self.assertEqual(3, stats.count)
+        self.assertEqual("SPLAT", stats.query, "The form made since should be kept")
+
+    def test_log_is_compacted(self):
+        log = QueryLog(self.path, compact_after=3)
+        log.load()
+        for _ in range(4):
+            log.record(DESCRIBE, "abc", "abc", None, 1.0)
+        log.close()
+
+        with open(self.path, 'r', encoding='utf-8') as infile:
+            self.assertEqual(1, len(infile.readlines()))
+        reopened = QueryLog(self.path)
+        reopened.load()
+        (_, stats), = reopened.top(5)
+        self.assertEqual(4, stats.count)
+
+    def test_least_recent_lookups_are_dropped_apart_from_the_most_made(self):
+        log = QueryLog(max_entries=8)
+        for _ in range(3):
+            log.record(QUERY, "popular", "popular", 20, 1.0)
+        for i in range(8):
+            log.record(QUERY, f"rare {i}", f"rare {i}", 20, 1.0)
+
+        self.assertEqual(6, len(log))
+        self.assertIn((QUERY, "popular"), log.stats)
+        self.assertNotIn((QUERY, "rare 1"), log.stats)
+        self.assertIn((QUERY, "rare 7"), log.stats)
+
+    def test_summary_truncates_long_queries(self):
+        log = QueryLog()
+        log.record(QUERY, "long", "x" * 1000, 20, 1.0)
+        self.assertLess(len(log.summary_text()), 100)
+
+    def test_only_kept_in_memory_unless_configured(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(QueryLog.from_env().path)
+        with mock.patch.dict(os.environ, {"SLAPP_QUERY_LOG": self.path}):
+            self.assertEqual(self.path, QueryLog.from_env().path)
+
+
+class QueryLogFlushTests(unittest.IsolatedAsyncioTestCase):
+
+    async def test_lookups_are_written_in_the_background(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "queries.jsonl")
+            log = QueryLog(path, flush_interval=0)
+            log.record(QUERY, "splat --limit 20", "splat", 20, 1.0)
+            self.assertFalse(os.path.exists(path), "Recording shouldn't write on the event loop")
+
+            log.start()
+            while not os.path.exists(path):
+                await asyncio.sleep(0.01)
+            log.close()
+
+            reopened = QueryLog(path)
+            reopened.load()
+            self.assertEqual(1, len(reopened))
+
+
+class PrewarmTests(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.commands = SlappCommands(Bot(None, intents=Intents.none()))
+        self.worker = self.commands.slapp_pool.workers[0]
+        self.worker.started = True
+        self.worker.caching_finished = True
+        self.worker.slappipe.slapp_process = object()  # Stand-in for a running process
+        slapp_commands.slapp_result_cache.clear()
+        slapp_in_flight.clear()
+
+        log = QueryLog()
+        log.record(QUERY, "splat --limit 20", "splat", 20, 1.0)
+        patches = (mock.patch.object(slapp_commands, 'query_log', log),
+                   mock.patch.object(slapp_commands, 'prewarm_interval', 0))
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    async def test_popular_queries_are_cached(self):
+        task = asyncio.create_task(self.commands._prewarm(self.commands.slapp_pool.snapshot))
+        while not self.worker.load:
+            await asyncio.sleep(0)
+        self.worker.requests.resolve("OK", {"Message": "OK", "Query": "splat"})
+        await task
+
+        request = await self.commands._send_query(None, 'slapp', 'splat')
+        self.assertIsNotNone(request.response_object)
+
+    async def test_prewarming_waits_for_live_traffic(self):
+        self.commands.slapp_pool.max_in_flight = 1
+        await self.commands._send_query(None, 'bulk', 'other', lane=BULK)
+        task = asyncio.create_task(self.commands._prewarm(self.commands.slapp_pool.snapshot))
+        await asyncio.sleep(0.01)
+        self.assertEqual(0, len(self.commands.slapp_pool.lanes))
+
+        self.commands._invalidate_slapp_results()
+        await task
@@ -0,0 +1,61 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from discord import Intents, PartialEmoji
+from discord.ext.commands import Bot
+
+from DolaBot.cogs import slapp_commands
+from DolaBot.cogs.slapp_commands import SlappCommands
+from DolaBot.helpers.lane_scheduler import REACTION
+from DolaBot.helpers.reaction_index import ReactionIndex
+
+
+class ReactionHandlingTests(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.index = ReactionIndex()
+        self.index.add(1234, {"1️⃣": "guid-a"})
+        patcher = mock.patch.object(slapp_commands, 'reaction_index', self.index)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.commands = SlappCommands(Bot(None, intents=Intents.none()))
+        self.commands._describe = mock.AsyncMock()
+        self.channel = mock.MagicMock()
+        self.channel.get_partial_message.return_value.clear_reaction = mock.AsyncMock()
+        self.commands.bot.get_channel = mock.MagicMock(return_value=self.channel)
+        self.commands.bot.fetch_channel = mock.AsyncMock()
+
+    @staticmethod
+    def _payload(message_id: int, emoji: str):
+        return SimpleNamespace(message_id=message_id, channel_id=42, emoji=PartialEmoji(name=emoji))
+
+    def test_only_indexed_messages_are_tracked(self):
+        self.assertTrue(SlappCommands.is_tracked_message(1234))
+        self.assertFalse(SlappCommands.is_tracked_message(5678))
+
+    async def test_unknown_message_does_no_io(self):
+        await self.commands.handle_reaction(self._payload(5678, "1️⃣"))
+        self.commands.bot.get_channel.assert_not_called()
+        self.commands.bot.fetch_channel.assert_not_called()
+        self.commands._describe.assert_not_called()
+
+    async def test_cached_channel_and_partial_message_are_used(self):
+        await self.commands.handle_reaction(self._payload(1234, "1️⃣"))
+        self.commands.bot.fetch_channel.assert_not_called()
+        self.channel.get_partial_message.assert_called_once_with(1234)
+        self.channel.get_partial_message.return_value.clear_reaction.assert_awaited_once_with("1️⃣")
+        self.commands._describe.assert_awaited_once_with(self.channel, "guid-a", lane=REACTION)
+        self.assertIsNone(self.index.get(1234, "1️⃣"))
+
+    async def test_channel_is_fetched_on_cache_miss(self):
+        self.commands.bot.get_channel.return_value = None
+        self.commands.bot.fetch_channel.return_value = self.channel
+        await self.commands.handle_reaction(self._payload(1234, "1️⃣"))
+        self.commands.bot.fetch_channel.assert_awaited_once_with(42)
+        self.commands._describe.assert_awaited_once_with(self.channel, "guid-a", lane=REACTION)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+from DolaBot.helpers.reaction_index import ReactionIndex
+
+
+class ReactionIndexTests(unittest.TestCase):
+
+    def test_get_and_pop(self):
+        index = ReactionIndex()
+        index.add(1234, {"1️⃣": "guid-a", "2️⃣": "guid-b"})
+        self.assertIn("1234", index)
+        self.assertEqual("guid-a", index.get("1234", "1️⃣"))
+        self.assertEqual("guid-b", index.pop(1234, "2️⃣"))
+        self.assertIsNone(index.get(1234, "2️⃣"))
+        self.assertIsNone(index.get(5678, "1️⃣"))
+
+    def test_least_recently_used_message_is_evicted(self):
+        index = ReactionIndex(max_messages=2)
+        index.add(1, {"1️⃣": "a"})
+        index.add(2, {"1️⃣": "b"})
+        index.get(1, "1️⃣")
+        index.add(3, {"1️⃣": "c"})
+        self.assertEqual(2, len(index))
+        self.assertIn(1, index)
+        self.assertNotIn(2, index)
+        self.assertIn(3, index)
+
+    def test_survives_reopening(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "reactions.sqlite3")
+            index = ReactionIndex(path, max_messages=2)
+            index.add(1, {"1️⃣": "a"})
+            index.add(2, {"1️⃣": "b"})
+            index.get(1, "1️⃣")
+            index.close()
+
+            reopened = ReactionIndex(path, max_messages=2)
+            self.assertIn(2, reopened)
+            self.assertEqual("b", reopened.get(2, "1️⃣"))
+            reopened.add(3, {"1️⃣": "c"})
+            self.assertNotIn(1, reopened)
+            reopened.close()
+
+    def test_reads_do_not_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "reactions.sqlite3")
+            index = ReactionIndex(path)
+            index.add(1, {"1️⃣": "a", "2️⃣": "b"})
+            index.get(1, "1️⃣")
+            self.assertFalse(index._db.in_transaction)
+            self.assertEqual("b", index.pop(1, "2️⃣"))
+            index.close()
+
+            reopened = ReactionIndex(path)
+            self.assertIsNone(reopened.get(1, "2️⃣"), "The pop should be written on close")
+            self.assertEqual("a", reopened.get(1, "1️⃣"))
+            reopened.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from discord import NotFound
+
+from DolaBot.helpers.reaction_scheduler import ReactionScheduler
+
+
+class _FakeMessage:
+    """Records its reactions, optionally being deleted after some number of them."""
+    active = 0
+    most_active = 0
+
+    def __init__(self, message_id: int, deleted_after: int = -1):
+        self.id = message_id
+        self.reactions = []
+        self.deleted_after = deleted_after
+
+    async def add_reaction(self, reaction: str):
+        if len(self.reactions) == self.deleted_after:
+            raise NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+
+        type(self).active += 1
+        type(self).most_active = max(type(self).most_active, type(self).active)
+        await asyncio.sleep(0.01)
+        type(self).active -= 1
+        self.reactions.append(reaction)
+
+
+class ReactionSchedulerTests(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        _FakeMessage.active = 0
+        _FakeMessage.most_active = 0
+
+    async def test_reactions_are_added_in_order(self):
+        scheduler = ReactionScheduler(max_concurrency=2)
+        message = _FakeMessage(1)
+        scheduler.schedule(message, ["1️⃣", "2️⃣", "3️⃣"])
+        self.assertEqual(1, len(scheduler))
+        await scheduler.drain()
+        self.assertEqual(["1️⃣", "2️⃣", "3️⃣"], message.reactions)
+        self.assertEqual(0, len(scheduler))
+
+    async def test_messages_are_reacted_to_with_bounded_concurrency(self):
+        scheduler = ReactionScheduler(max_concurrency=2)
+        messages = [_FakeMessage(i) for i in range(5)]
+        for message in messages:
+            scheduler.schedule(message, ["1️⃣", "2️⃣"])
+        await scheduler.drain()
+        self.assertTrue(all(message.reactions == ["1️⃣", "2️⃣"] for message in messages))
+        self.assertEqual(2, _FakeMessage.most_active)
+
+    async def test_deleted_message_is_given_up_on(self):
+        scheduler = ReactionScheduler()
+        message = _FakeMessage(1, deleted_after=1)
+        added = await scheduler.schedule(message, ["1️⃣", "2️⃣", "3️⃣"])
+        self.assertEqual(1, added)
+        self.assertEqual(["1️⃣"], message.reactions)
+
+
+if __name__ == '__main__':
+    unittest.main()
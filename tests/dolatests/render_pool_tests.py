@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import unittest
+from unittest import mock
+
+from slapp_py.core_classes.name import Name
+from slapp_py.core_classes.player import Player
+from slapp_py.core_classes.team import Team
+
+from DolaBot.cogs import slapp_commands
+from DolaBot.cogs.slapp_commands import process_slapp, build_slapp
+from DolaBot.helpers.lazy_slapp_response import LazySlappResponse
+from DolaBot.helpers.render_pool import RenderPool
+from DolaBot.helpers.timer_decorator import debug_time
+
+
+@debug_time
+def _profiled(a, b):
+    return a + b
+
+
+def _make_response() -> dict:
+    return {
+        "Message": "OK",
+        "Query": "e",
+        "Players": [Player(names=[Name(value=f"player {i}")]).to_dict() for i in range(3)],
+        "Teams": [Team(names=[Name(value="team")]).to_dict()],
+    }
+
+
+class RenderPoolTests(unittest.IsolatedAsyncioTestCase):
+
+    async def test_runs_inline_without_processes(self):
+        pool = RenderPool(processes=0)
+        self.assertEqual(8, await pool.run(pow, 2, 3))
+        self.assertIsNone(pool._executor)
+
+    async def test_runs_in_a_process(self):
+        pool = RenderPool(processes=1)
+        try:
+            self.assertEqual(8, await pool.run(pow, 2, 3))
+            self.assertIsNotNone(pool._executor)
+        finally:
+            pool.shutdown()
+
+    async def test_log_records_and_profiles_reach_the_bot(self):
+        _profiled.profile.reset()
+        pool = RenderPool(processes=1)
+        try:
+            with self.assertLogs(level='ERROR') as logs:
+                await pool.run(logging.error, "Failed to render")
+                for _ in range(50):
+                    if logs.records:
+                        break
+                    await asyncio.sleep(0.1)
+            self.assertEqual(3, await pool.run(_profiled, 1, 2))
+        finally:
+            pool.shutdown()
+        self.assertEqual(["Failed to render"], [record.getMessage() for record in logs.records])
+        self.assertEqual(1, _profiled.profile.count)
+
+    async def test_rendered_slapp_matches_inline(self):
+        response = LazySlappResponse(_make_response())
+        inline = build_slapp(response)
+
+        pool = RenderPool(processes=1)
+        try:
+            with mock.patch.object(slapp_commands, 'render_pool', pool):
+                rendered = await process_slapp(response)
+        finally:
+            pool.shutdown()
+
+        self.assertEqual(inline.embed.title, rendered.embed.title)
+        self.assertEqual([f.value for f in inline.embed.fields], [f.value for f in rendered.embed.fields])
+        self.assertEqual(inline.colour, rendered.colour)
+        self.assertEqual(list(inline.reacts), list(rendered.reacts))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from discord import Intents, Colour
+from discord.ext.commands import Bot, Context
+
+from DolaBot.cogs import slapp_commands
+from DolaBot.cogs.slapp_commands import SlappCommands, process_slapp_once, slapp_in_flight
+from DolaBot.constants.emojis import CROSS
+from DolaBot.helpers.lane_scheduler import BULK
+from DolaBot.helpers.processed_slapp_object import ProcessedSlappObject
+
+
+class SingleFlightTests(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.commands = SlappCommands(Bot(None, intents=Intents.none()))
+        self.worker = self.commands.slapp_pool.workers[0]
+        self.worker.started = True
+        self.worker.caching_finished = True
+        self.worker.slappipe.slapp_process = object()  # Stand-in for a running process
+        slapp_commands.slapp_result_cache.clear()
+        slapp_in_flight.clear()
+
+    async def test_identical_queries_share_one_request(self):
+        leader = await self.commands._send_query(None, 'slapp', 'splat')
+        follower = await self.commands._send_query(None, 'slapp', '  SPLAT ')
+        self.assertIs(leader, follower.leader)
+        self.assertEqual(1, self.worker.load)
+
+        self.worker.requests.resolve("OK", {"Message": "OK", "Query": "splat"})
+        (_, leader_response), (_, follower_response) = await asyncio.gather(
+            SlappCommands._await_slapp(leader), SlappCommands._await_slapp(follower))
+        self.assertIs(leader_response, follower_response)
+        self.assertEqual({}, slapp_in_flight)
+
+    async def test_followers_are_told_when_the_leader_fails(self):
+        contexts = [mock.MagicMock(spec=Context) for _ in range(2)]
+        for ctx in contexts:
+            ctx.message = mock.MagicMock()
+            ctx.message.add_reaction = mock.AsyncMock()
+        leader = await self.commands._send_query(contexts[0], 'slapp', 'splat')
+        follower = await self.commands._send_query(contexts[1], 'slapp', 'splat')
+        self.assertIs(leader, follower.leader)
+
+        await self.commands.receive_slapp_response("Connection established. 1 players and 1 teams loaded.", {},
+                                                   worker=self.worker)
+        for ctx in contexts:
+            ctx.message.add_reaction.assert_any_await(CROSS)
+        self.assertIsNone(await SlappCommands._await_slapp(follower))
+
+    async def test_identical_describes_share_one_request(self):
+        leader = await self.commands._send_describe(None, 'full', 'ABC-123')
+        follower = await self.commands._send_describe(None, 'full', 'abc-123')
+        self.assertIs(leader, follower.leader)
+        self.assertEqual(1, self.worker.load)
+
+    async def test_waiting_bulk_request_is_not_followed_by_interactive(self):
+        self.commands.slapp_pool.max_in_flight = 1
+        await self.commands._send_query(None, 'bulk', 'other', lane=BULK)
+        await self.commands._send_query(None, 'bulk', 'splat', lane=BULK)
+        interactive = await self.commands._send_query(None, 'slapp', 'splat')
+        self.assertIsNone(interactive.leader)
+
+    async def test_concurrent_sends_of_a_response_build_it_once(self):
+        built = ProcessedSlappObject(None, Colour.red(), {"1️⃣": "guid"})
+        response = object()
+
+        async def slow_process(_):
+            await asyncio.sleep(0.01)
+            return built
+
+        with mock.patch.object(slapp_commands, 'process_slapp', side_effect=slow_process) as process:
+            first, second = await asyncio.gather(process_slapp_once(response), process_slapp_once(response))
+        process.assert_called_once()
+        self.assertIsNot(first, second)
+        self.assertEqual(built.reacts, first.reacts)
+
+
+if __name__ == '__main__':
+    unittest.main()
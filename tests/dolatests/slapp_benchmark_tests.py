@@ -0,0 +1,267 @@
+"""
+Benchmarks rendering recorded Slapp responses through process_slapp, send_built_slapp, handle_autoseed and handle_html.
+The corpus is every .txt file in ../testdata/benchmark (or SLAPP_BENCHMARK_CORPUS), each recorded like
+slapp_result.txt:
+    SplatTagConsole.exe --query "e" --verbose >slapp_result.txt 2>&1
+The committed corpus is synthetic, made with --generate, so that the benchmark runs without a Slapp database.
+The benchmark fails when a stage is slower, or allocates more at peak, than the stored baseline by more than
+SLAPP_BENCHMARK_TOLERANCE (0.5, i.e. 50%, by default). Stages missing from the baseline are only reported.
+Run this file directly to print the numbers, or with --record to store them as the new baseline.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import random
+import sys
+import tracemalloc
+import unittest
+from time import perf_counter
+from typing import Dict, Callable, Awaitable, List
+from unittest import mock
+from uuid import UUID
+
+from slapp_py.core_classes.bracket import Bracket
+from slapp_py.core_classes.division import Division
+from slapp_py.core_classes.divisions_handler import DivisionsHandler
+from slapp_py.core_classes.name import Name
+from slapp_py.core_classes.placement import Placement
+from slapp_py.core_classes.player import Player
+from slapp_py.core_classes.simple_source import SimpleSource
+from slapp_py.core_classes.team import Team
+from slapp_py.core_classes.teams_handler import TeamsHandler
+
+from DolaBot.cogs import slapp_commands
+from DolaBot.cogs.slapp_commands import SlappCommands, process_slapp, handle_html, player_eligibility_memo
+from DolaBot.helpers.lazy_slapp_response import LazySlappResponse, decode_slapp_payload
+from DolaBot.helpers.reaction_index import ReactionIndex
+from DolaBot.helpers.supports_send import SupportsSend
+
+CORPUS_DIR = os.getenv("SLAPP_BENCHMARK_CORPUS",
+                       os.path.join(os.path.dirname(__file__), "..", "testdata", "benchmark"))
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "slapp_benchmark_baseline.json")
+ITERATIONS = int(os.getenv("SLAPP_BENCHMARK_ITERATIONS", "20"))
+TOLERANCE = float(os.getenv("SLAPP_BENCHMARK_TOLERANCE", "0.5"))
+NOISE_FLOOR = {"seconds": 0.0005, "peak_kib": 16.0}
+"""How much over its baseline a measurement must also be to count as a regression, as the smallest stages take
+well under a millisecond."""
+
+BenchmarkResults = Dict[str, Dict[str, float]]
+"""Keyed by case/stage, then seconds (per op) and peak_kib."""
+
+
+class _FakeMessage:
+    def __init__(self, message_id: int):
+        self.id = message_id
+
+    async def add_reaction(self, reaction: str):
+        pass
+
+
+class _FakeSend(SupportsSend):
+    """Counts what would have been sent to Discord."""
+
+    def __init__(self):
+        self.messages_sent = 0
+
+    async def send(self, content=None, *, tts=False, embed=None, file=None,
+                   files=None, delete_after=None, nonce=None,
+                   allowed_mentions=None, reference=None,
+                   mention_author=None):
+        self.messages_sent += 1
+        return _FakeMessage(self.messages_sent)
+
+
+SYNTHETIC_CORPUS = {"narrow": (8, 3), "broad": (120, 40)}
+"""The synthetic responses written by --generate, by name, as (players, teams)."""
+
+
+def make_synthetic_response(players: int, teams: int, seed: int = 0) -> dict:
+    """A Slapp response to a broad query, with rosters, divisions and Low Ink placements, the same for each seed."""
+    rng = random.Random(seed)
+
+    def guid() -> UUID:
+        return UUID(int=rng.getrandbits(128), version=4)
+
+    sources = [SimpleSource(f"2021-{month:02}-01-low-ink-{month}-{seed}") for month in range(1, 7)]
+    team_objects = [Team(names=[Name(f"Team {i}", sources[:1])],
+                         division_information=DivisionsHandler({Division(rng.randint(1, 9), "LUTI", "S12"): sources[:1]}),
+                         guid=guid())
+                    for i in range(teams)]
+    player_objects = [Player(names=[Name(f"Player {i}", sources[:1])],
+                             teams_information=TeamsHandler({rng.choice(team_objects).guid: [rng.choice(sources)]}),
+                             guid=guid())
+                      for i in range(players)]
+
+    players_for_teams: Dict[str, list] = {}
+    for p in player_objects:
+        for team_id in p.teams_information.get_teams_unordered():
+            players_for_teams.setdefault(str(team_id), []).append({"Item1": p.to_dict(), "Item2": True})
+
+    placements_for_players = {
+        str(p.guid): {source.name: [Bracket("Alpha", placements=Placement(
+            players_by_placement={rng.randint(1, 16): [p.guid]})).to_dict()] for source in rng.sample(sources, 3)}
+        for p in player_objects
+    }
+    return {
+        "Message": "OK",
+        "Query": "e",
+        "Players": [p.to_dict() for p in player_objects],
+        "Teams": [t.to_dict() for t in team_objects],
+        "AdditionalTeams": {},
+        "PlayersForTeams": players_for_teams,
+        "PlacementsForPlayers": placements_for_players,
+        "Sources": [source.name for source in sources],
+    }
+
+
+def write_synthetic_corpus(corpus_dir: str = CORPUS_DIR):
+    os.makedirs(corpus_dir, exist_ok=True)
+    for seed, (name, (players, teams)) in enumerate(SYNTHETIC_CORPUS.items()):
+        response = make_synthetic_response(players, teams, seed)
+        with open(os.path.join(corpus_dir, f"{name}.txt"), 'wb') as outfile:
+            outfile.write(base64.b64encode(json.dumps(response).encode("utf-8")) + b"\n")
+
+
+def load_corpus(corpus_dir: str = CORPUS_DIR) -> Dict[str, LazySlappResponse]:
+    """The recorded responses by file name, smallest first."""
+    if not os.path.isdir(corpus_dir):
+        return {}
+
+    paths = [os.path.join(corpus_dir, f) for f in os.listdir(corpus_dir) if f.endswith(".txt")]
+    corpus = {}
+    for path in sorted(paths, key=os.path.getsize):
+        with open(path, 'rb') as infile:
+            corpus[os.path.splitext(os.path.basename(path))[0]] = LazySlappResponse(decode_slapp_payload(infile.read()))
+    return corpus
+
+
+async def measure(run: Callable[[], Awaitable]) -> Dict[str, float]:
+    """
+    The fastest seconds of ITERATIONS runs after a warm-up, and the peak allocation of one more run.
+    The fastest run is the one least disturbed by the rest of the machine, so it's the steadiest to compare.
+    """
+    await run()
+
+    seconds = float('inf')
+    for _ in range(ITERATIONS):
+        start = perf_counter()
+        await run()
+        seconds = min(seconds, perf_counter() - start)
+
+    # Traced separately as tracing slows every allocation
+    tracemalloc.start()
+    try:
+        await run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": seconds, "peak_kib": peak / 1024}
+
+
+async def run_benchmarks(corpus: Dict[str, LazySlappResponse]) -> BenchmarkResults:
+    ctx = _FakeSend()
+
+    def cold():
+        """Drop the memoised eligibility so that each run does the full work."""
+        player_eligibility_memo.invalidate(player_eligibility_memo.snapshot)
+
+    results: BenchmarkResults = {}
+    # Rendered through the configured render pool, which renders on the event loop by default
+    with mock.patch.object(slapp_commands, 'reaction_index', ReactionIndex()):
+        for name, r in corpus.items():
+            async def process():
+                cold()
+                await process_slapp(r)
+
+            # Sending trims the embed, so each run sends its own copy
+            processed = await process_slapp(r)
+            copies = iter([processed.copy() for _ in range(ITERATIONS + 2)])
+
+            async def send():
+                await SlappCommands.send_built_slapp(ctx, next(copies))
+                await slapp_commands.reaction_scheduler.drain()
+
+            async def autoseed():
+                cold()
+                await SlappCommands.handle_autoseed(ctx, {name: [r]})
+
+            async def html():
+                cold()
+                await handle_html(ctx, {name: [r]})
+
+            for stage, run in (("process_slapp", process), ("send_built_slapp", send),
+                               ("handle_autoseed", autoseed), ("handle_html", html)):
+                results[f"{name}/{stage}"] = await measure(run)
+    slapp_commands.render_pool.shutdown()
+    return results
+
+
+def find_regressions(results: BenchmarkResults, baseline: BenchmarkResults, tolerance: float = TOLERANCE) -> List[str]:
+    """A line for each measurement that exceeds its baseline by more than the tolerance and the noise floor."""
+    regressions = []
+    for key, measured in results.items():
+        for metric, value in measured.items():
+            expected = baseline.get(key, {}).get(metric)
+            if expected and value > expected * (1 + tolerance) and value - expected > NOISE_FLOOR.get(metric, 0):
+                regressions.append(f"{key} {metric}: {value:.4f} against a baseline of {expected:.4f}")
+    return regressions
+
+
+def format_results(results: BenchmarkResults) -> str:
+    return '\n'.join(f"{key}: {1 / measured['seconds']:.1f} ops/s, peak {measured['peak_kib']:.0f} KiB"
+                     for key, measured in results.items())
+
+
+def load_baseline() -> BenchmarkResults:
+    if not os.path.isfile(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, 'r', encoding='utf-8') as infile:
+        return json.load(infile)
+
+
+class SlappBenchmarkTests(unittest.TestCase):
+
+    def test_rendering_has_not_regressed(self):
+        corpus = load_corpus()
+        if not corpus:
+            self.skipTest(f"No recorded Slapp responses in {CORPUS_DIR}")
+
+        # Run like the baseline is recorded, not in IsolatedAsyncioTestCase's debug mode, which slows every task
+        results = asyncio.run(run_benchmarks(corpus))
+        logging.info(f"Slapp rendering benchmark:\n{format_results(results)}")
+        regressions = find_regressions(results, load_baseline())
+        self.assertFalse(regressions, "Slower or larger than the baseline:\n" + '\n'.join(regressions) +
+                         "\n\nAll results:\n" + format_results(results))
+
+    def test_regressions_are_measured_against_the_tolerance(self):
+        baseline = {"e/process_slapp": {"seconds": 1.0, "peak_kib": 100.0}}
+        self.assertEqual([], find_regressions({"e/process_slapp": {"seconds": 1.4, "peak_kib": 100.0}}, baseline, 0.5))
+        self.assertEqual(1, len(find_regressions({"e/process_slapp": {"seconds": 1.6, "peak_kib": 90.0}}, baseline, 0.5)))
+        self.assertEqual([], find_regressions({"new/process_slapp": {"seconds": 9.0, "peak_kib": 900.0}}, baseline, 0.5))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark rendering recorded Slapp responses.")
+    parser.add_argument("--record", action="store_true", help="Store the results as the new baseline.")
+    parser.add_argument("--generate", action="store_true", help="Write the synthetic corpus before benchmarking.")
+    args = parser.parse_args()
+
+    if args.generate:
+        write_synthetic_corpus()
+
+    loaded = load_corpus()
+    if not loaded:
+        sys.exit(f"No recorded Slapp responses in {CORPUS_DIR}")
+
+    benchmark_results = asyncio.run(run_benchmarks(loaded))
+    print(format_results(benchmark_results))
+    if args.record:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as outfile:
+            json.dump(benchmark_results, outfile, indent=2, sort_keys=True)
+        print(f"Baseline written to {BASELINE_PATH}")
+    else:
+        for regression in find_regressions(benchmark_results, load_baseline()):
+            print(f"REGRESSION {regression}")
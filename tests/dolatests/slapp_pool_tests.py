@@ -0,0 +1,125 @@
+import asyncio
+import os
+import unittest
+from time import perf_counter
+from unittest import mock
+
+from DolaBot.helpers.lane_scheduler import BULK, INTERACTIVE
+from DolaBot.helpers.slapp_pool import SlappWorkerPool, get_slapp_worker_count
+from DolaBot.helpers.slapp_readiness import SPAWNED
+
+
+class _AnsweringStdin:
+    """Stands in for a Slapp process's stdin, answering each line written to it as soon as it's drained."""
+
+    def __init__(self, pool: SlappWorkerPool):
+        self.pool = pool
+        self.written = 0
+
+    def write(self, data: bytes):
+        self.written += 1
+
+    async def drain(self):
+        asyncio.get_running_loop().call_soon(asyncio.ensure_future, self._answer())
+
+    async def _answer(self):
+        self.pool.workers[0].requests.resolve("OK", {})
+        await self.pool.dispatch()
+
+
+class SlappWorkerPoolTests(unittest.IsolatedAsyncioTestCase):
+
+    @staticmethod
+    def _make_pool(size: int, max_in_flight: int = 2) -> SlappWorkerPool:
+        pool = SlappWorkerPool(size, max_in_flight=max_in_flight)
+        for worker in pool.workers:
+            worker.started = True
+            worker.caching_finished = True
+            worker.slappipe.slapp_process = object()  # Stand-in for a running process
+        return pool
+
+    async def test_least_loaded_healthy_worker_is_chosen(self):
+        pool = self._make_pool(3, max_in_flight=3)
+        pool.workers[0].requests.begin(None, "slapp", "a")
+        pool.workers[0].requests.begin(None, "slapp", "b")
+        pool.workers[1].requests.begin(None, "slapp", "c")
+        pool.workers[2].requests.begin(None, "slapp", "d")
+        pool.workers[2].slappipe.slapp_loop = False  # Dead
+        self.assertIs(pool.workers[1], pool._worker_with_room())
+
+    async def test_workers_still_caching_are_avoided(self):
+        pool = self._make_pool(2)
+        pool.workers[0].caching_finished = False
+        pool.workers[1].requests.begin(None, "slapp", "a")
+        self.assertIs(pool.workers[1], pool._worker_with_room())
+        self.assertEqual(1, len(pool))
+
+    async def test_requests_wait_in_their_lane_until_a_worker_has_room(self):
+        pool = self._make_pool(1, max_in_flight=1)
+        worker = pool.workers[0]
+        bulk = [await pool.query_slapp(None, "bulk", f"player{i}", lane=BULK) for i in range(3)]
+        self.assertEqual(1, worker.load)
+        self.assertEqual(3, len(pool))
+
+        interactive = await pool.query_slapp(None, "slapp", "splat", lane=INTERACTIVE)
+        self.assertGreater(interactive.expected_wait, bulk[0].expected_wait)
+        self.assertEqual(0, interactive.request_id, "Shouldn't be sent while the worker is full")
+
+        worker.requests.resolve("OK", {"Query": "player0"})
+        await pool.dispatch()
+        self.assertIn(interactive.request_id, worker.requests.pending, "Interactive should go ahead of queued bulk")
+        self.assertEqual("splat", interactive.query)
+        self.assertEqual(3, len(pool))
+
+    async def test_requests_are_written_as_soon_as_a_worker_has_room(self):
+        pool = self._make_pool(1, max_in_flight=2)
+        slappipe = pool.workers[0].slappipe
+        stdin = _AnsweringStdin(pool)
+        writer = asyncio.create_task(slappipe._write_stdin(stdin))
+        try:
+            began = perf_counter()
+            requests = [await pool.query_slapp(None, "bulk", f"player{i}", lane=BULK) for i in range(50)]
+            await asyncio.wait_for(asyncio.gather(*(request.future for request in requests)), timeout=5)
+            elapsed = perf_counter() - began
+        finally:
+            slappipe.slapp_loop = False
+            slappipe.slapp_write_queue.put_nowait('')
+            await writer
+        self.assertEqual(50, stdin.written)
+        self.assertLess(elapsed, 1.0, "Each write should go out as soon as it's queued, not on a poll")
+
+    async def test_nothing_is_sent_until_a_worker_starts(self):
+        pool = SlappWorkerPool(1)
+        await pool.query_slapp(None, "slapp", "splat")
+        self.assertEqual(0, pool.workers[0].load)
+        self.assertEqual(1, len(pool.lanes))
+
+    async def test_held_requests_are_sent_once_a_worker_connects(self):
+        pool = SlappWorkerPool(2)
+        request = await pool.query_slapp(None, "slapp", "splat")
+        worker = pool.workers[1]
+        worker.readiness.set_phase(SPAWNED)
+        self.assertEqual(SPAWNED, pool.readiness.phase)
+        self.assertFalse(pool.started)
+
+        worker.slappipe.slapp_process = object()  # Stand-in for a running process
+        worker.started = True
+        await pool.dispatch()
+        self.assertIn(request.request_id, worker.requests.pending)
+        self.assertTrue(pool.started)
+
+        worker.slappipe.slapp_process = None  # Nothing to kill
+        worker.restart()
+        self.assertIsNone(pool.readiness.phase)
+
+    def test_worker_count_from_env(self):
+        with mock.patch.dict(os.environ, {"SLAPP_WORKERS": "3"}):
+            self.assertEqual(3, get_slapp_worker_count())
+        with mock.patch.dict(os.environ, {"SLAPP_WORKERS": "auto"}):
+            self.assertEqual(os.cpu_count() or 1, get_slapp_worker_count())
+        with mock.patch.dict(os.environ, {"SLAPP_WORKERS": "0"}):
+            self.assertEqual(1, get_slapp_worker_count())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import asyncio
+import unittest
+
+from DolaBot.helpers.slapp_readiness import SlappReadiness, SPAWNED, CONNECTED, CACHED
+
+
+class SlappReadinessTests(unittest.IsolatedAsyncioTestCase):
+
+    async def test_reaching_a_phase_wakes_its_waiters(self):
+        readiness = SlappReadiness()
+        waiter = asyncio.create_task(readiness.wait(CONNECTED))
+        readiness.set_phase(SPAWNED)
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+
+        readiness.set_phase(CACHED)
+        await asyncio.wait_for(waiter, timeout=1)
+        self.assertTrue(readiness.reached(CONNECTED))
+
+    async def test_falling_back_clears_later_phases(self):
+        changes = []
+        readiness = SlappReadiness(on_change=lambda: changes.append(readiness.phase))
+        readiness.advance(CACHED)
+        readiness.advance(CONNECTED)
+        readiness.fall_back(SPAWNED)
+        readiness.fall_back(CONNECTED)
+        self.assertEqual([CACHED, SPAWNED], changes)
+        self.assertFalse(readiness.reached(CONNECTED))
+
+        waiter = asyncio.create_task(readiness.wait(CONNECTED))
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+        readiness.fall_back(None)
+        self.assertEqual("not running", str(readiness))
+        readiness.set_phase(CONNECTED)
+        await asyncio.wait_for(waiter, timeout=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
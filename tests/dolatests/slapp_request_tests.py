@@ -0,0 +1,67 @@
+import unittest
+from unittest import mock
+
+from DolaBot.helpers.slapp_request import SlappRequestTracker, SlappRestartedError
+
+
+class SlappRequestTrackerTests(unittest.IsolatedAsyncioTestCase):
+
+    async def test_response_routed_by_echoed_query(self):
+        tracker = SlappRequestTracker()
+        slow = tracker.begin(None, "slapp", "slow query")
+        fast = tracker.begin(None, "slapp", "fast query")
+
+        resolved = tracker.resolve("OK", {"Query": "fast query"})
+        self.assertIs(resolved, fast)
+        self.assertTrue(fast.future.done())
+        self.assertFalse(slow.future.done())
+        self.assertEqual(("OK", {"Query": "fast query"}), await fast.future)
+        self.assertEqual(1, len(tracker))
+
+    async def test_response_without_query_falls_back_to_oldest(self):
+        tracker = SlappRequestTracker()
+        first = tracker.begin(None, "full", "guid-1")
+        second = tracker.begin(None, "full", "guid-2")
+
+        self.assertIs(first, tracker.resolve("OK", {}))
+        self.assertIs(second, tracker.resolve("OK", {"Message": "OK"}))
+        self.assertIsNone(tracker.resolve("OK", {}))
+        self.assertNotEqual(first.request_id, second.request_id)
+
+    async def test_response_with_unmatched_query_is_dropped(self):
+        tracker = SlappRequestTracker()
+        waiting = tracker.begin(None, "slapp", "splat")
+
+        with self.assertLogs(level='WARNING'):
+            self.assertIsNone(tracker.resolve("OK", {"Query": "sent before a restart"}))
+        self.assertFalse(waiting.future.done())
+        self.assertIs(waiting, tracker.resolve("OK", {"Query": "splat"}))
+
+    async def test_queue_wait_is_split_from_ipc(self):
+        tracker = SlappRequestTracker()
+        first = tracker.begin(None, "slapp", "a")
+        second = tracker.begin(None, "slapp", "b")
+        first.sent_at = second.sent_at = 0.0
+        tracker.last_answered_at = 0.0
+
+        with mock.patch('DolaBot.helpers.slapp_request.perf_counter', return_value=2.0):
+            tracker.resolve("OK", {"Query": "a"})
+        with mock.patch('DolaBot.helpers.slapp_request.perf_counter', return_value=5.0):
+            tracker.resolve("OK", {"Query": "b"})
+
+        self.assertEqual((0.0, 2.0), (first.queue_wait, first.ipc))
+        self.assertEqual((2.0, 3.0), (second.queue_wait, second.ipc))
+
+    async def test_fail_all_raises_into_waiting_callers(self):
+        tracker = SlappRequestTracker()
+        request = tracker.begin(None, "slapp", "query")
+
+        failed = tracker.fail_all(SlappRestartedError())
+        self.assertEqual([request], failed)
+        self.assertEqual(0, len(tracker))
+        with self.assertRaises(SlappRestartedError):
+            await request.future
+
+
+if __name__ == '__main__':
+    unittest.main()
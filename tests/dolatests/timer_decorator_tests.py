@@ -0,0 +1,71 @@
+import unittest
+from unittest import mock
+
+from DolaBot.helpers import timer_decorator
+from DolaBot.helpers.timer_decorator import debug_time, debug_time_async, set_enabled, get_profile_text
+
+
+@debug_time
+def _add(a, b):
+    return a + b
+
+
+@debug_time_async
+async def _add_async(a, b):
+    return a + b
+
+
+class TimerDecoratorTests(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        set_enabled("*", True)
+        _add.profile.reset()
+        _add_async.profile.reset()
+
+    def test_calls_are_counted(self):
+        self.assertEqual(3, _add(1, 2))
+        self.assertEqual(5, _add(2, 3))
+        self.assertEqual(2, _add.profile.count)
+        self.assertGreater(_add.profile.total_ns, 0)
+        self.assertGreaterEqual(_add.profile.total_ns, _add.profile.max_ns)
+        self.assertEqual(0, len(_add.profile.slow_calls), "Fast calls shouldn't sample their arguments")
+
+    async def test_async_calls_are_counted(self):
+        self.assertEqual(3, await _add_async(1, 2))
+        self.assertEqual(1, _add_async.profile.count)
+
+    def test_disabled_function_is_not_counted(self):
+        switched = set_enabled("*_add", False)
+        self.assertIn(_add.profile.name, switched)
+        self.assertEqual(3, _add(1, 2))
+        self.assertEqual(0, _add.profile.count)
+        self.assertTrue(_add_async.profile.enabled)
+
+    def test_slow_calls_sample_their_arguments(self):
+        with mock.patch.object(timer_decorator, 'slow_call_ns', 0):
+            _add(1, 2)
+        self.assertEqual(1, len(_add.profile.slow_calls))
+        self.assertIn("(1, 2)", _add.profile.slow_calls[0][1])
+        self.assertIn("(1, 2)", get_profile_text("*_add"))
+
+    def test_large_arguments_are_sampled_cheaply(self):
+        reprs = []
+
+        class Item:
+            def __repr__(self):
+                reprs.append(self)
+                return "Item"
+
+        with mock.patch.object(timer_decorator, 'slow_call_ns', 0):
+            _add([Item() for _ in range(10000)], [])
+        self.assertLessEqual(len(reprs), 4)
+        self.assertIn("Item", _add.profile.slow_calls[0][1])
+
+    def test_calls_that_raise_are_counted(self):
+        with self.assertRaises(TypeError):
+            _add(1, "2")
+        self.assertEqual(1, _add.profile.count)
+
+
+if __name__ == '__main__':
+    unittest.main()
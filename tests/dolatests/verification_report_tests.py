@@ -0,0 +1,103 @@
+import gzip
+import io
+import os
+import time
+import unittest
+
+from DolaBot.helpers.player_eligibility import PlayerEligibility
+from DolaBot.helpers.verification_report import get_seeds, write_verification_report, build_verification_file, \
+    render_verification_file, STYLE_GOOD, STYLE_NEEDS_CHECKING
+from slapp_py.core_classes.division import Division
+from slapp_py.core_classes.name import Name
+from slapp_py.core_classes.player import Player
+
+
+class _FakeResponse:
+    """Stands in for a SlappResponseObject of a player with no known division or Low Ink placements."""
+
+    @staticmethod
+    def get_best_division_for_player(_):
+        return Division()
+
+    @staticmethod
+    def get_low_ink_placements(_):
+        return []
+
+    @staticmethod
+    def best_low_ink_placement(_):
+        return None
+
+    @staticmethod
+    def placement_is_winning_low_ink(_):
+        return False
+
+    @staticmethod
+    def get_teams_for_player(_):
+        return ["Some Team"]
+
+    @staticmethod
+    def get_placements_by_place(_):
+        return []
+
+
+def _make_teams(count: int):
+    response = _FakeResponse()
+    return [
+        (f"Team {i}",
+         {Player(names=[Name(value=f"Player {i}-{j}", sources=[])]): PlayerEligibility(response, None)
+          for j in range(4)},
+         (i * 37) % 101,
+         80 if i % 2 else 50,
+         "")
+        for i in range(count)
+    ]
+
+
+class VerificationReportTests(unittest.TestCase):
+
+    def test_seeds_follow_clout(self):
+        teams = [("a", {}, 10, 0, ""), ("b", {}, 30, 0, ""), ("c", {}, 20, 0, "")]
+        self.assertEqual([3, 1, 2], get_seeds(teams))
+
+    def test_report_rows(self):
+        out = io.StringIO()
+        write_verification_report(out, _make_teams(3))
+        report = out.getvalue()
+        self.assertTrue(report.endswith("</html>"))
+        self.assertEqual(3, report.count('<tr style="height: 20px">'))
+        self.assertIn(f'<td class="{STYLE_GOOD}" dir="ltr">', report)
+        self.assertIn(f'<td class="{STYLE_NEEDS_CHECKING}" dir="ltr"><div class="tooltip">Player 0-0', report)
+
+    def test_gzipped_attachment_matches(self):
+        teams = _make_teams(5)
+        out = io.StringIO()
+        write_verification_report(out, teams)
+
+        file = build_verification_file(teams, compress=True)
+        self.assertEqual("Verifications.html.gz", file.filename)
+        self.assertEqual(out.getvalue(), gzip.decompress(file.fp.read()).decode('utf-8'))
+
+    def test_report_for_another_process_is_written_to_a_file(self):
+        teams = _make_teams(5)
+        out = io.StringIO()
+        write_verification_report(out, teams)
+
+        path, filename = render_verification_file(teams)
+        try:
+            self.assertEqual("Verifications.html", filename)
+            with open(path, 'r', encoding='utf-8') as infile:
+                self.assertEqual(out.getvalue(), infile.read())
+        finally:
+            os.remove(path)
+
+    def test_large_tournament_renders_quickly(self):
+        teams = _make_teams(250)
+        start = time.perf_counter()
+        file = build_verification_file(teams)
+        elapsed = time.perf_counter() - start
+        self.assertEqual("Verifications.html", file.filename)
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()